@@ -0,0 +1,141 @@
+# authentification/admission.py
+"""
+Contrôle d'admission du login : le hachage du mot de passe (PBKDF2) est le
+travail CPU le plus cher de l'API, il ne doit jamais saturer le pod.
+
+1. Fenêtres glissantes par IP et par compte, dans le cache partagé (Redis en
+   production, LocMemCache par processus en CI) : une requête au-delà de la
+   limite reçoit un 429 avant toute requête SQL ou tout hachage.
+   - IP     : toutes les tentatives comptent (rafales, credential stuffing) ;
+   - compte : seuls les échecs comptent, remis à zéro après un succès.
+2. Pool de hachage borné (HashingPool) : au plus LOGIN_HASH_WORKERS hachages
+   simultanés par processus et LOGIN_HASH_QUEUE en attente ; au-delà,
+   HashingBusy → 503. hashlib.pbkdf2_hmac libère le GIL : les threads du pool
+   hachent réellement en parallèle, le reste du worker Daphne reste servi.
+"""
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+
+class HashingBusy(Exception):
+    """Pool de hachage plein : la tentative est refusée sans calcul."""
+
+
+class SlidingWindow:
+    """
+    Compteur à fenêtre glissante approchée : deux seaux de `window` secondes,
+    le précédent pondéré par la part de la fenêtre qui le recouvre encore.
+    Deux clés par identifiant, une lecture get_many par vérification.
+    """
+
+    def __init__(self, name, limit_setting, default_limit):
+        self.name = name
+        self.limit_setting = limit_setting
+        self.default_limit = default_limit
+
+    @property
+    def limit(self):
+        return getattr(settings, self.limit_setting, self.default_limit)
+
+    @property
+    def window(self):
+        return getattr(settings, "LOGIN_THROTTLE_WINDOW", 300)
+
+    def _key(self, ident, bucket):
+        return f"login:{self.name}:{ident}:{bucket}"
+
+    def retry_after(self, ident, now=None):
+        """0 si une tentative est admise, sinon le délai (secondes) avant la prochaine."""
+        now = time.time() if now is None else now
+        window = self.window
+        bucket, elapsed = divmod(now, window)
+        bucket = int(bucket)
+        found = cache.get_many([self._key(ident, bucket), self._key(ident, bucket - 1)])
+        current = found.get(self._key(ident, bucket), 0)
+        previous = found.get(self._key(ident, bucket - 1), 0)
+        weight = 1 - elapsed / window
+        if current + previous * weight < self.limit:
+            return 0
+        if current >= self.limit or not previous:
+            # seau courant plein : il faut attendre qu'il devienne le précédent
+            return max(1, math.ceil(window - elapsed))
+        # le poids du seau précédent doit descendre sous (limit - current) / previous
+        seuil = (1 - (self.limit - current) / previous) * window
+        return max(1, math.ceil(seuil - elapsed))
+
+    def hit(self, ident, now=None):
+        now = time.time() if now is None else now
+        key = self._key(ident, int(now // self.window))
+        cache.add(key, 0, timeout=2 * self.window)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # clé expirée entre add et incr
+            cache.set(key, 1, timeout=2 * self.window)
+
+    def reset(self, ident, now=None):
+        now = time.time() if now is None else now
+        bucket = int(now // self.window)
+        cache.delete_many([self._key(ident, bucket), self._key(ident, bucket - 1)])
+
+
+par_ip = SlidingWindow("ip", "LOGIN_IP_LIMIT", 20)
+par_compte = SlidingWindow("compte", "LOGIN_ACCOUNT_LIMIT", 5)
+
+
+def client_ip(request):
+    """
+    IP du client pour la fenêtre par IP. Seules les NUM_PROXIES dernières
+    entrées de X-Forwarded-For, ajoutées par nos propres proxys, sont lues :
+    les adresses qu'un client y glisse lui-même ne changent pas son identité.
+    NUM_PROXIES doit donc suivre le nombre exact de sauts du déploiement ;
+    sinon c'est l'adresse d'un proxy, ou une adresse falsifiée, qui compte.
+    """
+    return BaseThrottle().get_ident(request)
+
+
+def account_key(email):
+    return (email or "").strip().lower()
+
+
+def retry_after(ip, email):
+    """Délai imposé à cette tentative (0 = admise), vérifié avant tout travail."""
+    return max(par_ip.retry_after(ip), par_compte.retry_after(account_key(email)))
+
+
+class HashingPool:
+    """Exécute les hachages dans un nombre borné de threads ; refuse au-delà de la file."""
+
+    def __init__(self, workers, queue):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash")
+        self._slots = threading.BoundedSemaphore(workers + queue)
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy("Trop de connexions simultanées, réessayez dans un instant.")
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def hashing_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(
+                    getattr(settings, "LOGIN_HASH_WORKERS", 1),
+                    getattr(settings, "LOGIN_HASH_QUEUE", 8),
+                )
+    return _pool
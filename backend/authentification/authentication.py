@@ -0,0 +1,67 @@
+# authentification/authentication.py
+"""
+Authentification DRF par jeton signé (authentification/tokens.py).
+
+Le jeton est lu dans l'en-tête « Authorization: Bearer <jeton> » ou, pour le
+frontend, dans le cookie HttpOnly AUTH_ACCESS_COOKIE. L'utilisateur est
+reconstruit depuis le jeton, sans requête SQL : request.user est un User
+non relu (id, email, rôle, is_staff) ; son profil passe par
+authentification/profils.py.
+"""
+from django.conf import settings
+from rest_framework import authentication, exceptions
+
+from .models import User
+from .tokens import ACCESS, InvalidToken, decode
+
+
+def access_cookie_name():
+    return getattr(settings, "AUTH_ACCESS_COOKIE", "access_token")
+
+
+def refresh_cookie_name():
+    return getattr(settings, "AUTH_REFRESH_COOKIE", "refresh_token")
+
+
+def user_from_payload(payload):
+    user = User(
+        id=payload["id"],
+        email=payload["email"],
+        role=payload["role"],
+        is_active=True,
+        is_staff=payload.get("staff", False),
+    )
+    user._state.adding = False
+    user._state.db = "default"
+    return user
+
+
+class SignedTokenAuthentication(authentication.BaseAuthentication):
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        header = authentication.get_authorization_header(request).split()
+        if header and header[0].lower() == self.keyword.lower().encode():
+            if len(header) != 2:
+                raise exceptions.AuthenticationFailed("En-tête Authorization invalide.")
+            try:
+                payload = decode(header[1].decode())
+            except (InvalidToken, UnicodeDecodeError) as exc:
+                raise exceptions.AuthenticationFailed(str(exc))
+            return user_from_payload(payload), payload
+
+        token = request.COOKIES.get(access_cookie_name())
+        if not token:
+            return None
+        try:
+            payload = decode(token)
+        except InvalidToken:
+            # Cookie expiré : on laisse les autres méthodes (session) ou
+            # l'anonymat s'appliquer ; le frontend appelle /auth/token/refresh/
+            return None
+        # Cookie = identifiant ambiant → même protection CSRF que la session
+        authentication.SessionAuthentication().enforce_csrf(request)
+        return user_from_payload(payload), payload
+
+    def authenticate_header(self, request):
+        return self.keyword
@@ -0,0 +1,48 @@
+# authentification/backends.py
+"""
+Backend de login : une seule lecture de l'utilisateur, hachage dans le pool
+borné (authentification/admission.py), ré-hachage transparent des mots de
+passe aux anciens paramètres.
+
+Contrairement à ModelBackend, authenticate() renvoie aussi un compte inactif
+dont le mot de passe est correct : login_user répond alors 403 (compte non
+confirmé) sans relire l'utilisateur. get_user() (sessions) garde la règle
+is_active de ModelBackend.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+
+from .admission import hashing_pool
+
+
+def _verify(raw_password, encoded):
+    """(mot de passe correct, hachage à recalculer) — exécuté dans le pool."""
+    if not check_password(raw_password, encoded):
+        return False, False
+    return True, identify_hasher(encoded).must_update(encoded)
+
+
+class PooledModelBackend(ModelBackend):
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        pool = hashing_pool()
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Même coût qu'un compte existant : pas d'énumération par le temps de réponse
+            pool.run(make_password, password)
+            return None
+
+        valid, stale = pool.run(_verify, password, user.password)
+        if not valid:
+            return None
+        if stale:
+            user.password = pool.run(make_password, password)
+            user.save(update_fields=["password"])
+        return user
@@ -0,0 +1,19 @@
+# authentification/hashers.py
+"""
+PBKDF2-SHA256 au nombre d'itérations réglable (PASSWORD_PBKDF2_ITERATIONS).
+
+Même identifiant d'algorithme que le hasher Django (« pbkdf2_sha256 ») : les
+hachages existants restent valides. Quand le réglage change, must_update()
+signale les hachages aux anciens paramètres et le backend de login les
+recalcule à la prochaine connexion réussie (authentification/backends.py).
+Comparer les réglages : python manage.py bench_hashers.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", PBKDF2PasswordHasher.iterations)
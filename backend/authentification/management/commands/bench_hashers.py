@@ -0,0 +1,45 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le coût d'un hachage PBKDF2 pour plusieurs nombres d'itérations "
+        "et le débit de connexions correspondant au budget CPU du pod."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, nargs="+", default=None,
+                            help="Itérations à comparer (défaut : réglage actuel, ÷2, ÷4)")
+        parser.add_argument("--rounds", type=int, default=5, help="Mesures par réglage (médiane)")
+        parser.add_argument("--cpu", type=float, default=0.35,
+                            help="Cœurs alloués au pod (limite Kubernetes, 350m = 0.35)")
+
+    def handle(self, *args, **options):
+        actuel = getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", PBKDF2PasswordHasher.iterations)
+        candidats = options["iterations"] or [actuel, actuel // 2, actuel // 4]
+        hasher = PBKDF2PasswordHasher()
+        salt = hasher.salt()
+
+        self.stdout.write(f"{'itérations':>12} {'ms/hachage':>11} {'login/s/cœur':>13} {'login/s pod':>12}")
+        for iterations in candidats:
+            mesures = []
+            for _ in range(max(1, options["rounds"])):
+                debut = time.perf_counter()
+                hasher.encode("mot-de-passe-de-test", salt, iterations=iterations)
+                mesures.append(time.perf_counter() - debut)
+            cout = statistics.median(mesures)
+            marque = "  ← actuel" if iterations == actuel else ""
+            self.stdout.write(
+                f"{iterations:>12} {cout * 1000:>11.1f} {1 / cout:>13.1f} {options['cpu'] / cout:>12.1f}{marque}"
+            )
+
+        # Hachages qui seront recalculés à la prochaine connexion (ré-hachage transparent)
+        prefixe = f"{hasher.algorithm}${actuel}$"
+        perimes = get_user_model().objects.exclude(password__startswith=prefixe).count()
+        self.stdout.write(f"🔁 {perimes} mot(s) de passe à ré-hacher au prochain login ({actuel} itérations).")
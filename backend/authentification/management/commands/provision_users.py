@@ -0,0 +1,52 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentification.provisioning import CSV, NDJSON, detect_format, provision, read_rows
+
+
+class Command(BaseCommand):
+    help = "Crée en masse des comptes entreprise / freelance depuis un fichier CSV ou NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("fichier", help="Chemin du fichier (colonnes : email, role, password, champs du profil)")
+        parser.add_argument("--format", choices=[CSV, NDJSON], default=None,
+                            help="Défaut : déduit de l'extension (.ndjson / .jsonl, sinon CSV)")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Processus de hachage (défaut : nombre de CPU, 1 = sans pool)")
+        parser.add_argument("--actifs", action="store_true",
+                            help="Comptes actifs d'emblée, sans mail de vérification")
+        parser.add_argument("--dry-run", action="store_true", help="Validation seule, aucune écriture")
+        parser.add_argument("--rapport", default=None, help="Écrit le rapport complet (JSON) dans ce fichier")
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or detect_format(options["fichier"])
+        try:
+            stream = open(options["fichier"], encoding="utf-8-sig", newline="")
+        except OSError as exc:
+            raise CommandError(f"Fichier illisible : {exc}")
+        with stream:
+            rapport = provision(
+                read_rows(stream, fmt),
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                actifs=options["actifs"],
+                dry_run=options["dry_run"],
+            )
+
+        for erreur in rapport["erreurs"][:20]:
+            self.stdout.write(self.style.WARNING(f"ligne {erreur['ligne']} ({erreur['email']}) : {erreur['erreur']}"))
+        if len(rapport["erreurs"]) > 20:
+            self.stdout.write(self.style.WARNING(f"... {len(rapport['erreurs']) - 20} autres erreurs"))
+        if options["rapport"]:
+            with open(options["rapport"], "w", encoding="utf-8") as sortie:
+                json.dump(rapport, sortie, ensure_ascii=False, indent=2)
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {rapport['valides']} / {rapport['lignes']} lignes valides (aucune écriture)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {rapport['crees']} comptes créés ({rapport['entreprises']} entreprises, "
+                f"{rapport['freelances']} freelances), {len(rapport['erreurs'])} lignes écartées."))
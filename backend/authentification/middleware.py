@@ -0,0 +1,71 @@
+# authentification/middleware.py
+"""
+Middlewares d'authentification et de profil.
+
+Authentification des WebSockets par jeton signé :
+Le jeton est lu dans le cookie AUTH_ACCESS_COOKIE (envoyé par le navigateur
+lors du handshake) ou dans ?token= ; s'il est valide, scope["user"] est
+construit sans requête SQL. Sinon, on retombe sur AuthMiddlewareStack
+(session Django), comme avant.
+
+Profil métier (authentification/profils.py) : request.profil en HTTP
+(paresseux, résolu au premier accès).
+"""
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from channels.auth import AuthMiddlewareStack
+from django.http import parse_cookie
+from django.utils.functional import SimpleLazyObject
+
+from .authentication import access_cookie_name, user_from_payload
+from .profils import get_profil
+from .tokens import InvalidToken, decode
+
+
+def _scope_token(scope):
+    token = parse_qs(scope.get("query_string", b"").decode()).get("token", [None])[0]
+    if token:
+        return token
+    for name, value in scope.get("headers", []):
+        if name == b"cookie":
+            return parse_cookie(value.decode("latin-1")).get(access_cookie_name())
+    return None
+
+
+class TokenAuthMiddleware:
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.fallback = AuthMiddlewareStack(inner)
+
+    async def __call__(self, scope, receive, send):
+        token = _scope_token(scope)
+        if token:
+            try:
+                # lecture de la liste de révocation (cache) hors de la boucle
+                payload = await sync_to_async(decode)(token)
+            except InvalidToken:
+                pass
+            else:
+                scope = dict(scope, user=user_from_payload(payload), auth=payload)
+                return await self.inner(scope, receive, send)
+        return await self.fallback(scope, receive, send)
+
+
+class ProfilMiddleware:
+    """
+    request.profil : Entreprise, Freelance ou None. Évalué au premier accès,
+    donc après l'authentification DRF (qui remplace request.user).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.profil = SimpleLazyObject(lambda: get_profil(request.user))
+        return self.get_response(request)
+
+
+def TokenAuthMiddlewareStack(inner):
+    return TokenAuthMiddleware(inner)
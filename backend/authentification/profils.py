@@ -0,0 +1,72 @@
+# authentification/profils.py
+"""
+Profil métier de l'utilisateur connecté (Entreprise ou Freelance), résolu une
+fois par requête et mis en cache partagé (clé profil:<user id>).
+
+- ProfilMiddleware (HTTP) expose request.profil ;
+- les vues passent par entreprise_of(request) / freelance_of(request) ;
+- le cache est invalidé à la sauvegarde ou suppression d'un profil
+  (authentification/signals.py).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import LazyObject, SimpleLazyObject, empty
+
+_AUCUN = "aucun"  # « pas de profil » est aussi mis en cache
+
+
+def _key(user_id):
+    return f"profil:{user_id}"
+
+
+def _lookup(user):
+    from entreprise.models import Entreprise
+    from freelance.models import Freelance
+
+    # Le modèle correspondant au rôle d'abord ; l'autre en secours (comptes anciens)
+    models = (Freelance, Entreprise) if user.role == user.ROLE_FREELANCE else (Entreprise, Freelance)
+    for model in models:
+        profil = model.objects.filter(user_id=user.pk).first()
+        if profil is not None:
+            return profil
+    return None
+
+
+def get_profil(user):
+    """Entreprise, Freelance ou None pour cet utilisateur (cache, puis base)."""
+    if user is None or not user.is_authenticated:
+        return None
+    cached = cache.get(_key(user.pk))
+    if cached is not None:
+        return None if cached == _AUCUN else cached
+    profil = _lookup(user)
+    cache.set(_key(user.pk), _AUCUN if profil is None else profil, getattr(settings, "PROFIL_CACHE_TTL", 3600))
+    return profil
+
+
+def invalidate(user_id):
+    cache.delete(_key(user_id))
+
+
+def profil_of(request):
+    """Profil de la requête : request.profil (middleware) évalué, sinon résolu directement."""
+    profil = getattr(request, "profil", empty)
+    if profil is empty:
+        return get_profil(request.user)
+    if isinstance(profil, LazyObject):
+        if profil._wrapped is empty:
+            profil._setup()
+        return profil._wrapped
+    return profil
+
+
+def entreprise_of(request):
+    from entreprise.models import Entreprise
+    profil = profil_of(request)
+    return profil if isinstance(profil, Entreprise) else None
+
+
+def freelance_of(request):
+    from freelance.models import Freelance
+    profil = profil_of(request)
+    return profil if isinstance(profil, Freelance) else None
@@ -0,0 +1,298 @@
+# authentification/provisioning.py
+"""
+Import en masse de comptes (User + profil Entreprise / Freelance) depuis un
+fichier CSV ou NDJSON : manage.py provision_users et POST /auth/provisioning/
+(l'API valide tout fichier mais ne crée que de petits lots, hachés par le
+pool borné du login ; au-delà, la commande).
+
+Par lot de `batch_size` lignes valides :
+- mots de passe hachés en parallèle dans un ProcessPoolExecutor (PBKDF2 est
+  du CPU pur ; le pool est créé une fois pour tout l'import) ;
+- une transaction : bulk_create des User, puis des profils, index des
+  compétences (index_competences_bulk) et mails de vérification en file
+  (enqueue_many) — bulk_create ne déclenche aucun signal ;
+- fils « missions pour vous » des nouveaux freelances calculés après commit.
+
+Les lignes invalides (champ manquant ou trop long, e-mail déjà pris ou en
+double dans le fichier, tarif illisible) sont écartées et décrites dans le
+rapport, sans bloquer le reste de l'import.
+"""
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from courrier.envoi import build, enqueue_many
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+from freelance.skills import index_competences_bulk
+from mission.feed import refresh_freelances
+from .models import User
+from .verification import verification_mail
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+ENTREPRISE_FIELDS = ("nom", "secteur")
+FREELANCE_FIELDS = ("nom", "description", "competence", "experience", "formation", "certificat", "tarif")
+REQUIRED = {
+    User.ROLE_ENTREPRISE: ("nom", "secteur"),
+    User.ROLE_FREELANCE: ("nom", "competence", "experience", "formation", "tarif"),
+}
+ROLES = {role.lower(): role for role in REQUIRED}
+PROFILS = {
+    User.ROLE_ENTREPRISE: (Entreprise, ENTREPRISE_FIELDS),
+    User.ROLE_FREELANCE: (Freelance, FREELANCE_FIELDS),
+}
+
+
+class LigneInvalide(Exception):
+    pass
+
+
+def detect_format(name="", content_type=""):
+    """NDJSON pour .ndjson / .jsonl / application/x-ndjson, CSV sinon."""
+    if name.lower().endswith((".ndjson", ".jsonl")) or "ndjson" in (content_type or ""):
+        return NDJSON
+    return CSV
+
+
+def read_rows(stream, fmt):
+    """(numéro de ligne, dict) pour chaque enregistrement d'un flux texte."""
+    if fmt == NDJSON:
+        for numero, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield numero, row if isinstance(row, dict) else None
+    else:
+        # numéro 2 pour la première ligne de données (l'en-tête est la ligne 1)
+        for numero, row in enumerate(csv.DictReader(stream), start=2):
+            yield numero, row
+
+
+def _text(row, name):
+    value = row.get(name)
+    return "" if value is None else str(value).strip()
+
+
+def clean_row(row):
+    """Valide une ligne ; retourne un dict normalisé ou lève LigneInvalide."""
+    if row is None:
+        raise LigneInvalide("Ligne illisible.")
+    email = User.objects.normalize_email(_text(row, "email"))
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise LigneInvalide("E-mail invalide.")
+    role = ROLES.get(_text(row, "role").lower())
+    if role is None:
+        raise LigneInvalide("Rôle invalide (entreprise ou freelance).")
+    password = _text(row, "password")
+    if not password:
+        raise LigneInvalide("Mot de passe requis.")
+
+    if len(email) > User._meta.get_field("email").max_length:
+        raise LigneInvalide("E-mail invalide.")
+
+    model, fields = PROFILS[role]
+    # champs facultatifs vides → NULL, comme à la création par l'API
+    profil = {name: _text(row, name) or None for name in fields}
+    manquants = [name for name in REQUIRED[role] if not profil[name]]
+    if manquants:
+        raise LigneInvalide(f"Champs requis : {', '.join(manquants)}.")
+    # MySQL (mode strict) : une valeur trop longue ferait échouer tout le lot (DataError)
+    trop_longs = []
+    for name, value in profil.items():
+        max_length = model._meta.get_field(name).max_length
+        if value and max_length and len(value) > max_length:
+            trop_longs.append(f"{name} ({max_length} max)")
+    if trop_longs:
+        raise LigneInvalide(f"Champs trop longs : {', '.join(trop_longs)}.")
+    if role == User.ROLE_FREELANCE:
+        try:
+            tarif = Decimal(profil["tarif"].replace(",", ".")).quantize(Decimal("0.01"))
+            valide = 0 <= tarif < 10 ** 8  # DecimalField(max_digits=10, decimal_places=2)
+        except InvalidOperation:
+            valide = False
+        if not valide:
+            raise LigneInvalide("Tarif invalide.")
+        profil["tarif"] = tarif
+    return {"email": email, "role": role, "password": password, "profil": profil}
+
+
+def _init_worker():
+    # Processus lancés en spawn / forkserver : Django doit être initialisé
+    import django
+    django.setup()
+
+
+class Hasher:
+    """
+    make_password en ligne (workers <= 1), dans un pool de processus, ou par
+    le pool borné du login (`pool`, admission.hashing_pool()) côté API.
+    """
+
+    def __init__(self, workers, pool=None):
+        self._executor = None
+        self._pool = pool
+        if pool is None and workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            self._chunksize = 16
+
+    def __call__(self, passwords):
+        if self._pool is not None:
+            return [self._pool.run(make_password, p) for p in passwords]
+        if self._executor is None:
+            return [make_password(p) for p in passwords]
+        return list(self._executor.map(make_password, passwords, chunksize=self._chunksize))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+
+def _create(lignes, hashes, actifs):
+    users = [
+        User(email=ligne["email"], role=ligne["role"], password=encoded, is_active=actifs)
+        for ligne, encoded in zip(lignes, hashes)
+    ]
+    User.objects.bulk_create(users)
+    if any(user.pk is None for user in users):
+        # MySQL : bulk_create ne renvoie pas les clés générées
+        ids = dict(User.objects.filter(email__in=[u.email for u in users]).values_list("email", "pk"))
+        for user in users:
+            user.pk = ids[user.email]
+
+    entreprises, freelances = [], []
+    for ligne, user in zip(lignes, users):
+        if ligne["role"] == User.ROLE_ENTREPRISE:
+            entreprises.append(Entreprise(user_id=user.pk, **ligne["profil"]))
+        else:
+            freelances.append(Freelance(user_id=user.pk, **ligne["profil"]))
+    Entreprise.objects.bulk_create(entreprises)
+    Freelance.objects.bulk_create(freelances)
+    if any(f.pk is None for f in freelances):
+        ids = dict(
+            Freelance.objects.filter(user_id__in=[f.user_id for f in freelances])
+            .values_list("user_id", "id_freelance")
+        )
+        for freelance in freelances:
+            freelance.pk = ids[freelance.user_id]
+
+    index_competences_bulk(freelances)
+    if not actifs:
+        enqueue_many(
+            build(sujet, corps, [user.email])
+            for user in users
+            for _, sujet, corps in [verification_mail(user)]
+        )
+    transaction.on_commit(lambda: refresh_freelances(freelances))
+    return len(entreprises), len(freelances)
+
+
+class Import:
+    """État d'un import : lot courant, e-mails déjà vus, rapport."""
+
+    def __init__(self, batch_size=500, workers=1, actifs=False, dry_run=False, pool=None):
+        self.batch_size = batch_size
+        self.actifs = actifs
+        self.dry_run = dry_run
+        self.hasher = Hasher(workers, pool)
+        self.vus = set()
+        self.lot = []
+        self.rapport = {"lignes": 0, "valides": 0, "crees": 0, "entreprises": 0, "freelances": 0, "erreurs": []}
+
+    def _erreur(self, numero, email, message):
+        self.rapport["erreurs"].append({"ligne": numero, "email": email, "erreur": message})
+
+    def add(self, numero, row):
+        self.rapport["lignes"] += 1
+        try:
+            ligne = clean_row(row)
+        except LigneInvalide as exc:
+            self._erreur(numero, _text(row or {}, "email"), str(exc))
+            return
+        cle = ligne["email"].lower()
+        if cle in self.vus:
+            self._erreur(numero, ligne["email"], "E-mail en double dans le fichier.")
+            return
+        self.vus.add(cle)
+        ligne["numero"] = numero
+        self.lot.append(ligne)
+        if len(self.lot) >= self.batch_size:
+            self.flush()
+
+    def _sans_existants(self, lot):
+        emails = User.objects.filter(email__in=[ligne["email"] for ligne in lot]).values_list("email", flat=True)
+        pris = {email.lower() for email in emails}
+        restants = []
+        for ligne in lot:
+            if ligne["email"].lower() in pris:
+                self._erreur(ligne["numero"], ligne["email"], "E-mail déjà utilisé.")
+            else:
+                restants.append(ligne)
+        return restants
+
+    def flush(self):
+        lot, self.lot = self._sans_existants(self.lot), []
+        self.rapport["valides"] += len(lot)
+        if not lot or self.dry_run:
+            return
+        hashes = self.hasher([ligne["password"] for ligne in lot])
+        for tentative in range(2):
+            try:
+                with transaction.atomic():
+                    entreprises, freelances = _create(lot, hashes, self.actifs)
+                break
+            except IntegrityError:
+                # Inscription concurrente entre la vérification et l'INSERT :
+                # on écarte les e-mails désormais pris et on rejoue le lot une fois
+                if tentative:
+                    for ligne in lot:
+                        self._erreur(ligne["numero"], ligne["email"], "Conflit à l'insertion, lot à rejouer.")
+                    return
+                gardes = self._sans_existants(lot)
+                hashes = [h for ligne, h in zip(lot, hashes) if ligne in gardes]
+                lot = gardes
+                if not lot:
+                    return
+        self.rapport["crees"] += len(lot)
+        self.rapport["entreprises"] += entreprises
+        self.rapport["freelances"] += freelances
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.hasher.close()
+        return self.rapport
+
+
+def provision(rows, batch_size=500, workers=None, actifs=False, dry_run=False, pool=None):
+    """
+    Crée les comptes décrits par `rows` ((numéro, dict) de read_rows) et
+    retourne le rapport {lignes, valides, crees, entreprises, freelances, erreurs}.
+    workers : processus de hachage (défaut : nombre de CPU, 1 = en ligne).
+    pool : HashingPool à utiliser à la place (API) ; HashingBusy s'il est plein.
+    dry_run : validation seule (y compris e-mails déjà pris), aucune écriture.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    run = Import(batch_size=batch_size, workers=workers, actifs=actifs, dry_run=dry_run, pool=pool)
+    try:
+        for numero, row in rows:
+            run.add(numero, row)
+    except BaseException:
+        run.hasher.close()
+        raise
+    return run.close()
@@ -0,0 +1,27 @@
+# authentification/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from backend.images import variants_built
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+from .models import User
+from .profils import invalidate
+from .tokens import revoke_user
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_of_inactive_user(sender, instance, created, **kwargs):
+    """Compte désactivé → ses jetons déjà émis sont refusés immédiatement."""
+    if not created and not instance.is_active:
+        revoke_user(instance.pk)
+
+
+@receiver(post_save, sender=Entreprise)
+@receiver(post_delete, sender=Entreprise)
+@receiver(post_save, sender=Freelance)
+@receiver(post_delete, sender=Freelance)
+@receiver(variants_built, sender=Entreprise)
+@receiver(variants_built, sender=Freelance)
+def invalidate_profil(sender, instance, **kwargs):
+    """Profil créé, modifié ou supprimé → le cache profil:<user id> est périmé."""
+    invalidate(instance.user_id)
@@ -0,0 +1,105 @@
+# authentification/tests/test_admission.py
+import threading
+from unittest.mock import patch
+from django.conf import settings
+from django.contrib.auth import authenticate, get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+import pytest
+from authentification.admission import HashingBusy, HashingPool, par_compte
+
+User = get_user_model()
+
+
+@pytest.mark.unit
+@override_settings(LOGIN_IP_LIMIT=20, LOGIN_ACCOUNT_LIMIT=3, PASSWORD_PBKDF2_ITERATIONS=1000)
+class AdmissionLoginTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="freelance@gmail.com", password="pass123", role=User.ROLE_FREELANCE)
+        self.url = reverse("login")
+
+    def _post(self, password, email="freelance@gmail.com"):
+        return self.client.post(self.url, {"email": email, "password": password}, format="json")
+
+    def test_compte_bloque_avant_tout_hachage(self):
+        for _ in range(3):
+            self.assertEqual(self._post("faux").status_code, 400)
+
+        with patch("authentification.views.authenticate") as mock_authenticate:
+            response = self._post("pass123")
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+        mock_authenticate.assert_not_called()
+
+    def test_succes_remet_le_compteur_du_compte_a_zero(self):
+        for _ in range(2):
+            self._post("faux")
+        self.assertEqual(self._post("pass123").status_code, 200)
+        self.assertEqual(par_compte.retry_after("freelance@gmail.com"), 0)
+        for _ in range(2):
+            self._post("faux")
+        self.assertEqual(self._post("pass123").status_code, 200)
+
+    @override_settings(LOGIN_IP_LIMIT=2)
+    def test_ip_bloquee_tous_comptes_confondus(self):
+        self._post("faux", email="a@example.com")
+        self._post("faux", email="b@example.com")
+        self.assertEqual(self._post("pass123").status_code, 429)
+
+    @override_settings(LOGIN_IP_LIMIT=2, REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 2})
+    def test_x_forwarded_for_falsifie_ignore(self):
+        # ingress puis nginx ajoutent chacun une adresse : seules les 2 dernières sont sûres
+        def post(client, falsifiee):
+            return self.client.post(
+                self.url, {"email": "a@example.com", "password": "faux"}, format="json",
+                HTTP_X_FORWARDED_FOR=f"{falsifiee}, {client}, 10.0.0.2",
+            )
+
+        post("203.0.113.7", "6.6.6.1")
+        post("203.0.113.7", "6.6.6.2")
+        self.assertEqual(post("203.0.113.7", "6.6.6.3").status_code, 429)
+        self.assertEqual(post("203.0.113.8", "6.6.6.3").status_code, 400)
+
+    def test_pool_plein_repond_503(self):
+        with patch("authentification.views.authenticate", side_effect=HashingBusy("occupé")):
+            response = self._post("pass123")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+
+    def test_une_seule_lecture_utilisateur(self):
+        with self.assertNumQueries(1):
+            user = authenticate(None, email="freelance@gmail.com", password="pass123")
+        self.assertEqual(user, self.user)
+
+    def test_rehachage_transparent(self):
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self._post("pass123").status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+        self.assertTrue(self.user.check_password("pass123"))
+
+
+@pytest.mark.unit
+def test_pool_borne_refuse_au_dela_de_la_file():
+    pool = HashingPool(workers=1, queue=0)
+    demarre, libere = threading.Event(), threading.Event()
+
+    def lent():
+        demarre.set()
+        libere.wait(5)
+        return "ok"
+
+    resultats = []
+    occupant = threading.Thread(target=lambda: resultats.append(pool.run(lent)))
+    occupant.start()
+    demarre.wait(5)
+    with pytest.raises(HashingBusy):
+        pool.run(lambda: "refusé")
+    libere.set()
+    occupant.join(5)
+    assert resultats == ["ok"]
+    assert pool.run(lambda: "admis") == "admis"
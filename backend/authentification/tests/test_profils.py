@@ -0,0 +1,32 @@
+# authentification/tests/test_profils.py
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+import pytest
+from entreprise.models import Entreprise
+
+User = get_user_model()
+
+
+@pytest.mark.unit
+class ProfilCacheTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("id-entreprise")
+
+    def test_profil_resolu_une_fois_puis_invalide(self):
+        self.assertEqual(self.client.get(self.url).status_code, 404)  # « aucun profil » mis en cache
+
+        entreprise = Entreprise.objects.create(user=self.user, nom="Entreprise", secteur="IT")
+        response = self.client.get(self.url)
+        self.assertEqual(response.json(), {"entreprise_id": entreprise.id_entreprise})
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        entreprise.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
@@ -0,0 +1,139 @@
+# authentification/tests/test_provisioning.py
+import io
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+import pytest
+from authentification import admission
+from authentification.provisioning import CSV, provision, read_rows
+from courrier.models import Courrier
+from entreprise.models import Entreprise
+from freelance.models import Freelance, FreelanceCompetence
+from mission.feed import refresh_freelance
+from mission.models import Mission, MissionFeedEntry
+
+User = get_user_model()
+
+CSV_COMPTES = """email,role,password,nom,secteur,competence,experience,formation,tarif
+acme@example.com,Entreprise,secret1,Acme,Industrie,,,,
+jean@example.com,freelance,secret2,Jean,,"Python, Django",Backend,Master,"450,50"
+lea@example.com,Freelance,secret3,Léa,,"React, CSS",Front,Licence,300
+jean@example.com,Freelance,secret4,Jean bis,,Python,Backend,Master,100
+deja@example.com,Entreprise,secret5,Déjà,IT,,,,
+sans-nom@example.com,Freelance,secret6,,,Python,Backend,Master,100
+"""
+
+
+@pytest.mark.unit
+@override_settings(
+    PASSWORD_PBKDF2_ITERATIONS=1000,
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class ProvisioningTest(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="deja@example.com", password="pass123", role=User.ROLE_ENTREPRISE, is_staff=True)
+        self.entreprise = Entreprise.objects.create(user=self.admin, nom="Déjà", secteur="IT")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mission = Mission.objects.create(
+                titre="API Django", description="Mission", competence_requis="Python, Django",
+                budget=500, entreprise=self.entreprise)
+
+    def test_import_csv_par_lots(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            rapport = provision(read_rows(io.StringIO(CSV_COMPTES), CSV), batch_size=2, workers=1)
+
+        self.assertEqual((rapport["lignes"], rapport["crees"]), (6, 3))
+        self.assertEqual((rapport["entreprises"], rapport["freelances"]), (1, 2))
+        self.assertEqual(
+            sorted((e["ligne"], e["erreur"]) for e in rapport["erreurs"]),
+            [(5, "E-mail en double dans le fichier."), (6, "E-mail déjà utilisé."), (7, "Champs requis : nom.")],
+        )
+
+        jean = User.objects.get(email="jean@example.com")
+        self.assertFalse(jean.is_active)
+        self.assertTrue(jean.check_password("secret2"))
+        freelance = Freelance.objects.get(user=jean)
+        self.assertEqual(str(freelance.tarif), "450.50")
+        self.assertIsNone(freelance.description)
+        self.assertTrue(FreelanceCompetence.objects.filter(freelance=freelance, terme="django").exists())
+        self.assertEqual(Courrier.objects.count(), 3)
+        self.assertIn(f"/verify/{jean.pk}/", Courrier.objects.get(destinataires=["jean@example.com"]).corps)
+
+        # même fil que le recalcul profil par profil
+        attendu = set(MissionFeedEntry.objects.filter(freelance=freelance).values_list("mission_id", flat=True))
+        self.assertIn(self.mission.pk, attendu)
+        refresh_freelance(freelance)
+        self.assertEqual(
+            set(MissionFeedEntry.objects.filter(freelance=freelance).values_list("mission_id", flat=True)), attendu)
+
+    def test_champs_trop_longs(self):
+        contenu = (
+            "email,role,password,nom,secteur,competence,experience,formation,tarif\n"
+            f"long@example.com,Freelance,secret,{'N' * 151},,Python,Backend,Master,100\n"
+            f"corp@example.com,Entreprise,secret,Corp,{'S' * 256},,,,\n"
+            f"{'e' * 250}@example.com,Entreprise,secret,Corp,IT,,,,\n"
+            "ok@example.com,Freelance,secret,Ok,,Python,Backend,Master,100\n"
+        )
+        rapport = provision(read_rows(io.StringIO(contenu), CSV), workers=1)
+        self.assertEqual(rapport["crees"], 1)
+        self.assertEqual(
+            [(e["ligne"], e["erreur"]) for e in rapport["erreurs"]],
+            [(2, "Champs trop longs : nom (150 max)."), (3, "Champs trop longs : secteur (255 max)."),
+             (4, "E-mail invalide.")],
+        )
+
+    def test_pool_de_processus(self):
+        contenu = "\n".join(
+            f'{{"email": "f{i}@example.com", "role": "Freelance", "password": "mdp{i}", "nom": "F{i}", '
+            f'"competence": "Python", "experience": "Backend", "formation": "Master", "tarif": 100}}'
+            for i in range(4)
+        )
+        rapport = provision(read_rows(io.StringIO(contenu), "ndjson"), workers=2, actifs=True)
+        self.assertEqual(rapport["crees"], 4)
+        self.assertTrue(User.objects.get(email="f3@example.com").check_password("mdp3"))
+        self.assertFalse(Courrier.objects.exists())
+
+    def test_endpoint_admin(self):
+        url = reverse("provisioning")
+        fichier = lambda: SimpleUploadedFile("comptes.csv", CSV_COMPTES.encode(), content_type="text/csv")
+
+        response = self.client.post(f"{url}?dry_run=1", {"fichier": fichier()}, format="multipart")
+        self.assertEqual(response.status_code, 401)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(f"{url}?dry_run=1", {"fichier": fichier()}, format="multipart")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["valides"], response.data["crees"]), (3, 0))
+        self.assertFalse(User.objects.filter(email="acme@example.com").exists())
+
+        # au-delà de PROVISIONING_INLINE_ROWS : validation seule, pas de hachage sur le pod web
+        with override_settings(PROVISIONING_INLINE_ROWS=5), \
+                patch("authentification.provisioning.make_password") as make_password:
+            response = self.client.post(url, {"fichier": fichier()}, format="multipart")
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual((response.data["valides"], response.data["crees"]), (3, 0))
+        make_password.assert_not_called()
+        self.assertFalse(User.objects.filter(email="acme@example.com").exists())
+
+        # pool du login plein : 503 avant toute écriture
+        with patch.object(admission.hashing_pool(), "run", side_effect=admission.HashingBusy("occupé")):
+            response = self.client.post(url, {"fichier": fichier()}, format="multipart")
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(User.objects.filter(email="acme@example.com").exists())
+
+        with patch.object(admission.hashing_pool(), "run", wraps=admission.hashing_pool().run) as run:
+            response = self.client.post(url, {"fichier": fichier()}, format="multipart")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["crees"], 3)
+        self.assertEqual(run.call_count, 3)  # hachés par le pool borné du login
+
+        freelance = User.objects.create_user(
+            email="simple@example.com", password="pass123", role=User.ROLE_FREELANCE)
+        self.client.force_authenticate(user=freelance)
+        response = self.client.post(url, {"fichier": fichier()}, format="multipart")
+        self.assertEqual(response.status_code, 403)
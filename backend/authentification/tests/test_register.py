@@ -6,14 +6,15 @@ from django.contrib.auth import get_user_model
 from rest_framework import status
 from unittest.mock import patch, MagicMock
 from django.contrib.auth.hashers import make_password
+from courrier.models import Courrier
 User = get_user_model()
 
 
 @pytest.mark.unit
 class RegisterUserTest(APITestCase):
 
-    @patch("authentification.views.send_mail")   # 👉 ON MOCK ICI
-    def test_register_user_success(self, mock_send_mail):
+    @patch("django.core.mail.backends.locmem.EmailBackend.send_messages")
+    def test_register_user_success(self, mock_send_messages):
         url = reverse("register")  # Ton endpoint
         data = {
             "email": "test@example.com",
@@ -29,8 +30,11 @@ class RegisterUserTest(APITestCase):
         # ---- 2️⃣ Vérifier que l'utilisateur est créé ----
         self.assertTrue(User.objects.filter(email="test@example.com").exists())
 
-        # ---- 3️⃣ Vérifier que send_mail a été appelé ----
-        mock_send_mail.assert_called_once()
+        # ---- 3️⃣ Vérifier que le mail est en file, sans envoi pendant la requête ----
+        courrier = Courrier.objects.get()
+        self.assertEqual(courrier.destinataires, ["test@example.com"])
+        self.assertIn("/verify/", courrier.corps)
+        mock_send_messages.assert_not_called()
 
         # ---- 4️⃣ Vérifier que la réponse contient les champs ----
         self.assertIn("token", response.data)
@@ -45,10 +49,11 @@ class RegisterUserTest(APITestCase):
 #  un email de confirmation est envoyé pour valider l’adresse email 
 #  fournie.
 
-# Dans le test, l’envoi réel de l’email est simulé grâce 
-# au mocking de la fonction send_mail. Cela permet de vérifier
-#  que la vue appelle bien cette fonction sans avoir besoin d’envoyer 
-#  un vrai email. Le test vérifie également que l’utilisateur est bien
+# Dans le test, l’email n’est pas envoyé pendant la requête : il est
+# mis en file (modèle Courrier) et sera envoyé par le worker
+#  send_courriers. Le test vérifie que le courrier est bien en file
+#  et qu’aucun envoi n’a lieu dans la vue. Le test vérifie également
+#  que l’utilisateur est bien
 #   créé dans la base de données, que le code HTTP de la réponse est 
 #   correct (201 Created), et que les champs token et uid sont présents
 #    dans la réponse JSON.
@@ -0,0 +1,78 @@
+# authentification/tests/test_tokens.py
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+import pytest
+from authentification.middleware import TokenAuthMiddlewareStack
+from entreprise.models import Entreprise
+
+User = get_user_model()
+
+
+@pytest.mark.unit
+class SignedTokenTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        self.entreprise = Entreprise.objects.create(user=self.user, nom="Entreprise", secteur="IT")
+
+    def _login(self):
+        response = self.client.post(
+            reverse("login"), {"email": "entreprise@gmail.com", "password": "pass123"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        # on oublie la session : seuls les jetons authentifient
+        self.client.cookies.pop("sessionid", None)
+        return response
+
+    def test_navigation_sans_requete_sql(self):
+        self._login()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse("check")).status_code, 200)
+            info = self.client.get(reverse("info"))
+        self.assertEqual(info.data, {"email": "entreprise@gmail.com", "role": User.ROLE_ENTREPRISE})
+
+    def test_bearer_et_jeton_altere(self):
+        access = self._login().data["access"]
+        self.client.cookies.clear()
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(self.client.get(reverse("info")).status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access[:-2]}xx")
+        self.assertEqual(self.client.get(reverse("info")).status_code, 401)
+
+    def test_rotation_du_refresh(self):
+        refresh = self._login().data["refresh"]
+        self.client.cookies.clear()
+
+        response = self.client.post(reverse("token-refresh"), {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.data["refresh"], refresh)
+        # l'ancien refresh est révoqué
+        self.assertEqual(self.client.post(reverse("token-refresh"), {"refresh": refresh}, format="json").status_code, 401)
+
+    def test_deconnexion_et_desactivation_revoquent(self):
+        access = self._login().data["access"]
+        self.client.post(reverse("logout"))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(self.client.get(reverse("info")).status_code, 401)
+
+        self.client.credentials()
+        access = self._login().data["access"]
+        self.user.is_active = False
+        self.user.save()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(self.client.get(reverse("info")).status_code, 401)
+
+    def test_websocket_par_cookie(self):
+        access = self._login().data["access"]
+        seen = {}
+
+        async def inner(scope, receive, send):
+            seen["user"] = scope["user"]
+
+        scope = {"type": "websocket", "headers": [(b"cookie", f"access_token={access}".encode())]}
+        with self.assertNumQueries(0):
+            async_to_sync(TokenAuthMiddlewareStack(inner))(scope, None, None)
+        self.assertEqual(seen["user"].pk, self.user.pk)
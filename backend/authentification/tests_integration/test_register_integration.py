@@ -1,4 +1,6 @@
 import pytest
+from io import StringIO
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework.test import APIClient
 from django.core import mail
@@ -13,7 +15,7 @@ def test_register_user_integration(settings):
     Test d'intégration complet du flux d'inscription :
     - Appel réel de l'API
     - Création réelle de l'utilisateur
-    - Email réellement envoyé (in-memory)
+    - Email mis en file puis envoyé par le worker (in-memory)
     - Token réellement généré
     """
 
@@ -45,7 +47,9 @@ def test_register_user_integration(settings):
     assert user.role == User.ROLE_FREELANCE
     assert user.is_active is False
 
-    # 4) Vérifier email envoyé
+    # 4) Vérifier email mis en file, puis envoyé par le worker
+    assert len(mail.outbox) == 0
+    call_command("send_courriers", "--once", stdout=StringIO())
     assert len(mail.outbox) == 1
     email_sent = mail.outbox[0]
 
@@ -0,0 +1,111 @@
+# authentification/tokens.py
+"""
+Jetons signés sans état (django.core.signing, clé SECRET_KEY).
+
+- access  : courte durée (AUTH_ACCESS_TTL), porte id, email et rôle.
+  Vérifié localement : aucune requête SQL. Le profil entreprise / freelance
+  n'y figure pas : il est résolu par le cache profil (authentification/profils.py),
+  invalidé dès qu'il change.
+- refresh : longue durée (AUTH_REFRESH_TTL), échangé contre une nouvelle paire
+  (rotation : l'ancien refresh est révoqué). C'est le seul moment où
+  l'utilisateur est relu en base (compte désactivé, ...).
+
+Révocation : liste en cache (Redis en production) indexée par jti, avec une
+expiration égale à la durée de vie restante du jeton ; revoke_user() invalide
+d'un coup tous les jetons émis avant l'instant de l'appel.
+"""
+import time
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+
+ACCESS = "access"
+REFRESH = "refresh"
+SALT = "authentification.tokens"
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def access_ttl():
+    return getattr(settings, "AUTH_ACCESS_TTL", 15 * 60)
+
+
+def refresh_ttl():
+    return getattr(settings, "AUTH_REFRESH_TTL", 7 * 24 * 3600)
+
+
+def _ttl(kind):
+    return access_ttl() if kind == ACCESS else refresh_ttl()
+
+
+def _issue(user, kind):
+    payload = {
+        "typ": kind,
+        "jti": uuid.uuid4().hex,
+        "iat": int(time.time()),
+        "id": user.pk,
+        "email": user.email,
+        "role": user.role,
+        "staff": user.is_staff,
+    }
+    return signing.dumps(payload, salt=SALT, compress=True)
+
+
+def issue_pair(user):
+    """Retourne (access, refresh) pour l'utilisateur."""
+    return _issue(user, ACCESS), _issue(user, REFRESH)
+
+
+def decode(token, kind=ACCESS):
+    """Vérifie signature, type, expiration et révocation ; retourne le payload."""
+    try:
+        payload = signing.loads(token, salt=SALT, max_age=_ttl(kind))
+    except signing.SignatureExpired:
+        raise InvalidToken("Jeton expiré.")
+    except signing.BadSignature:
+        raise InvalidToken("Jeton invalide.")
+    if payload.get("typ") != kind:
+        raise InvalidToken("Type de jeton invalide.")
+    if is_revoked(payload):
+        raise InvalidToken("Jeton révoqué.")
+    return payload
+
+
+def _jti_key(jti):
+    return f"auth:revoked:{jti}"
+
+
+def _user_key(user_id):
+    return f"auth:revoked-user:{user_id}"
+
+
+def is_revoked(payload):
+    found = cache.get_many([_jti_key(payload["jti"]), _user_key(payload["id"])])
+    if _jti_key(payload["jti"]) in found:
+        return True
+    revoked_before = found.get(_user_key(payload["id"]))
+    return revoked_before is not None and payload["iat"] <= revoked_before
+
+
+def revoke(payload):
+    """Révoque un jeton jusqu'à sa propre expiration."""
+    remaining = payload["iat"] + _ttl(payload["typ"]) - int(time.time())
+    if remaining > 0:
+        cache.set(_jti_key(payload["jti"]), 1, timeout=remaining)
+
+
+def revoke_token(token, kind):
+    """Révoque un jeton encodé s'il est encore valide (déconnexion)."""
+    try:
+        revoke(decode(token, kind))
+    except InvalidToken:
+        pass
+
+
+def revoke_user(user_id):
+    """Invalide tous les jetons déjà émis pour l'utilisateur."""
+    cache.set(_user_key(user_id), int(time.time()), timeout=refresh_ttl())
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import register_user,login_user ,  check_auth , logout_view ,verify_email, get_user_info
+from .views import register_user,login_user ,  check_auth , logout_view ,verify_email, get_user_info, refresh_token, provision_users
 
 urlpatterns = [
     path("register/", register_user , name="register"),
@@ -7,5 +7,7 @@ urlpatterns = [
     path("check/", check_auth , name="check"),
     path("info/" , get_user_info , name="info"),
     path("logout/", logout_view , name="logout"),
+    path("token/refresh/", refresh_token, name="token-refresh"),
+    path("provisioning/", provision_users, name="provisioning"),
     path('verify/<int:uid>/<str:token>/', verify_email, name='verify-email'),
 ]
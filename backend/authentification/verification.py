@@ -0,0 +1,25 @@
+# authentification/verification.py
+"""Mail de vérification d'adresse (inscription et import en masse)."""
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+
+SUJET = "Vérifie ton adresse e-mail"
+
+
+def verification_mail(user):
+    """Retourne (token, sujet, corps) du mail de vérification de `user`."""
+    token = default_token_generator.make_token(user)
+    verification_link = f"{settings.FRONTEND_URL}/verify/{user.pk}/{token}"  # lien côté React
+    message = f"""
+    Bonjour,
+
+    Merci pour ton inscription sur notre plateforme.
+    Clique sur le lien ci-dessous pour vérifier ton adresse e-mail :
+
+    {verification_link}
+
+    Si tu n'es pas à l'origine de cette inscription, ignore simplement ce message.
+
+    -- L'équipe Support
+    """
+    return token, SUJET, message
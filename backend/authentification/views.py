@@ -1,13 +1,20 @@
+import csv
+import io
 from django.shortcuts import redirect
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, authentication_classes, parser_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth import authenticate, login, logout
 from .models import User
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
+from django.db import transaction
+from courrier.envoi import enqueue
+from .verification import verification_mail
+from . import admission, provisioning, tokens
+from .authentication import access_cookie_name, refresh_cookie_name
 from django.conf import settings  # pour utiliser settings.DEFAULT_FROM_EMAIL
 from django.http import JsonResponse
 
@@ -32,37 +39,16 @@ def register_user(request):
         return Response({"error": "Email déjà utilisé"}, status=400)
 
     # --- 2️⃣ Créer l’utilisateur inactif ---
-    user = User.objects.create_user(email=email, role=role, password=password, is_active=False)
-    user.save()
-
-    # --- 3️⃣ Générer le lien de vérification ---
-    token = default_token_generator.make_token(user)
-    verification_link = f"{settings.FRONTEND_URL}/verify/{user.pk}/{token}"  # lien côté React
-    print(verification_link)
-
-    # --- 4️⃣ Envoyer le mail de vérification ---
-    subject = "Vérifie ton adresse e-mail"
-    message = f"""
-    Bonjour,
-    
-    Merci pour ton inscription sur notre plateforme.
-    Clique sur le lien ci-dessous pour vérifier ton adresse e-mail :
-    
-    {verification_link}
-    
-    Si tu n'es pas à l'origine de cette inscription, ignore simplement ce message.
-    
-    -- L'équipe Support
-    """
-    send_mail(
-        subject,
-        message,
-        settings.DEFAULT_FROM_EMAIL,
-        [email],
-        fail_silently=False,
-    )
+    # Utilisateur et e-mail en file dans la même transaction : la réponse
+    # n'attend pas le serveur SMTP (envoi par manage.py send_courriers)
+    with transaction.atomic():
+        user = User.objects.create_user(email=email, role=role, password=password, is_active=False)
 
-    # --- 5️⃣ Retourner la réponse ---
+        # --- 3️⃣ Générer le lien et mettre en file le mail de vérification ---
+        token, subject, message = verification_mail(user)
+        enqueue(subject, message, [email])
+
+    # --- 4️⃣ Retourner la réponse ---
     return Response({
         "message": "Utilisateur créé avec succès. Un e-mail de vérification a été envoyé.",
         "email": user.email,
@@ -71,16 +57,48 @@ def register_user(request):
         "token": token        # ✅ ajouter le token
     }, status=status.HTTP_201_CREATED)
 
+def _with_tokens(response, user):
+    """
+    Ajoute une paire de jetons signés à la réponse : dans le corps (clients
+    API) et en cookies HttpOnly (frontend, credentials: "include").
+    """
+    access, refresh = tokens.issue_pair(user)
+    response.data.update({"access": access, "refresh": refresh, "expires_in": tokens.access_ttl()})
+    cookie = {
+        "httponly": True,
+        "secure": settings.SESSION_COOKIE_SECURE,
+        "samesite": settings.SESSION_COOKIE_SAMESITE,
+    }
+    response.set_cookie(access_cookie_name(), access, max_age=tokens.access_ttl(), **cookie)
+    response.set_cookie(refresh_cookie_name(), refresh, max_age=tokens.refresh_ttl(), path="/auth/", **cookie)
+    return response
+
+
 @api_view(['POST'])
 def login_user(request):
     data = request.data
     email = data.get('email')
     password = data.get('password')
 
-    # 🔹 Vérifie d'abord si l'utilisateur existe
+    # 🔹 Admission : fenêtres IP / compte vérifiées avant tout hachage
+    ip = admission.client_ip(request)
+    attente = admission.retry_after(ip, email)
+    if attente:
+        return Response(
+            {"error": "Trop de tentatives de connexion. Réessayez plus tard."},
+            status=429, headers={"Retry-After": str(attente)}
+        )
+    admission.par_ip.hit(ip)
+
+    # 🔹 Une seule lecture de l'utilisateur, hachage dans le pool borné
+    # (authentification/backends.py) ; un compte inactif est renvoyé lui aussi
     try:
-        user = User.objects.get(email=email)
-    except User.DoesNotExist:
+        user = authenticate(request, email=email, password=password)
+    except admission.HashingBusy as exc:
+        return Response({"error": str(exc)}, status=503, headers={"Retry-After": "1"})
+
+    if user is None:
+        admission.par_compte.hit(admission.account_key(email))
         return Response({"error": "Email ou mot de passe incorrect"}, status=400)
 
     # 🔹 Vérifie si le compte est actif (confirmé)
@@ -90,17 +108,13 @@ def login_user(request):
             status=403
         )
 
-    # 🔹 Authentifie ensuite si le compte est actif
-    user = authenticate(request, email=email, password=password)
-    if user is not None:
-        login(request, user)
-        return Response({
-            "message": "Connexion réussie",
-            "email": user.email,
-            "role": user.role
-        })
-    else:
-        return Response({"error": "Email ou mot de passe incorrect"}, status=400)
+    admission.par_compte.reset(admission.account_key(email))
+    login(request, user)
+    return _with_tokens(Response({
+        "message": "Connexion réussie",
+        "email": user.email,
+        "role": user.role
+    }), user)
         
 
 @api_view(["GET"])
@@ -116,7 +130,42 @@ def get_user_info(request):
 @api_view(["POST"])
 def logout_view(request):
     logout(request)  # ✅ supprime la session
-    return Response({"message": "Déconnexion réussie"})
+    # ✅ révoque les jetons signés (jusqu'à leur expiration naturelle)
+    if isinstance(request.auth, dict):
+        tokens.revoke(request.auth)
+    else:
+        tokens.revoke_token(request.COOKIES.get(access_cookie_name(), ""), tokens.ACCESS)
+    tokens.revoke_token(
+        request.data.get("refresh") or request.COOKIES.get(refresh_cookie_name(), ""), tokens.REFRESH
+    )
+    response = Response({"message": "Déconnexion réussie"})
+    response.delete_cookie(access_cookie_name())
+    response.delete_cookie(refresh_cookie_name(), path="/auth/")
+    return response
+
+
+@api_view(["POST"])
+@authentication_classes([])
+@permission_classes([])
+def refresh_token(request):
+    """
+    Échange un jeton refresh (corps ou cookie) contre une nouvelle paire.
+    L'ancien refresh est révoqué (rotation) ; l'utilisateur est relu en base
+    ici seulement, pour tenir compte d'un compte désactivé ou d'un profil créé.
+    """
+    token = request.data.get("refresh") or request.COOKIES.get(refresh_cookie_name())
+    if not token:
+        return Response({"error": "Jeton refresh manquant"}, status=401)
+    try:
+        payload = tokens.decode(token, tokens.REFRESH)
+    except tokens.InvalidToken as exc:
+        return Response({"error": str(exc)}, status=401)
+
+    tokens.revoke(payload)
+    user = User.objects.filter(pk=payload["id"], is_active=True).first()
+    if user is None:
+        return Response({"error": "Compte inactif ou supprimé"}, status=401)
+    return _with_tokens(Response({"email": user.email, "role": user.role}), user)
 
 
 @api_view(["GET"])
@@ -140,3 +189,56 @@ def verify_email(request, uid, token):
         return Response({"success": True, "message": "Compte activé"})
     else:
         return Response({"success": False, "message": "Token invalide"}, status=400)
+
+
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+@parser_classes([MultiPartParser])
+def provision_users(request):
+    """
+    Import en masse (admin) : fichier CSV ou NDJSON dans le champ « fichier ».
+    ?dry_run=1 valide sans écrire (jusqu'à PROVISIONING_MAX_ROWS lignes, sans
+    hachage). Les comptes ne sont créés ici que pour PROVISIONING_INLINE_ROWS
+    lignes au plus, hachées dans le pool borné du login ; au-delà, le fichier
+    est seulement validé et l'import passe par manage.py provision_users
+    (hachage sur tous les CPU du nœud).
+    """
+    fichier = request.FILES.get("fichier")
+    if fichier is None:
+        return Response({"error": "Fichier requis (champ « fichier »)"}, status=400)
+
+    fmt = request.data.get("format") or provisioning.detect_format(fichier.name, fichier.content_type)
+    if fmt not in (provisioning.CSV, provisioning.NDJSON):
+        return Response({"error": "Format invalide (csv ou ndjson)"}, status=400)
+    stream = io.TextIOWrapper(fichier.file, encoding="utf-8-sig", newline="")
+    try:
+        rows = list(provisioning.read_rows(stream, fmt))
+    except (UnicodeDecodeError, ValueError, csv.Error):
+        return Response({"error": "Fichier illisible (UTF-8 attendu)"}, status=400)
+
+    max_rows = getattr(settings, "PROVISIONING_MAX_ROWS", 2000)
+    if len(rows) > max_rows:
+        return Response(
+            {"error": f"Plus de {max_rows} lignes : utiliser la commande provision_users"},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+
+    inline_rows = getattr(settings, "PROVISIONING_INLINE_ROWS", 10)
+    if request.query_params.get("dry_run") in ("1", "true") or len(rows) > inline_rows:
+        rapport = provisioning.provision(rows, workers=1, dry_run=True)
+        if len(rows) <= inline_rows:
+            return Response(rapport, status=status.HTTP_200_OK)
+        rapport["error"] = (
+            f"Plus de {inline_rows} lignes : fichier validé, aucun compte créé ; "
+            "lancer l'import avec la commande provision_users"
+        )
+        return Response(rapport, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    try:
+        # Un seul lot : tous les hachages avant toute écriture
+        rapport = provisioning.provision(
+            rows, batch_size=max(1, len(rows)), workers=1, pool=admission.hashing_pool())
+    except admission.HashingBusy as exc:
+        return Response({"error": str(exc)}, status=503, headers={"Retry-After": "1"})
+    code = status.HTTP_201_CREATED if rapport["crees"] else status.HTTP_200_OK
+    return Response(rapport, status=code)
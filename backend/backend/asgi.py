@@ -1,7 +1,6 @@
 import os
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
 
 # ⚠️ 1. Définir le settings module AVANT tout import Django dépendant des modèles
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
@@ -12,10 +11,11 @@ django_asgi_app = get_asgi_application()
 # ⚠️ 3. Importer les routing après l'initialisation de Django
 import mission.routing
 import candidature.routing
+from authentification.middleware import TokenAuthMiddlewareStack
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
-    "websocket": AuthMiddlewareStack(
+    "websocket": TokenAuthMiddlewareStack(
         URLRouter(
             mission.routing.websocket_urlpatterns + candidature.routing.websocket_urlpatterns 
         )
@@ -0,0 +1,164 @@
+# backend/fanout.py
+"""
+Diffusion locale des groupes « larges » (le groupe "missions" : un membre
+par freelance connecté).
+
+Avec le channel layer, un group_send vers N sockets coûte N envois Redis
+(un par channel name). Ici chaque processus Daphne s'abonne UNE fois au
+groupe et distribue lui-même l'événement à ses propres connexions :
+le coût d'une diffusion suit le nombre de workers, plus celui des sockets.
+
+WEBSOCKET_FANOUT :
+- "layer" : comportement historique, channel_layer.group_add / group_send ;
+- "redis" : un abonnement pub/sub Redis par worker et par groupe ;
+- "local" : remplaçant en mémoire, dans le seul processus courant (tests,
+  développement avec un seul worker).
+
+Les événements sont distribués dans l'ordre de publication, au handler
+désigné par "type" (même routage qu'un message du channel layer, sans le
+nettoyage des connexions SQL que dispatch() ferait pour chaque socket).
+"""
+import asyncio
+import logging
+import threading
+
+import msgpack
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.consumer import get_handler_name
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LAYER = "layer"
+LOCAL = "local"
+REDIS = "redis"
+
+PREFIX = "fanout:"
+
+
+def mode():
+    return getattr(settings, "WEBSOCKET_FANOUT", LAYER)
+
+
+class Hub:
+    """Membres locaux des groupes, pour une boucle asyncio (un worker Daphne)."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.groups = {}
+        self.inbox = asyncio.Queue()
+        self._pump = loop.create_task(self._run())
+        self._redis = None
+        self._reader = None
+
+    async def join(self, group, consumer):
+        members = self.groups.setdefault(group, set())
+        if not members and mode() == REDIS:
+            await self._subscribe(group)
+        members.add(consumer)
+
+    def leave(self, group, consumer):
+        self.groups.get(group, set()).discard(consumer)
+
+    async def _run(self):
+        while True:
+            group, message = await self.inbox.get()
+            members = list(self.groups.get(group, ()))
+            if not members:
+                continue
+            # Une socket lente ou fermée ne retarde ni n'interrompt les autres ;
+            # l'événement suivant attend que celui-ci soit remis à tous (ordre)
+            handler = get_handler_name(message)
+            results = await asyncio.gather(
+                *(getattr(c, handler)(message) for c in members), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning("Diffusion %s : %r", group, result)
+
+    # --- abonnement Redis (un par worker et par groupe) ---
+    async def _subscribe(self, group):
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+            self._pubsub = self._redis.pubsub()
+        await self._pubsub.subscribe(PREFIX + group)
+        if self._reader is None:
+            self._reader = self.loop.create_task(self._read())
+
+    async def _read(self):
+        while True:
+            try:
+                # redis-py se reconnecte et se réabonne seul après une coupure
+                async for item in self._pubsub.listen():
+                    if item["type"] != "message":
+                        continue
+                    group = item["channel"].decode()[len(PREFIX):]
+                    self.inbox.put_nowait((group, msgpack.unpackb(item["data"], raw=False)))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Abonnement Redis interrompu : %r", exc)
+                await asyncio.sleep(1)
+
+    def put_threadsafe(self, group, message):
+        try:
+            self.loop.call_soon_threadsafe(self.inbox.put_nowait, (group, message))
+        except RuntimeError:  # boucle fermée entre-temps
+            pass
+
+
+# Une boucle par worker en production ; les tests en créent une par scénario
+_hubs = {}
+_hubs_lock = threading.Lock()
+
+
+def _live_hubs():
+    for loop in [loop for loop in _hubs if loop.is_closed()]:
+        del _hubs[loop]
+    return list(_hubs.values())
+
+
+def hub():
+    loop = asyncio.get_running_loop()
+    with _hubs_lock:
+        _live_hubs()
+        if loop not in _hubs:
+            _hubs[loop] = Hub(loop)
+        return _hubs[loop]
+
+
+async def group_add(group, consumer):
+    if mode() == LAYER:
+        await consumer.channel_layer.group_add(group, consumer.channel_name)
+    else:
+        await hub().join(group, consumer)
+
+
+async def group_discard(group, consumer):
+    if mode() == LAYER:
+        await consumer.channel_layer.group_discard(group, consumer.channel_name)
+    else:
+        hub().leave(group, consumer)
+
+
+_redis = None
+
+
+def group_send(group, message):
+    """Publie un événement (code synchrone : signaux, minuteurs, commandes)."""
+    current = mode()
+    if current == LAYER:
+        async_to_sync(get_channel_layer().group_send)(group, message)
+    elif current == REDIS:
+        global _redis
+        if _redis is None:
+            import redis
+            _redis = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+        _redis.publish(PREFIX + group, msgpack.packb(message, use_bin_type=True))
+    else:
+        with _hubs_lock:
+            hubs = _live_hubs()
+        for local in hubs:
+            local.put_threadsafe(group, message)
@@ -0,0 +1,251 @@
+# backend/images.py
+"""
+Variantes d'images (photos de freelance, logos d'entreprise).
+
+Les fichiers envoyés restent stockés tels quels ; après le COMMIT, un pool de
+workers (IMAGE_VARIANT_WORKERS threads, Pillow relâche le GIL pendant le
+décodage, le redimensionnement et l'encodage) en produit des versions de
+taille fixe, en WebP et en JPEG :
+
+- thumb : 96 × 96, recadrée (listes, avatars) ;
+- card  : 320 × 320, recadrée (cartes de profil) ;
+- full  : au plus 1280 px de côté, sans recadrage ni agrandissement.
+
+Chemins : <dossier>/variants/<nom du fichier>/<variante>.<webp|jpg>. Le nom
+de l'original étant son empreinte (backend/storage.py), les variantes d'une
+même image sont partagées et immuables.
+Le champ JSON <champ>_variants du modèle les référence :
+{"thumb": {"webp": "...", "jpg": "..."}, "card": {...}, "full": {...}}.
+Tant que les variantes ne correspondent pas au fichier courant (traitement
+en cours, nouvelle photo), current() retourne {} et le client affiche l'original.
+
+Le champ JSON est écrit par update() (pas de post_save : ni réindexation des
+compétences, ni recalcul du fil) ; le signal variants_built prévient les
+copies dénormalisées (projection des candidatures, cache profil).
+Rattrapage (fichiers existants, worker arrêté en cours de route) : commande
+build_image_variants.
+
+IMAGE_VARIANT_WORKERS = 0 : traitement immédiat dans le thread appelant (tests).
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.db.models import Q
+from django.dispatch import Signal
+from PIL import Image, ImageOps
+
+from .storage import ContentAddressedMixin, content_address
+
+logger = logging.getLogger(__name__)
+
+# nom → (largeur, hauteur, recadrage)
+VARIANTS = {
+    "thumb": (96, 96, True),
+    "card": (320, 320, True),
+    "full": (1280, 1280, False),
+}
+FORMATS = {"webp": "WEBP", "jpg": "JPEG"}
+QUALITY = 82
+
+variants_built = Signal()  # sender=modèle, instance=objet à jour
+
+
+def variants_dir(name):
+    """Dossier des variantes d'un fichier stocké."""
+    directory, filename = os.path.split(name)
+    return f"{directory}/variants/{filename}/" if directory else f"variants/{filename}/"
+
+
+def current(fieldfile, variants):
+    """Variantes du fichier courant, {} si absentes ou périmées."""
+    if not fieldfile or not variants:
+        return {}
+    prefix = variants_dir(fieldfile.name)
+    if all(path.startswith(prefix) for formats in variants.values() for path in formats.values()):
+        return variants
+    return {}
+
+
+def _opaque(image):
+    """JPEG : transparence aplatie sur fond blanc."""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def render(data):
+    """Octets de l'original → {variante: {format: octets}}."""
+    with Image.open(BytesIO(data)) as source:
+        width, height, _ = VARIANTS["full"]
+        # JPEG : décodage directement à l'échelle réduite (1/2, 1/4, 1/8)
+        source.draft("RGB", (width, height))
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+        full = image.copy()
+        full.thumbnail((width, height), Image.LANCZOS)
+
+    images = {}
+    for name, (width, height, crop) in VARIANTS.items():
+        if name == "full":
+            images[name] = full
+        elif crop:
+            # Les petites variantes partent de "full", pas de l'original
+            images[name] = ImageOps.fit(full, (width, height), Image.LANCZOS)
+        else:
+            images[name] = full.copy()
+            images[name].thumbnail((width, height), Image.LANCZOS)
+
+    rendered = {}
+    for name, image in images.items():
+        rendered[name] = {}
+        for ext, fmt in FORMATS.items():
+            out = BytesIO()
+            if fmt == "JPEG":
+                _opaque(image).save(out, fmt, quality=QUALITY, optimize=True, progressive=True)
+            else:
+                image.save(out, fmt, quality=QUALITY, method=4)
+            rendered[name][ext] = out.getvalue()
+    return rendered
+
+
+def _source(variants):
+    """Nom du fichier d'origine de variantes (inverse de variants_dir)."""
+    path = next(iter(next(iter(variants.values())).values()))
+    head, _, rest = ("/" + path).rpartition("/variants/")
+    return f"{head}/{rest.split('/', 1)[0]}".lstrip("/")
+
+
+def _release(model, field, storage, variants):
+    """
+    Supprime des variantes devenues inutiles. Avec l'adressage par contenu,
+    plusieurs profils peuvent partager la même image (et ses variantes) :
+    on garde les fichiers tant qu'une ligne pointe encore sur l'original.
+    """
+    if not variants or model.objects.filter(**{field: _source(variants)}).exists():
+        return
+    for formats in variants.values():
+        for path in formats.values():
+            try:
+                storage.delete(path)
+            except Exception as exc:
+                logger.warning("Variante non supprimée %s : %r", path, exc)
+
+
+def _write(storage, prefix, rendered):
+    variants = {}
+    for variant, formats in rendered.items():
+        variants[variant] = {}
+        for ext, data in formats.items():
+            path = f"{prefix}{variant}.{ext}"
+            # Chemin adressé par contenu : partagé, réécrit à l'identique
+            if content_address(path) is None and storage.exists(path):
+                storage.delete(path)
+            variants[variant][ext] = storage.save(path, ContentFile(data))
+    return variants
+
+
+def build(model, pk, field, variants_field):
+    """
+    Produit les variantes du fichier courant de l'objet et met à jour son
+    champ JSON. Ne fait rien si le fichier a changé entre-temps (le nouveau
+    fichier a son propre traitement). Retourne les variantes ou None.
+    """
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return None
+    fieldfile = getattr(instance, field)
+    previous = getattr(instance, variants_field) or {}
+    if not fieldfile:
+        empty = Q(**{field: ""}) | Q(**{f"{field}__isnull": True})
+        if previous and model.objects.filter(empty, pk=pk).update(**{variants_field: {}}):
+            _release(model, field, fieldfile.storage, previous)
+            setattr(instance, variants_field, {})
+            variants_built.send(sender=model, instance=instance)
+        return None
+    if current(fieldfile, previous):
+        return previous
+
+    source, storage = fieldfile.name, fieldfile.storage
+    name = source
+    if isinstance(storage, ContentAddressedMixin) and content_address(name) is None:
+        # Ancien nom (avant adressage) : l'original passe sous son empreinte,
+        # pour que ses variantes soient elles aussi immuables
+        with storage.open(name, "rb") as handle:
+            name = storage.save(name, handle)
+
+    prefix = variants_dir(name)
+    paths = {variant: {ext: f"{prefix}{variant}.{ext}" for ext in FORMATS} for variant in VARIANTS}
+    if content_address(prefix) and all(storage.exists(p) for f in paths.values() for p in f.values()):
+        # Image identique déjà traitée (autre profil) : rien à recalculer
+        variants = paths
+    else:
+        with storage.open(name, "rb") as handle:
+            variants = _write(storage, prefix, render(handle.read()))
+
+    # Écriture conditionnelle : seulement si le fichier n'a pas été remplacé
+    if not model.objects.filter(pk=pk, **{field: source}).update(**{field: name, variants_field: variants}):
+        _release(model, field, storage, variants)
+        return None
+    _release(model, field, storage, previous)
+    setattr(fieldfile, "name", name)
+    setattr(instance, variants_field, variants)
+    variants_built.send(sender=model, instance=instance)
+    return variants
+
+
+def _workers():
+    return getattr(settings, "IMAGE_VARIANT_WORKERS", 2)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix="images")
+        return _pool
+
+
+def _job(model, pk, field, variants_field):
+    try:
+        build(model, pk, field, variants_field)
+    except Exception:
+        logger.exception("Variantes de %s %s", model.__name__, pk)
+    finally:
+        # Thread du pool : pas de connexion SQL laissée ouverte entre deux tâches
+        connections.close_all()
+
+
+def schedule(instance, field, variants_field):
+    """
+    À appeler depuis post_save : variantes (re)construites après le commit,
+    si le fichier a changé. Rien à faire si elles sont déjà à jour.
+    """
+    fieldfile = getattr(instance, field)
+    variants = getattr(instance, variants_field) or {}
+    if fieldfile and current(fieldfile, variants):
+        return
+    if not fieldfile and not variants:
+        return
+    model, pk = type(instance), instance.pk
+
+    def submit():
+        if _workers() <= 0:
+            build(model, pk, field, variants_field)
+        else:
+            pool().submit(_job, model, pk, field, variants_field)
+
+    transaction.on_commit(submit)
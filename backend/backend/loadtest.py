@@ -0,0 +1,375 @@
+# backend/loadtest.py
+"""
+Banc de charge WebSocket en processus (commande loadtest_websockets).
+
+Des milliers de clients simulés (WebsocketCommunicator) se connectent à
+backend.asgi.application, avec un jeton d'accès comme un vrai navigateur :
+- freelance  : /ws/missions/ et /ws/entretien/freelance/<id>/ ;
+- entreprise : /ws/candidatures/<id>/ et /ws/entretien/entreprise/<id>/.
+
+Puis des scénarios réalistes sont rejoués à débit fixe (boucle ouverte) :
+- apply     : l'entreprise crée une candidature par sa socket → new_candidature ;
+- interview : planification d'entretien (save → signal → outbox → dispatcher) ;
+- mission   : création / modification / suppression (signal → publisher → fan-out).
+
+Chaque opération porte un marqueur unique (titre de mission, commentaire
+d'entretien, couple mission/freelance) : la latence publication → remise est
+mesurée pour CHAQUE socket qui reçoit la trame (p50/p95/p99 par scénario).
+La fenêtre de diffusion des missions (MISSION_BROADCAST_WINDOW) et l'attente
+du dispatcher (dispatch_interval) font partie de la latence mesurée, comme
+en production.
+
+Mémoire par connexion : tracemalloc pendant la seule phase de connexion.
+Les données créées (préfixe loadtest-<run>) sont supprimées à la fin.
+"""
+import asyncio
+import json
+import math
+import os
+import random
+import time
+import tracemalloc
+import uuid
+from contextlib import redirect_stdout
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from authentification.tokens import issue_pair
+from backend.websocket import MSGPACK, MSGPACK_DEFLATE, decode
+from candidature.models import Candidature, OutboxEvent
+from candidature.outbox import dispatch_batch
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+from mission.models import Mission
+
+APPLY = "apply"
+INTERVIEW = "interview"
+MISSION = "mission"
+SCRIPTS = (APPLY, INTERVIEW, MISSION)
+DEFAULT_MIX = {APPLY: 0.4, INTERVIEW: 0.3, MISSION: 0.3}
+
+SUBPROTOCOLS = {"json": [], "msgpack": [MSGPACK], "deflate": [MSGPACK_DEFLATE]}
+
+User = get_user_model()
+
+
+def percentile(values, p):
+    """Rang le plus proche (p entre 0 et 100) ; None sans mesure."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(values):
+    return {
+        "n": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else None,
+    }
+
+
+def markers(content):
+    """Marqueurs d'opération contenus dans une trame reçue."""
+    if content.get("action") == "batch":
+        for event in content.get("events") or []:
+            mission = event.get("mission") or {}
+            if event.get("action") == "deleted":
+                yield ("deleted", mission.get("id_mission"))
+            else:
+                yield mission.get("titre")
+        return
+    if content.get("commentaire_entretien"):
+        yield content["commentaire_entretien"]
+    elif content.get("mission_titre") and content.get("freelance_nom"):
+        yield (content["mission_titre"], content["freelance_nom"])
+
+
+class Fixture:
+    """Entreprises, freelances, missions et candidatures du run (créées sans signaux)."""
+
+    def __init__(self, tag, clients, entreprise_ratio, missions_per_entreprise):
+        self.tag = tag
+        n_entreprises = max(1, round(clients * entreprise_ratio))
+        n_freelances = max(1, clients - n_entreprises)
+
+        User.objects.bulk_create(
+            [User(email=f"{tag}-e{i}@loadtest.invalid", role=User.ROLE_ENTREPRISE) for i in range(n_entreprises)]
+            + [User(email=f"{tag}-f{i}@loadtest.invalid", role=User.ROLE_FREELANCE) for i in range(n_freelances)]
+        )
+        # bulk_create ne renvoie pas les ids sous MySQL → relecture
+        users = {u.email: u for u in User.objects.filter(email__startswith=f"{tag}-")}
+        Entreprise.objects.bulk_create(
+            Entreprise(user=users[f"{tag}-e{i}@loadtest.invalid"], nom=f"{tag} entreprise {i}", secteur="IT")
+            for i in range(n_entreprises)
+        )
+        Freelance.objects.bulk_create(
+            Freelance(
+                user=users[f"{tag}-f{i}@loadtest.invalid"], nom=f"{tag} freelance {i}",
+                competence="Python, Django", experience="3 ans", formation="Master", tarif="50.00",
+            )
+            for i in range(n_freelances)
+        )
+        self.users = list(users.values())
+        self.entreprises = list(Entreprise.objects.filter(nom__startswith=f"{tag} ").order_by("pk"))
+        self.freelances = list(Freelance.objects.filter(nom__startswith=f"{tag} ").order_by("pk"))
+
+        Mission.objects.bulk_create(
+            Mission(
+                titre=f"{tag} mission {e.pk}-{j}", description="Développement d'une API de recrutement",
+                competence_requis="Python, Django", budget=100, entreprise=e,
+            )
+            for e in self.entreprises for j in range(missions_per_entreprise)
+        )
+        self.missions = list(Mission.objects.filter(entreprise__in=self.entreprises).select_related("entreprise"))
+        self.created_missions = []
+
+        # Une candidature par freelance : de quoi planifier des entretiens dès le départ
+        rng = random.Random(tag)
+        Candidature.objects.bulk_create(
+            Candidature(mission=rng.choice(self.missions), freelance=f, status="en_attente")
+            for f in self.freelances
+        )
+        self.candidatures = list(
+            Candidature.objects.filter(freelance__in=self.freelances).values_list("pk", flat=True)
+        )
+        self.pairs = set(
+            Candidature.objects.filter(freelance__in=self.freelances).values_list("mission_id", "freelance_id")
+        )
+
+    def tokens(self):
+        """Jeton d'accès par utilisateur (authentification du handshake, sans SQL)."""
+        return {user.pk: issue_pair(user)[0] for user in self.users}
+
+    def cleanup(self):
+        ids = list(Candidature.objects.filter(freelance__in=self.freelances).values_list("pk", flat=True))
+        User.objects.filter(email__startswith=f"{self.tag}-").delete()  # cascade profils, missions, candidatures
+        OutboxEvent.objects.filter(candidature_id__in=ids).delete()  # pas de clé étrangère
+
+
+class LoadTest:
+    def __init__(self, application, fixture, subprotocol="json", seed=None):
+        self.application = application
+        self.fixture = fixture
+        self.subprotocols = SUBPROTOCOLS[subprotocol]
+        self.rng = random.Random(seed)
+        self.sent = {}          # marqueur → (scénario, instant de publication)
+        self.latencies = {script: [] for script in SCRIPTS}
+        self.operations = {script: 0 for script in SCRIPTS}
+        self.errors = 0
+        self.frames = 0
+        self.closed = 0
+        self.candidature_sockets = {}
+        self._counter = 0
+
+    # --- connexions ---
+
+    def _paths(self, tokens):
+        for e in self.fixture.entreprises:
+            token = tokens[e.user_id]
+            yield ("candidatures", e.pk), f"/ws/candidatures/{e.pk}/?token={token}"
+            yield None, f"/ws/entretien/entreprise/{e.pk}/?token={token}"
+        for f in self.fixture.freelances:
+            token = tokens[f.user_id]
+            yield None, "/ws/missions/?token=" + token
+            yield None, f"/ws/entretien/freelance/{f.pk}/?token={token}"
+
+    async def connect(self, tokens, concurrency):
+        self.communicators = []
+        paths = list(self._paths(tokens))
+        for start in range(0, len(paths), concurrency):
+            chunk = paths[start:start + concurrency]
+            communicators = [
+                WebsocketCommunicator(self.application, path, subprotocols=self.subprotocols)
+                for _, path in chunk
+            ]
+            results = await asyncio.gather(*(c.connect(timeout=30) for c in communicators))
+            for (role, _), communicator, (connected, _) in zip(chunk, communicators, results):
+                if not connected:
+                    self.errors += 1
+                    continue
+                self.communicators.append(communicator)
+                if role is not None:
+                    self.candidature_sockets[role[1]] = communicator
+        self.readers = [asyncio.create_task(self._read(c)) for c in self.communicators]
+
+    async def disconnect(self):
+        for reader in self.readers:
+            reader.cancel()
+        await asyncio.gather(*(c.disconnect() for c in self.communicators), return_exceptions=True)
+
+    async def _read(self, communicator):
+        while True:
+            frame = await communicator.output_queue.get()
+            if frame["type"] != "websocket.send":
+                self.closed += 1
+                return
+            now = time.perf_counter()
+            self.frames += 1
+            if frame.get("bytes") is not None:
+                content = decode(frame["bytes"])
+            else:
+                content = json.loads(frame["text"])
+            for marker in markers(content):
+                published = self.sent.get(marker)
+                if published is not None:
+                    self.latencies[published[0]].append(now - published[1])
+
+    # --- scénarios ---
+
+    def _marker(self):
+        self._counter += 1
+        return f"{self.fixture.tag} op{self._counter}"
+
+    def _publish(self, script, marker):
+        self.sent[marker] = (script, time.perf_counter())
+
+    async def apply(self):
+        entreprise = self.rng.choice(self.fixture.entreprises)
+        missions = [m for m in self.fixture.missions if m.entreprise_id == entreprise.pk]
+        mission, freelance = self.rng.choice(missions), self.rng.choice(self.fixture.freelances)
+        if (mission.pk, freelance.pk) in self.fixture.pairs:
+            return await self.interview()
+        self.fixture.pairs.add((mission.pk, freelance.pk))
+        self._publish(APPLY, (mission.titre, freelance.nom))
+        await self.candidature_sockets[entreprise.pk].send_json_to(
+            {"mission_id": mission.pk, "freelance_id": freelance.pk}
+        )
+
+    async def interview(self):
+        marker = self._marker()
+        pk = self.rng.choice(self.fixture.candidatures)
+        date = timezone.now() + timedelta(days=self.rng.randint(1, 30), hours=self.rng.randint(0, 8))
+
+        @sync_to_async
+        def schedule():
+            candidature = Candidature.objects.select_related("mission__entreprise", "freelance").get(pk=pk)
+            candidature.status = "en_entretien"
+            candidature.date_entretien = date
+            candidature.commentaire_entretien = marker
+            self._publish(INTERVIEW, marker)
+            candidature.save()
+
+        await schedule()
+
+    async def mission(self):
+        marker = self._marker()
+        choice = self.rng.random()
+        created = self.fixture.created_missions
+
+        @sync_to_async
+        def crud():
+            if choice < 0.2 and created:
+                mission = created.pop(self.rng.randrange(len(created)))
+                self._publish(MISSION, ("deleted", mission.pk))
+                mission.delete()
+            elif choice < 0.6:
+                mission = self.rng.choice(self.fixture.missions)
+                mission.titre = marker
+                self._publish(MISSION, marker)
+                mission.save()
+            else:
+                entreprise = self.rng.choice(self.fixture.entreprises)
+                self._publish(MISSION, marker)
+                created.append(Mission.objects.create(
+                    titre=marker, description="Mission créée pendant le banc de charge",
+                    competence_requis="Python", budget=200, entreprise=entreprise,
+                ))
+
+        await crud()
+
+    async def _run(self, script):
+        self.operations[script] += 1
+        try:
+            await getattr(self, script)()
+        except Exception:
+            self.errors += 1
+
+    async def dispatcher(self, interval):
+        """Processus dispatch_outbox, dans la même boucle."""
+        while True:
+            sent, failed = await sync_to_async(dispatch_batch)()
+            if not sent and not failed:
+                await asyncio.sleep(interval)
+
+    async def drive(self, operations, rate, mix):
+        scripts, weights = zip(*mix.items())
+        tasks = []
+        start = time.perf_counter()
+        for i in range(operations):
+            # Boucle ouverte : la cadence ne dépend pas du temps de réponse
+            delay = start + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self._run(self.rng.choices(scripts, weights)[0])))
+        await asyncio.gather(*tasks)
+
+
+async def _scenario(test, tokens, options):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    await test.connect(tokens, options["concurrency"])
+    connect_time = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    dispatcher = asyncio.create_task(test.dispatcher(options["dispatch_interval"]))
+    started = time.perf_counter()
+    frames = test.frames
+    try:
+        await test.drive(options["operations"], options["rate"], options["mix"])
+        # Dernières remises : fenêtre de diffusion, dispatcher, files d'envoi
+        await asyncio.sleep(options["drain"])
+    finally:
+        dispatcher.cancel()
+        duration = time.perf_counter() - started
+        await test.disconnect()
+
+    sockets = len(test.communicators)
+    every = [value for values in test.latencies.values() for value in values]
+    return {
+        "sockets": sockets,
+        "connect_seconds": connect_time,
+        "memory_per_socket": memory / sockets if sockets else None,
+        "operations": dict(test.operations),
+        "errors": test.errors,
+        "closed": test.closed,
+        "duration": duration,
+        "frames": test.frames - frames,
+        "frames_per_second": (test.frames - frames) / duration if duration else None,
+        "latency": {**{script: summarize(test.latencies[script]) for script in SCRIPTS}, "all": summarize(every)},
+    }
+
+
+def run(clients=1000, operations=500, rate=50.0, mix=None, entreprise_ratio=0.1,
+        missions_per_entreprise=3, subprotocol="json", concurrency=200, dispatch_interval=0.5,
+        drain=2.0, seed=None, keep=False):
+    """
+    Lance un run complet et retourne le rapport (dict). Code synchrone : l'ORM
+    des scénarios s'exécute dans le thread appelant, comme dans un worker Daphne.
+    """
+    from backend.asgi import application
+
+    tag = f"loadtest-{uuid.uuid4().hex[:8]}"
+    fixture = Fixture(tag, clients, entreprise_ratio, missions_per_entreprise)
+    try:
+        test = LoadTest(application, fixture, subprotocol=subprotocol, seed=seed)
+        options = {
+            "concurrency": concurrency, "dispatch_interval": dispatch_interval, "drain": drain,
+            "operations": operations, "rate": rate, "mix": mix or DEFAULT_MIX,
+        }
+        tokens = fixture.tokens()
+        # Les consumers tracent chaque connexion par print() : inutile ici
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            return async_to_sync(_scenario)(test, tokens, options)
+    finally:
+        if not keep:
+            fixture.cleanup()
@@ -0,0 +1,60 @@
+# backend/media.py
+"""
+Service des médias (MEDIA_URL).
+
+Django ne lit pas le fichier : il répond par un en-tête X-Accel-Redirect
+vers l'emplacement interne nginx MEDIA_ACCEL_REDIRECT (/_media/), et nginx
+envoie le fichier depuis le PVC, ou depuis le bucket s'il n'y est pas, avec
+Range, ETag et If-None-Match. nginx conserve le Content-Type et le
+Cache-Control de cette réponse :
+- nom adressé par contenu (backend/storage.py) : immutable, un an ;
+- ancien nom (avant adressage) : une heure.
+
+Sans nginx (MEDIA_ACCEL_REDIRECT vide, développement), le fichier est
+envoyé par Django, avec l'empreinte comme ETag (304 si inchangé).
+"""
+import mimetypes
+import posixpath
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.views.decorators.http import require_safe
+
+from .storage import IMMUTABLE, content_address
+
+REVALIDATE = "public, max-age=3600"
+
+
+def _clean(path):
+    name = posixpath.normpath(path).lstrip("/")
+    if name in ("", ".") or name.startswith("..") or "\x00" in name:
+        raise Http404("Fichier introuvable.")
+    return name
+
+
+@require_safe
+def serve_media(request, path):
+    name = _clean(path)
+    address = content_address(name)
+    headers = {"Cache-Control": IMMUTABLE if address else REVALIDATE}
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+    accel = getattr(settings, "MEDIA_ACCEL_REDIRECT", "")
+    if accel:
+        # Existence, Range et ETag : nginx (404 si absent partout)
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response["X-Accel-Redirect"] = accel + quote(name)
+        return response
+
+    if address:
+        etag = f'"{address}"'
+        headers["ETag"] = etag
+        if etag in request.headers.get("If-None-Match", ""):
+            return HttpResponseNotModified(headers=headers)
+    try:
+        handle = default_storage.open(name, "rb")
+    except (FileNotFoundError, IsADirectoryError):
+        raise Http404("Fichier introuvable.")
+    return FileResponse(handle, content_type=content_type, headers=headers)
@@ -0,0 +1,178 @@
+# backend/pagination.py
+"""
+Pagination par curseur (keyset) pour les listes de l'API.
+
+Le curseur encode les valeurs des clés de tri du dernier élément renvoyé :
+la page suivante est obtenue par un WHERE sur ces clés (jamais d'OFFSET),
+donc une page profonde coûte autant que la première.
+
+Pour ne pas casser les clients existants, la pagination n'est active que si
+la requête contient `cursor` ou `page_size` ; sinon la vue renvoie la liste
+complète comme avant.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    # Champs de tri : "-champ" pour décroissant. Le dernier doit être unique.
+    ordering = ("-pk",)
+    page_size = None
+    max_page_size = 200
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Curseur invalide."
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request):
+        default = self.page_size or settings.REST_FRAMEWORK.get("PAGE_SIZE") or 50
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, default))
+        except (TypeError, ValueError):
+            size = default
+        return max(1, min(size, self.max_page_size))
+
+    # --- Encodage du curseur ---
+    def encode_cursor(self, values):
+        raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, model, token):
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                None if value is None else self._field(model, name).to_python(value)
+                for name, value in zip(self._names(), values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    # --- Construction de la requête ---
+    def _names(self):
+        return [field.lstrip("-") for field in self.ordering]
+
+    @staticmethod
+    def _field(model, name):
+        return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+    def order_queryset(self, queryset):
+        # NULL toujours en fin de liste, quel que soit le sens (comme MySQL en DESC).
+        # Champs non NULL : tri simple, pour que l'index serve directement au tri.
+        order = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            nulls_last = True if self._field(queryset.model, name).null else None
+            expression = F(name).desc if field.startswith("-") else F(name).asc
+            order.append(expression(nulls_last=nulls_last))
+        return queryset.order_by(*order)
+
+    def after_cursor(self, model, values):
+        """
+        (a, b) > (x, y) dans l'ordre de tri, développé en
+        a > x OR (a = x AND b > y), avec les NULL placés en dernier.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            nullable = self._field(model, name).null
+            if value is None:
+                # Après un NULL il n'y a plus que des NULL sur ce champ
+                equal &= Q(**{f"{name}__isnull": True})
+                continue
+            lookup = "lt" if field.startswith("-") else "gt"
+            strictly_after = Q(**{f"{name}__{lookup}": value})
+            if nullable:
+                strictly_after |= Q(**{f"{name}__isnull": True})
+            condition |= equal & strictly_after
+            equal &= Q(**{name: value})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        queryset = self.order_queryset(queryset)
+
+        token = request.query_params.get(self.cursor_query_param)
+        if token:
+            values = self.decode_cursor(queryset.model, token)
+            queryset = queryset.filter(self.after_cursor(queryset.model, values))
+
+        # Une ligne de plus pour savoir s'il existe une page suivante
+        rows = list(queryset[: self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[: self.page_size_value]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        values = [getattr(last, name) for name in self._names()]
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size_value)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class MissionPagination(KeysetPagination):
+    ordering = ("-id_mission",)
+
+
+class CandidaturePagination(KeysetPagination):
+    ordering = ("-date", "-id_candidature")
+
+
+class EntretienPagination(KeysetPagination):
+    ordering = ("-date_entretien", "-id_candidature")
+
+
+class MissionFeedPagination(KeysetPagination):
+    ordering = ("-score", "-mission_id")
+
+    def is_requested(self, request):
+        # Nouveau point d'entrée : toujours paginé
+        return True
+
+
+class ShortlistPagination(KeysetPagination):
+    """Top-k des candidatures d'une mission : ?k= par page, curseur pour les k suivants."""
+    ordering = ("-score", "-id_candidature")
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "k"
+
+    def is_requested(self, request):
+        return True
@@ -0,0 +1,194 @@
+# backend/replay.py
+"""
+Numéros de séquence et journal de rejeu des groupes WebSocket
+(freelance_<id>, entreprise_<id>, missions).
+
+Chaque événement de groupe reçoit, à la publication, un numéro croissant
+propre au groupe ("seq", recopié dans les trames envoyées au client) et
+est conservé dans un journal borné (WEBSOCKET_REPLAY_SIZE événements, oublié
+après WEBSOCKET_REPLAY_TTL secondes sans publication).
+
+À la reconnexion, le client passe ?last_seq=<dernier seq reçu> : le consumer
+rejoue seulement l'écart, puis reprend le direct sans doublon. Si l'écart
+est sorti du journal, il reçoit {"action": "resync"} et recharge par HTTP.
+
+WEBSOCKET_REPLAY : "redis" (un stream par groupe, id = seq) ou "memory"
+(remplaçant en mémoire du processus, pour les tests).
+"""
+import json
+import threading
+from collections import deque
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+REDIS = "redis"
+MEMORY = "memory"
+
+PREFIX = "replay:"
+
+
+def _size():
+    return getattr(settings, "WEBSOCKET_REPLAY_SIZE", 500)
+
+
+def _ttl():
+    return getattr(settings, "WEBSOCKET_REPLAY_TTL", 3600)
+
+
+class MemoryLog:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._groups = {}
+
+    def append(self, group, event):
+        with self._lock:
+            seq, events = self._groups.get(group, (0, None))
+            if events is None or events.maxlen != _size():
+                events = deque(events or (), maxlen=_size())
+            seq += 1
+            events.append({**event, "seq": seq})
+            self._groups[group] = (seq, events)
+            return events[-1]
+
+    def since(self, group, last_seq):
+        with self._lock:
+            seq, events = self._groups.get(group, (0, deque()))
+            if last_seq == seq:
+                return []
+            if last_seq > seq:  # journal perdu (redémarrage) : numéros repartis de zéro
+                return None
+            if not events or events[0]["seq"] > last_seq + 1:
+                return None
+            return [e for e in events if e["seq"] > last_seq]
+
+    def clear(self):
+        with self._lock:
+            self._groups.clear()
+
+
+# INCR + XADD atomiques : l'id du stream est le numéro de séquence
+_APPEND = """
+local seq = redis.call('INCR', KEYS[1])
+redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[2], seq .. '-0', 'e', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return seq
+"""
+
+
+class RedisLog:
+    def __init__(self):
+        import redis
+        self._client = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+        self._append = self._client.register_script(_APPEND)
+
+    def append(self, group, event):
+        seq = self._append(
+            keys=[f"{PREFIX}seq:{group}", f"{PREFIX}{group}"], args=[json.dumps(event), _size(), _ttl()]
+        )
+        return {**event, "seq": int(seq)}
+
+    def since(self, group, last_seq):
+        current = int(self._client.get(f"{PREFIX}seq:{group}") or 0)
+        if last_seq == current:
+            return []
+        if last_seq > current:  # groupe expiré : numéros repartis de zéro
+            return None
+        entries = self._client.xrange(f"{PREFIX}{group}", min=f"{last_seq + 1}-0", max="+")
+        seqs = [int(entry_id.split(b"-")[0]) for entry_id, _ in entries]
+        if not seqs or seqs[0] > last_seq + 1:
+            return None
+        return [{**json.loads(fields[b"e"]), "seq": seq} for seq, (_, fields) in zip(seqs, entries)]
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def log():
+    global _log
+    backend = getattr(settings, "WEBSOCKET_REPLAY", MEMORY)
+    cls = RedisLog if backend == REDIS else MemoryLog
+    with _log_lock:
+        if not isinstance(_log, cls):
+            _log = cls()
+        return _log
+
+
+def stamp(group, event):
+    """Attribue le numéro de séquence et journalise ; retourne l'événement à publier."""
+    return log().append(group, event)
+
+
+astamp = sync_to_async(stamp, thread_sensitive=False)
+
+
+def since(group, last_seq):
+    """Événements publiés après last_seq, [] si à jour, None si l'écart n'est plus journalisé."""
+    return log().since(group, last_seq)
+
+
+def with_seq(content, event):
+    """Trame client : le message de l'événement, avec son seq s'il en a un."""
+    if "seq" not in event:
+        return content
+    return {**content, "seq": event["seq"]}
+
+
+class ResumableMixin:
+    """
+    Consumers à flux reprenable. Après group_add + accept, appeler resume() ;
+    chaque handler d'événement commence par `if not self.fresh(event): return`
+    et envoie par deliver().
+    """
+
+    _replayed = 0  # seq le plus haut remis par resume()
+    _replaying = False
+
+    def _requested_seq(self):
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        try:
+            return max(0, int(query["last_seq"][0]))
+        except (KeyError, ValueError):
+            return None
+
+    async def resume(self):
+        last_seq = self._requested_seq()
+        if last_seq is None:
+            return
+        events = await sync_to_async(since, thread_sensitive=False)(self.group_name, last_seq)
+        if events is None:
+            await self.send_message({"action": "resync"})
+            return
+        self._replaying = True
+        try:
+            for event in events:
+                handler = getattr(self, event["type"].replace(".", "_"), None)
+                if handler is not None:
+                    await handler(event)
+        finally:
+            self._replaying = False
+            self._replayed = max([last_seq] + [event["seq"] for event in events])
+
+    def fresh(self, event):
+        """
+        Faux pour un événement déjà remis : déjà reçu par le client (last_seq)
+        ou rejoué, puis reçu en direct. Au-delà, rien n'est écarté : le seq est
+        attribué avant group_send, par plusieurs processus (onglets d'une même
+        entreprise, dispatchers de l'outbox), le direct peut donc arriver dans
+        le désordre.
+        """
+        seq = event.get("seq")
+        if seq is None or self._replaying:
+            return True
+        return seq > self._replayed
+
+    async def deliver(self, content, event):
+        content = with_seq(content, event)
+        if self._replaying:
+            # Rejeu : envoyé directement, dans l'ordre, avant le direct
+            await self.send_message(content)
+        else:
+            await self.queue_message(content)
@@ -0,0 +1,39 @@
+# backend/serializers.py
+"""
+Serializers qui déclarent leurs besoins en relations, pour éviter le N+1 :
+
+    class Meta:
+        model = Candidature
+        select_related = ("mission", "freelance__user")
+        only = ("id_candidature", "mission__titre", ...)
+
+Passer un QuerySet avec many=True applique automatiquement la projection ;
+les vues paginées appellent setup_queryset() avant de découper la page.
+"""
+from django.db.models import QuerySet
+
+
+class OptimizedQuerysetMixin:
+
+    @classmethod
+    def setup_queryset(cls, queryset):
+        meta = getattr(cls, "Meta", None)
+        select_related = getattr(meta, "select_related", ())
+        prefetch_related = getattr(meta, "prefetch_related", ())
+        only = getattr(meta, "only", ())
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        if only:
+            queryset = queryset.only(*only)
+        return queryset
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        if args and isinstance(args[0], QuerySet):
+            args = (cls.setup_queryset(args[0]),) + args[1:]
+        elif isinstance(kwargs.get("instance"), QuerySet):
+            kwargs["instance"] = cls.setup_queryset(kwargs["instance"])
+        return super().many_init(*args, **kwargs)
@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     'mission',
     'freelance',
     'candidature',
+    'courrier',
 ]
 
 SITE_ID = 1
@@ -60,6 +61,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "authentification.middleware.ProfilMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django_prometheus.middleware.PrometheusAfterMiddleware",
@@ -72,10 +74,27 @@ PROMETHEUS_EXPORT_MIGRATIONS = False
 # -------------------------------
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        # Jeton signé vérifié localement (aucune requête SQL), puis session
+        "authentification.authentication.SignedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
-    ]
+    ],
+    # Pagination keyset (?cursor= / ?page_size=), voir backend/pagination.py
+    "DEFAULT_PAGINATION_CLASS": "backend.pagination.KeysetPagination",
+    "PAGE_SIZE": config("API_PAGE_SIZE", default=50, cast=int),
+    # Proxys de confiance devant Django (nginx du frontend, plus l'ingress en
+    # k8s) : l'IP client est lue à cette position depuis la fin de
+    # X-Forwarded-For, ce qu'un client place avant est ignoré
+    "NUM_PROXIES": config("NUM_PROXIES", default=1, cast=int),
 }
 
+# Jetons signés (authentification/tokens.py) : durées de vie en secondes
+AUTH_ACCESS_TTL = config("AUTH_ACCESS_TTL", default=15 * 60, cast=int)
+AUTH_REFRESH_TTL = config("AUTH_REFRESH_TTL", default=7 * 24 * 3600, cast=int)
+AUTH_ACCESS_COOKIE = "access_token"
+AUTH_REFRESH_COOKIE = "refresh_token"
+# Cache du profil entreprise / freelance par utilisateur (authentification/profils.py)
+PROFIL_CACHE_TTL = config("PROFIL_CACHE_TTL", default=3600, cast=int)
+
 # -------------------------------
 # CORS pour React
 # -------------------------------
@@ -143,6 +162,39 @@ else:
     }
 AUTH_USER_MODEL = 'authentification.User'
 
+# Login : une lecture de l'utilisateur, hachage dans un pool borné
+# (authentification/backends.py, authentification/admission.py)
+AUTHENTICATION_BACKENDS = ["authentification.backends.PooledModelBackend"]
+
+# -------------------------------
+# Hachage des mots de passe
+# -------------------------------
+# PBKDF2 aux itérations réglables (comparer avec manage.py bench_hashers) ;
+# les hachages aux anciens paramètres sont recalculés à la connexion suivante
+PASSWORD_HASHERS = [
+    "authentification.hashers.ConfigurablePBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+PASSWORD_PBKDF2_ITERATIONS = config("PASSWORD_PBKDF2_ITERATIONS", default=1_000_000, cast=int)
+
+# Admission du login : fenêtre glissante (secondes) et limites par IP / par compte
+LOGIN_THROTTLE_WINDOW = config("LOGIN_THROTTLE_WINDOW", default=300, cast=int)
+LOGIN_IP_LIMIT = config("LOGIN_IP_LIMIT", default=20, cast=int)
+LOGIN_ACCOUNT_LIMIT = config("LOGIN_ACCOUNT_LIMIT", default=5, cast=int)
+# Hachages simultanés par processus (≈ cœurs alloués) et tentatives en attente
+LOGIN_HASH_WORKERS = config("LOGIN_HASH_WORKERS", default=1, cast=int)
+LOGIN_HASH_QUEUE = config("LOGIN_HASH_QUEUE", default=8, cast=int)
+
+# Import en masse (authentification/provisioning.py) : taille maximale d'un
+# fichier validé par POST /auth/provisioning/, et nombre de comptes qu'il crée
+# lui-même (hachés dans le pool du login : le pod web n'a qu'une fraction de
+# CPU) ; au-delà, manage.py provision_users, qui utilise tous les cœurs
+PROVISIONING_MAX_ROWS = config("PROVISIONING_MAX_ROWS", default=2000, cast=int)
+PROVISIONING_INLINE_ROWS = config("PROVISIONING_INLINE_ROWS", default=10, cast=int)
+
 # -------------------------------
 # Validation des mots de passe
 # -------------------------------
@@ -163,6 +215,21 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = config("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+EMAIL_TIMEOUT = config("EMAIL_TIMEOUT", default=10, cast=int)
+# File d'envoi (courrier/envoi.py) : taille des lots et nombre maximal de tentatives
+COURRIER_BATCH_SIZE = config("COURRIER_BATCH_SIZE", default=50, cast=int)
+COURRIER_MAX_ATTEMPTS = config("COURRIER_MAX_ATTEMPTS", default=8, cast=int)
+# Bail d'un lot (secondes) : doit couvrir un lot entier au pire EMAIL_TIMEOUT par message
+COURRIER_LEASE = config("COURRIER_LEASE", default=600, cast=int)
+
+# -------------------------------
+# Recommandation de freelances (candidature/recommendation.py)
+# -------------------------------
+RECOMMANDATION_TOP_K = config("RECOMMANDATION_TOP_K", default=10, cast=int)
+RECOMMANDATION_POOL = config("RECOMMANDATION_POOL", default=500, cast=int)
+RECOMMANDATION_SCORE_MIN = config("RECOMMANDATION_SCORE_MIN", default=10.0, cast=float)
+# Score minimal pour entrer dans le fil "missions pour vous" (mission/feed.py)
+MISSION_FEED_SCORE_MIN = config("MISSION_FEED_SCORE_MIN", default=5.0, cast=float)
 
 # -------------------------------
 # Internationalisation
@@ -182,12 +249,56 @@ MEDIA_URL = "/media/"
 MEDIA_ROOT = "/app/media"
 STATIC_ROOT = "/app/static"
 
+# Médias adressés par contenu + copie différée vers un stockage objet (backend/storage.py)
+STORAGES = {
+    "default": {"BACKEND": "backend.storage.MediaStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+# "" (PVC seul), "gcs" (bucket GS_BUCKET_NAME) ou "filesystem" (dossier local remplaçant le bucket)
+MEDIA_OBJECT_STORE = config("MEDIA_OBJECT_STORE", default="")
+MEDIA_OBJECT_STORE_ROOT = config("MEDIA_OBJECT_STORE_ROOT", default="/app/media-store")
+MEDIA_STORE_WORKERS = config("MEDIA_STORE_WORKERS", default=2, cast=int)
+GS_BUCKET_NAME = config("GS_BUCKET_NAME", default="")
+GS_PROJECT_ID = config("GS_PROJECT_ID", default="")
+# Emplacement interne nginx des médias (backend/media.py) ; vide : fichiers envoyés par Django
+MEDIA_ACCEL_REDIRECT = config("MEDIA_ACCEL_REDIRECT", default="" if DEBUG else "/_media/")
+# Variantes thumb/card/full des photos et logos (backend/images.py) : threads du
+# pool par processus, 0 = traitement immédiat après le commit
+IMAGE_VARIANT_WORKERS = config("IMAGE_VARIANT_WORKERS", default=2, cast=int)
+
 # -------------------------------
 # Channels / Redis
 # -------------------------------
 REDIS_HOST = config("REDIS_HOST", default="127.0.0.1")
 REDIS_PORT = config("REDIS_PORT", default=6379, cast=int)
 
+# Fenêtre (secondes) de regroupement des diffusions de missions
+MISSION_BROADCAST_WINDOW = config("MISSION_BROADCAST_WINDOW", default=0.2, cast=float)
+# Durée (secondes) au-delà de laquelle un trou du journal des missions est
+# tenu pour une transaction annulée (mission/sync.py)
+MISSION_SYNC_GRACE = config("MISSION_SYNC_GRACE", default=30, cast=int)
+# Diffusion du groupe "missions" (backend/fanout.py) : "layer" (un envoi Redis
+# par socket), "redis" (un abonnement pub/sub par worker) ou "local" (processus seul)
+WEBSOCKET_FANOUT = config(
+    "WEBSOCKET_FANOUT", default="local" if os.environ.get("CI") == "true" else "redis"
+)
+# Sous-protocole msgpack+deflate (backend/websocket.py) : taille minimale compressée
+WEBSOCKET_DEFLATE_MIN = config("WEBSOCKET_DEFLATE_MIN", default=256, cast=int)
+# Taille maximale d'un message client, une fois décompressé (octets)
+WEBSOCKET_MAX_MESSAGE = config("WEBSOCKET_MAX_MESSAGE", default=1024 * 1024, cast=int)
+# File d'envoi bornée par socket (backend/websocket.py) et politique de débordement
+# par consumer : {"MissionConsumer": "drop_oldest"} ("coalesce", "drop_oldest", "disconnect")
+WEBSOCKET_SEND_QUEUE = config("WEBSOCKET_SEND_QUEUE", default=100, cast=int)
+# Trames écrites non acquittées au plus, pour les clients connectés avec ?ack=1
+WEBSOCKET_SEND_WINDOW = config("WEBSOCKET_SEND_WINDOW", default=100, cast=int)
+WEBSOCKET_OVERFLOW = {}
+# Journal de rejeu des groupes (backend/replay.py) : "redis" (streams) ou "memory"
+WEBSOCKET_REPLAY = config(
+    "WEBSOCKET_REPLAY", default="memory" if os.environ.get("CI") == "true" else "redis"
+)
+WEBSOCKET_REPLAY_SIZE = config("WEBSOCKET_REPLAY_SIZE", default=500, cast=int)
+WEBSOCKET_REPLAY_TTL = config("WEBSOCKET_REPLAY_TTL", default=3600, cast=int)
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
@@ -197,6 +308,19 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Cache partagé (révocation des jetons, ...) : Redis, base 1 (la 0 sert aux channels)
+if os.environ.get("CI") == "true":
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/1",
+        },
+    }
+
 # -------------------------------
 # Clé primaire par défaut
 # -------------------------------
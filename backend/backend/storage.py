@@ -0,0 +1,192 @@
+# backend/storage.py
+"""
+Stockage des médias par adresse de contenu.
+
+Un fichier envoyé est enregistré sous le SHA-256 de son contenu :
+freelance_photos/photo.jpg → freelance_photos/3f/3fa9…e1.jpg. Deux envois
+identiques partagent donc le même fichier (rien n'est réécrit), et un nom ne
+change jamais de contenu : il peut être mis en cache sans limite
+(Cache-Control immutable, backend/media.py).
+
+Le nom fourni n'est jamais cru : l'empreinte est toujours recalculée. Seuls
+les fichiers rangés sous l'empreinte d'un original (variantes d'une image,
+backend/images.py : freelance_photos/3f/variants/3fa9…e1.jpg/thumb.webp)
+sont des fichiers dérivés, gardés tels quels et jamais réécrits.
+
+Copie différée (write-behind) vers un stockage objet, MEDIA_OBJECT_STORE :
+- ""           : aucune (disque local / PVC seul) ;
+- "gcs"        : bucket GS_BUCKET_NAME (django-storages) ;
+- "filesystem" : dossier MEDIA_OBJECT_STORE_ROOT, remplaçant local du bucket.
+L'écriture locale reste synchrone ; la copie part sur un pool de
+MEDIA_STORE_WORKERS threads (0 : immédiate). Un fichier absent du disque
+local est relu depuis le stockage objet. Rattrapage : commande sync_media_store.
+
+Le fichier lui-même n'est jamais servi par Django : voir backend/media.py.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+GCS = "gcs"
+FILESYSTEM = "filesystem"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Un segment du chemin = empreinte SHA-256 (+ extension)
+_ADDRESS = re.compile(r"(?:^|/)([0-9a-f]{64})(?:\.[0-9a-z]{1,10})?(?:/|$)")
+_EXTENSION = re.compile(r"^\.[0-9a-z]{1,10}$")
+
+
+def content_address(name):
+    """Empreinte contenue dans le nom, None pour un ancien nom (avant adressage)."""
+    match = _ADDRESS.search(name or "")
+    return match.group(1) if match else None
+
+
+def digest(content):
+    sha = hashlib.sha256()
+    for chunk in content.chunks():
+        sha.update(chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return sha.hexdigest()
+
+
+def hashed_name(name, hexdigest):
+    directory = os.path.dirname(name)
+    extension = os.path.splitext(name)[1].lower()
+    if not _EXTENSION.match(extension):
+        extension = ""
+    return os.path.join(directory, hexdigest[:2], hexdigest + extension).replace("\\", "/")
+
+
+def derived(name):
+    """Vrai pour un fichier dérivé : l'empreinte d'un original est un de ses dossiers."""
+    return content_address(os.path.dirname(name or "")) is not None
+
+
+def _source_name(name):
+    """Nom déjà adressé (…/3f/3fa9…e1.jpg) → nom d'origine (…/3fa9…e1.jpg)."""
+    directory, filename = os.path.split(name)
+    address = content_address(filename)
+    if address and os.path.basename(directory) == address[:2]:
+        directory = os.path.dirname(directory)
+    return os.path.join(directory, filename)
+
+
+class ContentAddressedMixin:
+    """
+    Le nom d'un fichier est toujours recalculé depuis ses octets : un envoi
+    nommé « <empreinte d'un autre fichier>.png » ne peut pas le remplacer.
+    Seuls les fichiers dérivés (variantes, sous le dossier de l'empreinte de
+    leur original) gardent leur nom. Écrire sous un nom existant ne fait rien.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        if not derived(name):
+            name = hashed_name(_source_name(name), digest(content))
+        if self.exists(name):
+            return name  # doublon (même empreinte) ou variante déjà produite
+        return super().save(name, content, max_length=max_length)
+
+
+def _remote_storage(backend):
+    if backend == GCS:
+        from storages.backends.gcloud import GoogleCloudStorage
+        return GoogleCloudStorage(
+            bucket_name=settings.GS_BUCKET_NAME,
+            project_id=getattr(settings, "GS_PROJECT_ID", None) or None,
+            object_parameters={"cache_control": IMMUTABLE},
+            file_overwrite=True,
+        )
+    if backend == FILESYSTEM:
+        return FileSystemStorage(location=settings.MEDIA_OBJECT_STORE_ROOT, allow_overwrite=True)
+    return None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _submit(job, *args):
+    global _pool
+    if getattr(settings, "MEDIA_STORE_WORKERS", 2) <= 0:
+        job(*args)
+        return
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=settings.MEDIA_STORE_WORKERS, thread_name_prefix="media-store"
+            )
+    _pool.submit(job, *args)
+
+
+class MediaStorage(ContentAddressedMixin, FileSystemStorage):
+    """MEDIA_ROOT adressé par contenu, copié en différé vers le stockage objet."""
+
+    def __init__(self, **kwargs):
+        # Même nom = même contenu (save() vérifie l'empreinte) : jamais de
+        # suffixe « _AbC12 », et deux envois identiques simultanés réécrivent
+        # les mêmes octets
+        kwargs.setdefault("allow_overwrite", True)
+        super().__init__(**kwargs)
+
+    @cached_property
+    def remote(self):
+        return _remote_storage(getattr(settings, "MEDIA_OBJECT_STORE", ""))
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting in ("MEDIA_OBJECT_STORE", "MEDIA_OBJECT_STORE_ROOT", "GS_BUCKET_NAME"):
+            self.__dict__.pop("remote", None)
+
+    def _save(self, name, content):
+        name = super()._save(name, content)
+        if self.remote is not None:
+            _submit(self.push, name)
+        return name
+
+    def push(self, name):
+        """Copie un fichier local vers le stockage objet (s'il n'y est pas déjà)."""
+        remote = self.remote
+        try:
+            if remote.exists(name):
+                return False
+            with super().open(name, "rb") as handle:
+                remote.save(name, handle)
+            return True
+        except Exception:
+            logger.exception("Copie vers le stockage objet : %s", name)
+            return False
+
+    def open(self, name, mode="rb"):
+        try:
+            return super().open(name, mode)
+        except FileNotFoundError:
+            if self.remote is None or "r" not in mode:
+                raise
+            return self.remote.open(name, mode)
+
+    def exists(self, name):
+        if super().exists(name):
+            return True
+        return self.remote is not None and self.remote.exists(name)
+
+    def delete(self, name):
+        super().delete(name)
+        if self.remote is not None:
+            self.remote.delete(name)
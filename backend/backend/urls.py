@@ -15,9 +15,9 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path,include
+from django.urls import path,include,re_path
 from django.conf import settings          # <-- importer settings
-from django.conf.urls.static import static  # <-- pour servir les fichiers médias
+from backend.media import serve_media       # <-- médias : X-Accel-Redirect vers nginx
 
 
 urlpatterns = [
@@ -28,7 +28,6 @@ urlpatterns = [
     path('msn/', include('mission.urls')),
     path('frl/', include('freelance.urls')),
     path('ptl/' , include('candidature.urls')),
+    # Django choisit les en-têtes, nginx envoie le fichier (backend/media.py)
+    re_path(rf"^{settings.MEDIA_URL.strip('/')}/(?P<path>.+)$", serve_media, name="media"),
 ]
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,324 @@
+# backend/websocket.py
+"""
+Outils communs des consumers WebSocket.
+
+CompactProtocolMixin — sous-protocole compact, négocié à la connexion (en-tête
+Sec-WebSocket-Protocol). JSON texte reste le format par défaut.
+
+- "soutenance.msgpack.v1"         : trames binaires msgpack ;
+- "soutenance.msgpack+deflate.v1" : idem, compressées (deflate brut) au-delà
+  de WEBSOCKET_DEFLATE_MIN octets.
+
+Trame binaire = 1 octet d'en-tête (0 : msgpack, 1 : msgpack compressé) + charge.
+Les clés connues (FIELDS) sont remplacées par leur indice dans la table :
+« freelance_description » devient un entier d'un octet. La table est envoyée
+au client juste après l'acceptation ({"action": "hello", "fields": [...]}),
+toujours en JSON, pour que le décodeur ne code rien en dur ; un changement de
+table impose un nouveau nom de sous-protocole (.v2).
+
+Les messages reçus peuvent être du JSON texte ou du msgpack binaire (mêmes règles),
+de WEBSOCKET_MAX_MESSAGE octets au plus une fois décompressés ; un message
+illisible ou trop long reçoit {"error": ...} sans fermer la connexion.
+
+BoundedSendMixin — file d'envoi bornée par connexion pour les événements de
+groupe : le handler ne fait que déposer le message, une tâche par connexion
+l'écrit sur la socket. Le serveur (Daphne) n'attend jamais un client lent :
+send() remplit le tampon de Twisted sans limite. Seul le client peut donc
+signaler son retard, en acquittant ce qu'il a reçu :
+
+- connexion avec ?ack=1 : le client renvoie {"action": "ack", "seq": N}, N
+  étant le seq de la dernière trame traitée (trames de groupe, backend/replay.py) ;
+- au plus WEBSOCKET_SEND_WINDOW trames écrites et non acquittées ; les
+  suivantes attendent dans la file (WEBSOCKET_SEND_QUEUE messages) ;
+- sans ?ack=1 (anciens clients), tout part aussitôt : rien ne borne le tampon.
+
+File pleine, politique de débordement :
+- "coalesce"    : remplace le message en attente de la même entité
+  (message_key), sinon bascule en "disconnect" ;
+- "drop_oldest" : abandonne le plus ancien message en attente ;
+- "disconnect"  : envoie {"action": "resync"} puis ferme (code 4008) ; le
+  client se reconnecte et recharge (ou demande un delta depuis sa version).
+Politique par défaut : attribut overflow du consumer, surchargeable par
+WEBSOCKET_OVERFLOW = {"NomDuConsumer": "drop_oldest"}.
+Métriques Prometheus : websocket_send_queue_depth (messages en attente ou non
+acquittés, par consumer) et websocket_send_queue_overflow_total (par consumer
+et politique).
+"""
+import asyncio
+import json
+import zlib
+from collections import deque
+from urllib.parse import parse_qs
+
+import msgpack
+from django.conf import settings
+from prometheus_client import Counter, Gauge
+
+JSON = None
+MSGPACK = "soutenance.msgpack.v1"
+MSGPACK_DEFLATE = "soutenance.msgpack+deflate.v1"
+SUBPROTOCOLS = (MSGPACK_DEFLATE, MSGPACK)
+
+RAW = 0
+DEFLATE = 1
+
+# Ordre figé (v1) : ajouter à la fin, ne jamais réordonner
+FIELDS = (
+    "action", "events", "mission", "missions", "deleted", "version", "count", "deleted_count",
+    "id_mission", "titre", "description", "competence_requis", "budget",
+    "entreprise_nom", "entreprise_secteur", "entreprise_photo",
+    "id_candidature", "date", "status", "score", "created", "error", "results", "candidature",
+    "mission_id", "freelance_id", "mission_titre",
+    "freelance_nom", "freelance_description", "freelance_competence", "freelance_experience",
+    "freelance_formation", "freelance_certificat", "freelance_tarif", "freelance_email", "freelance_photo",
+    "date_entretien", "commentaire_entretien", "timezone",
+)
+_CODES = {name: code for code, name in enumerate(FIELDS)}
+
+
+def _shorten(value):
+    if isinstance(value, dict):
+        return {_CODES.get(k, k): _shorten(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_shorten(v) for v in value]
+    return value
+
+
+def _expand(value):
+    if isinstance(value, dict):
+        return {
+            FIELDS[k] if isinstance(k, int) and 0 <= k < len(FIELDS) else k: _expand(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_expand(v) for v in value]
+    return value
+
+
+def deflate_min():
+    return getattr(settings, "WEBSOCKET_DEFLATE_MIN", 256)
+
+
+def encode(content, subprotocol):
+    """Message → trame binaire du sous-protocole."""
+    packed = msgpack.packb(_shorten(content), use_bin_type=True)
+    if subprotocol == MSGPACK_DEFLATE and len(packed) >= deflate_min():
+        compressor = zlib.compressobj(wbits=-15)
+        compressed = compressor.compress(packed) + compressor.flush()
+        if len(compressed) < len(packed):
+            return bytes((DEFLATE,)) + compressed
+    return bytes((RAW,)) + packed
+
+
+class InvalidFrame(ValueError):
+    """Message client illisible ou trop gros : réponse {"error": ...}, la connexion reste ouverte."""
+
+
+def max_message():
+    return getattr(settings, "WEBSOCKET_MAX_MESSAGE", 1024 * 1024)
+
+
+def decode(frame, max_length=None):
+    """
+    Trame binaire → message. La décompression s'arrête à max_length octets
+    (WEBSOCKET_MAX_MESSAGE) : quelques Ko de deflate peuvent en donner des Go.
+    """
+    max_length = max_length or max_message()
+    if not frame:
+        raise InvalidFrame("Trame vide.")
+    header, payload = frame[0], frame[1:]
+    if header == DEFLATE:
+        decompressor = zlib.decompressobj(wbits=-15)
+        try:
+            payload = decompressor.decompress(payload, max_length)
+        except zlib.error:
+            raise InvalidFrame("Trame compressée illisible.")
+        if decompressor.unconsumed_tail:
+            raise InvalidFrame(f"Message trop long (plus de {max_length} octets).")
+    elif header != RAW:
+        raise InvalidFrame("En-tête de trame inconnu.")
+    if len(payload) > max_length:
+        raise InvalidFrame(f"Message trop long (plus de {max_length} octets).")
+    try:
+        return _expand(msgpack.unpackb(payload, raw=False, strict_map_key=False))
+    except (msgpack.UnpackException, ValueError, TypeError):
+        raise InvalidFrame("Trame msgpack illisible.")
+
+
+class CompactProtocolMixin:
+    """
+    À placer avant AsyncWebsocketConsumer. Les consumers envoient par
+    send_message(dict) et lisent par decode_message(text_data, bytes_data).
+    """
+
+    subprotocol = JSON
+
+    async def accept(self, subprotocol=None, headers=None):
+        if subprotocol is None:
+            offered = self.scope.get("subprotocols") or []
+            subprotocol = next((p for p in offered if p in SUBPROTOCOLS), None)
+        self.subprotocol = subprotocol if subprotocol in SUBPROTOCOLS else JSON
+        await super().accept(subprotocol=subprotocol, headers=headers)
+        if self.subprotocol is not JSON:
+            await self.send(text_data=json.dumps({"action": "hello", "fields": FIELDS}))
+
+    async def send_message(self, content):
+        if self.subprotocol is JSON:
+            await self.send(text_data=json.dumps(content))
+        else:
+            await self.send(bytes_data=encode(content, self.subprotocol))
+
+    def decode_message(self, text_data=None, bytes_data=None):
+        """Message client (dict) ; InvalidFrame sinon, renvoyée au client par websocket_receive."""
+        if bytes_data is not None:
+            content = decode(bytes_data)
+        else:
+            if text_data is None or len(text_data) > max_message():
+                raise InvalidFrame(f"Message trop long (plus de {max_message()} octets).")
+            try:
+                content = json.loads(text_data)
+            except ValueError:
+                raise InvalidFrame("JSON illisible.")
+        if not isinstance(content, dict):
+            raise InvalidFrame("Objet attendu.")
+        return content
+
+    async def websocket_receive(self, message):
+        try:
+            await super().websocket_receive(message)
+        except InvalidFrame as exc:
+            await self.send_message({"error": str(exc)})
+
+
+COALESCE = "coalesce"
+DROP_OLDEST = "drop_oldest"
+DISCONNECT = "disconnect"
+OVERFLOW_POLICIES = (COALESCE, DROP_OLDEST, DISCONNECT)
+CLOSE_RESYNC = 4008
+
+SEND_QUEUE_DEPTH = Gauge(
+    "websocket_send_queue_depth", "Messages en attente d'envoi ou non acquittés sur les sockets", ["consumer"]
+)
+SEND_QUEUE_OVERFLOW = Counter(
+    "websocket_send_queue_overflow_total", "Débordements de file d'envoi", ["consumer", "policy"]
+)
+
+
+class BoundedSendMixin:
+    """
+    À placer avant CompactProtocolMixin. Les handlers d'événements de groupe
+    appellent queue_message(dict) ; les réponses directes restent send_message().
+    receive() passe chaque message reçu à acknowledge().
+    """
+
+    overflow = DISCONNECT
+
+    def message_key(self, content):
+        """Entité du message, pour la politique coalesce (None : non fusionnable)."""
+        return None
+
+    def overflow_policy(self):
+        policy = getattr(settings, "WEBSOCKET_OVERFLOW", {}).get(type(self).__name__, self.overflow)
+        return policy if policy in OVERFLOW_POLICIES else DISCONNECT
+
+    def _depth(self):
+        return SEND_QUEUE_DEPTH.labels(type(self).__name__)
+
+    def _acks_requested(self):
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        return query.get("ack", [""])[0] in ("1", "true")
+
+    def _start_queue(self):
+        self._send_queue = deque()
+        # seq des trames écrites, pas encore acquittées (None : client sans ack)
+        self._in_flight = deque() if self._acks_requested() else None
+        self._wakeup = asyncio.Event()
+        self._writer = asyncio.get_running_loop().create_task(self._drain())
+
+    async def queue_message(self, content):
+        if getattr(self, "_send_closed", False):
+            return
+        if getattr(self, "_send_queue", None) is None:
+            self._start_queue()
+
+        queue = self._send_queue
+        if len(queue) >= getattr(settings, "WEBSOCKET_SEND_QUEUE", 100):
+            policy = self.overflow_policy()
+            SEND_QUEUE_OVERFLOW.labels(type(self).__name__, policy).inc()
+            if policy == COALESCE:
+                key = self.message_key(content)
+                for i, pending in enumerate(queue):
+                    if key is not None and self.message_key(pending) == key:
+                        queue[i] = content
+                        return
+                # rien à fusionner : on ne perd pas d'événement en silence
+                policy = DISCONNECT
+            if policy == DROP_OLDEST:
+                queue.popleft()
+                self._depth().dec()
+            else:
+                await self._resync()
+                return
+
+        queue.append(content)
+        self._depth().inc()
+        self._wakeup.set()
+
+    def _window_full(self):
+        in_flight = self._in_flight
+        return in_flight is not None and len(in_flight) >= getattr(settings, "WEBSOCKET_SEND_WINDOW", 100)
+
+    async def _drain(self):
+        queue = self._send_queue
+        while True:
+            while queue and not self._window_full():
+                content = queue.popleft()
+                if self._in_flight is not None and "seq" in content:
+                    self._in_flight.append(content["seq"])  # compté jusqu'à l'acquittement
+                else:
+                    self._depth().dec()
+                await self.send_message(content)
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+    def acknowledge(self, data):
+        """
+        Traite {"action": "ack", "seq": N} ; vrai si `data` en était un.
+        La socket est ordonnée : la trame de seq N reçue, tout ce qui a été
+        écrit avant l'est aussi. Les trames d'un même événement (lot) partagent
+        leur seq et sont acquittées ensemble.
+        """
+        if not isinstance(data, dict) or data.get("action") != "ack":
+            return False
+        in_flight = getattr(self, "_in_flight", None)
+        seq = data.get("seq")
+        if in_flight and seq in in_flight:
+            acked = 1
+            while in_flight.popleft() != seq:
+                acked += 1
+            while in_flight and in_flight[0] == seq:
+                in_flight.popleft()
+                acked += 1
+            self._depth().dec(acked)
+            self._wakeup.set()
+        return True
+
+    def _stop_queue(self):
+        self._send_closed = True
+        queue = getattr(self, "_send_queue", None)
+        if queue is None:
+            return
+        self._writer.cancel()
+        self._depth().dec(len(queue) + len(self._in_flight or ()))
+        queue.clear()
+        if self._in_flight is not None:
+            self._in_flight.clear()
+
+    async def _resync(self):
+        self._stop_queue()
+        await self.send_message({"action": "resync"})
+        await self.close(code=CLOSE_RESYNC)
+
+    async def websocket_disconnect(self, message):
+        self._stop_queue()
+        await super().websocket_disconnect(message)
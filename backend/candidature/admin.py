@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Candidature
+from .models import Candidature, OutboxEvent
 
 
 @admin.register(Candidature)
@@ -8,6 +8,7 @@ class CandidatureAdmin(admin.ModelAdmin):
     list_filter = ("status", "date")
     search_fields = ("mission__titre", "freelance__nom")
     ordering = ("-date",)
+    list_select_related = ("mission", "freelance")
 
     fieldsets = (
         ("Infos générales", {
@@ -30,3 +31,11 @@ class CandidatureAdmin(admin.ModelAdmin):
     def freelance_nom(self, obj):
         return obj.freelance.nom
     freelance_nom.short_description = "Freelance"
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "candidature_id", "group_name", "event_type", "attempts", "sent_at", "next_attempt_at")
+    list_filter = ("event_type", "sent_at")
+    search_fields = ("group_name", "candidature_id")
+    ordering = ("-id",)
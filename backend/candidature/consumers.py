@@ -1,20 +1,64 @@
-import json
 from channels.generic.websocket import AsyncWebsocketConsumer
+from backend.websocket import BoundedSendMixin, CompactProtocolMixin, COALESCE
+from backend import replay
+from backend.replay import ResumableMixin
 from asgiref.sync import sync_to_async
 from django.core.exceptions import ObjectDoesNotExist
+from django.conf import settings
 from django.db import IntegrityError 
 from .models import Candidature
 from mission.models import Mission
 from freelance.models import Freelance
+from .matching import score_pair, score_pairs
+from . import projection
 
 
-class CandidatureConsumer(AsyncWebsocketConsumer):
+def candidature_message(candidature, mission, freelance, created):
+    """Message WebSocket d'une candidature (réponse + diffusion à l'entreprise)."""
+    return {
+        "id_candidature": candidature.id_candidature,
+        "date": candidature.date.strftime("%Y-%m-%d"),
+        "status": candidature.status,
+        "mission_titre": mission.titre,
+        "freelance_nom": freelance.nom,
+        "freelance_description": freelance.description,
+        "freelance_competence": freelance.competence,
+        "freelance_experience": freelance.experience,
+        "freelance_formation": freelance.formation,
+        "freelance_certificat": freelance.certificat,
+        "freelance_tarif": str(freelance.tarif),
+        # L'accès à `freelance.user.email` est sûr car nous sommes dans un thread synchrone.
+        "freelance_email": freelance.user.email if hasattr(freelance, 'user') else "Email non disponible",
+        "freelance_photo": str(freelance.photo) if freelance.photo else None,
+        "score": candidature.score,
+        "created": created 
+    }
+
+
+class CandidatureQueueMixin(BoundedSendMixin):
+    # File pleine : seul le dernier état d'une candidature en attente est gardé
+    overflow = COALESCE
+
+    def message_key(self, content):
+        return content.get("id_candidature")
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class CandidatureConsumer(ResumableMixin, CandidatureQueueMixin, CompactProtocolMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.entreprise_id = self.scope['url_route']['kwargs']['entreprise_id']
         self.group_name = f"entreprise_{self.entreprise_id}"
 
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
+        # ?last_seq=N : rejoue les événements manqués depuis la dernière connexion
+        await self.resume()
         print(f"✅ WebSocket connecté pour entreprise {self.entreprise_id}")
 
     async def disconnect(self, close_code):
@@ -44,27 +88,11 @@ class CandidatureConsumer(AsyncWebsocketConsumer):
             candidature, created = Candidature.objects.get_or_create(
                 mission=mission,
                 freelance=freelance,
-                defaults={"status": "en_attente"}
+                defaults={"status": "en_attente", "score": score_pair(freelance, mission)}
             )
             
             # 4. Sérialisation des données (y compris l'accès à freelance.user.email)
-            response = {
-                "id_candidature": candidature.id_candidature,
-                "date": candidature.date.strftime("%Y-%m-%d"),
-                "status": candidature.status,
-                "mission_titre": mission.titre,
-                "freelance_nom": freelance.nom,
-                "freelance_description": freelance.description,
-                "freelance_competence": freelance.competence,
-                "freelance_experience": freelance.experience,
-                "freelance_formation": freelance.formation,
-                "freelance_certificat": freelance.certificat,
-                "freelance_tarif": str(freelance.tarif),
-                # L'accès à `freelance.user.email` est sûr car nous sommes dans un thread synchrone.
-                "freelance_email": freelance.user.email if hasattr(freelance, 'user') else "Email non disponible",
-                "freelance_photo": str(freelance.photo) if freelance.photo else None,
-                "created": created 
-            }
+            response = candidature_message(candidature, mission, freelance, created)
             
             return {"success": response, "created": created}
             
@@ -76,8 +104,86 @@ class CandidatureConsumer(AsyncWebsocketConsumer):
             return {"error": f"Erreur interne: {str(e)}"}
 
 
-    async def receive(self, text_data):
-        data = json.loads(text_data)
+    @sync_to_async
+    def handle_batch_sync(self, items, entreprise_id):
+        """
+        Traite un lot de candidatures en un seul passage synchrone et un nombre
+        fixe de requêtes, quelle que soit la taille du lot :
+        missions (avec contrôle de propriété), freelances, couples existants,
+        insertion groupée, relecture.
+        Retourne (résultats par élément, messages à diffuser).
+        """
+        results = [{"mission_id": item.get("mission_id"), "freelance_id": item.get("freelance_id")}
+                   if isinstance(item, dict) else {"mission_id": None, "freelance_id": None}
+                   for item in items]
+        pairs = [(_as_id(r["mission_id"]), _as_id(r["freelance_id"])) for r in results]
+
+        mission_ids = {m for m, _ in pairs if m is not None}
+        freelance_ids = {f for _, f in pairs if f is not None}
+        # Contrôle de propriété dans la même requête
+        missions = Mission.objects.filter(id_mission__in=mission_ids, entreprise_id=entreprise_id).in_bulk()
+        freelances = Freelance.objects.select_related("user").filter(id_freelance__in=freelance_ids).in_bulk()
+
+        valid = []
+        for result, (mission_id, freelance_id) in zip(results, pairs):
+            if mission_id not in missions:
+                result.update(status="error", error="Sécurité: Mission non valide pour cette entreprise.")
+            elif freelance_id not in freelances:
+                result.update(status="error", error="Freelance non trouvé.")
+            else:
+                valid.append((mission_id, freelance_id))
+        unique_pairs = list(dict.fromkeys(valid))
+        if not unique_pairs:
+            return results, []
+
+        existing = set(
+            Candidature.objects.filter(
+                mission_id__in={m for m, _ in unique_pairs},
+                freelance_id__in={f for _, f in unique_pairs},
+            ).values_list("mission_id", "freelance_id")
+        )
+        new_pairs = [p for p in unique_pairs if p not in existing]
+        scores = score_pairs([(freelances[f], missions[m]) for m, f in new_pairs])
+        Candidature.objects.bulk_create(
+            [
+                Candidature(mission_id=m, freelance_id=f, status="en_attente", score=float(score))
+                for (m, f), score in zip(new_pairs, scores)
+            ],
+            ignore_conflicts=True,  # course avec une autre connexion : unique_candidature tranche
+        )
+
+        # bulk_create ne renvoie pas les ids sous MySQL → relecture
+        stored = {
+            (c.mission_id, c.freelance_id): c
+            for c in Candidature.objects.filter(
+                mission_id__in={m for m, _ in unique_pairs},
+                freelance_id__in={f for _, f in unique_pairs},
+            )
+        }
+        created_pairs = set(new_pairs)
+        # bulk_create n'émet pas post_save → projection mise à jour explicitement
+        projection.refresh_ids(stored[p].id_candidature for p in new_pairs if p in stored)
+        messages = {}
+        for result, pair in zip(results, pairs):
+            if "status" in result:
+                continue
+            candidature = stored[pair]
+            created = pair in created_pairs
+            message = messages.setdefault(
+                pair, candidature_message(candidature, missions[pair[0]], freelances[pair[1]], created)
+            )
+            result.update(status="created" if created else "existing", candidature=message)
+        return results, list(messages.values())
+
+    async def receive(self, text_data=None, bytes_data=None):
+        data = self.decode_message(text_data, bytes_data)
+        if self.acknowledge(data):
+            return
+
+        if data.get("action") == "batch":
+            await self.receive_batch(data.get("candidatures") or [])
+            return
+
         mission_id = data.get("mission_id")
         freelance_id = data.get("freelance_id")
         
@@ -90,7 +196,7 @@ class CandidatureConsumer(AsyncWebsocketConsumer):
 
         if "error" in result:
             print(f"🚫 Erreur: {result['error']}")
-            await self.send(text_data=json.dumps({"error": result['error']}))
+            await self.send_message({"error": result['error']})
             return
 
         # Le résultat est un succès, on diffuse.
@@ -106,18 +212,49 @@ class CandidatureConsumer(AsyncWebsocketConsumer):
         # Diffuser la candidature uniquement au groupe de l'entreprise
         await self.channel_layer.group_send(
             self.group_name,
-            {"type": "new_candidature", "message": response}
+            await replay.astamp(self.group_name, {"type": "new_candidature", "message": response})
         )
 
+    async def receive_batch(self, items):
+        """
+        {"action": "batch", "candidatures": [{"mission_id": .., "freelance_id": ..}, ...]}
+        → une réponse {"action": "batch_result", "results": [...]} avec un statut par élément.
+        """
+        max_size = getattr(settings, "CANDIDATURE_BATCH_MAX", 200)
+        if not isinstance(items, list) or len(items) > max_size:
+            await self.send_message({"error": f"Lot invalide (maximum {max_size} candidatures)."})
+            return
+
+        try:
+            results, messages = await self.handle_batch_sync(items, self.entreprise_id)
+        except Exception as e:
+            await self.send_message({"error": f"Erreur interne: {str(e)}"})
+            return
+
+        await self.send_message({"action": "batch_result", "results": results})
+        if messages:
+            # Un seul group_send pour tout le lot
+            await self.channel_layer.group_send(
+                self.group_name,
+                await replay.astamp(self.group_name, {"type": "new_candidature_batch", "messages": messages})
+            )
+
     # Méthode appelée automatiquement pour chaque message du groupe
     async def new_candidature(self, event):
-        await self.send(text_data=json.dumps(event["message"]))
+        if self.fresh(event):
+            await self.deliver(event["message"], event)
+
+    async def new_candidature_batch(self, event):
+        # Même format de trame que new_candidature, une par candidature (même seq)
+        if self.fresh(event):
+            for message in event["messages"]:
+                await self.deliver(message, event)
 
     async def new_entretien(self, event):
         pass
 
 
-class NotificationEntretienConsumer(AsyncWebsocketConsumer):
+class NotificationEntretienConsumer(ResumableMixin, CandidatureQueueMixin, CompactProtocolMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.user_type = self.scope['url_route']['kwargs']['user_type']  # "freelance" ou "entreprise"
         self.user_id = self.scope['url_route']['kwargs']['user_id']
@@ -125,16 +262,25 @@ class NotificationEntretienConsumer(AsyncWebsocketConsumer):
 
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
+        await self.resume()
         print(f"✅ WS connecté pour {self.user_type} {self.user_id}")
 
     async def disconnect(self, close_code):
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
+    async def receive(self, text_data=None, bytes_data=None):
+        # Seuls messages attendus du client : les acquittements (?ack=1)
+        self.acknowledge(self.decode_message(text_data, bytes_data))
+
     async def new_entretien(self, event):
-        await self.send(text_data=json.dumps(event["message"]))
+        if self.fresh(event):
+            await self.deliver(event["message"], event)
 
     async def new_candidature(self, event):
         pass
 
+    async def new_candidature_batch(self, event):
+        pass
+
 
 
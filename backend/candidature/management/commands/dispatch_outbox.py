@@ -0,0 +1,36 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from candidature.outbox import dispatch_batch, purge_sent
+
+
+class Command(BaseCommand):
+    help = "Vide l'outbox des notifications de candidature vers le channel layer."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--interval", type=float, default=0.5,
+                            help="Attente (secondes) quand l'outbox est vide")
+        parser.add_argument("--once", action="store_true", help="Un seul passage puis arrêt")
+        parser.add_argument("--purge-days", type=int, default=7,
+                            help="Supprime les événements envoyés depuis plus de N jours")
+
+    def handle(self, *args, **options):
+        self.stdout.write("📤 Dispatcher outbox démarré.")
+        last_purge = 0.0
+        while True:
+            sent, failed = dispatch_batch(batch_size=options["batch_size"])
+            if sent or failed:
+                self.stdout.write(f"✅ {sent} envoyés, 🚫 {failed} en échec")
+
+            if time.monotonic() - last_purge > 3600:
+                purge_sent(timedelta(days=options["purge_days"]))
+                last_purge = time.monotonic()
+
+            if options["once"]:
+                return
+            # Lot plein → on enchaîne, sinon on attend un peu
+            if sent + failed < options["batch_size"]:
+                time.sleep(options["interval"])
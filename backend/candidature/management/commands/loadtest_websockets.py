@@ -0,0 +1,102 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from backend import fanout, loadtest, replay
+
+IN_MEMORY = {
+    "CHANNEL_LAYERS": {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    "WEBSOCKET_FANOUT": fanout.LOCAL,
+    "WEBSOCKET_REPLAY": replay.MEMORY,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Banc de charge WebSocket en processus : N clients simulés sur backend.asgi.application, "
+        "scénarios candidature / entretien / mission, latences p50/p95/p99, débit et mémoire par socket. "
+        "Crée puis supprime ses propres données : à lancer sur une base de préproduction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=1000,
+                            help="Utilisateurs simulés (deux sockets chacun)")
+        parser.add_argument("--operations", type=int, default=500, help="Opérations rejouées")
+        parser.add_argument("--rate", type=float, default=50.0, help="Opérations par seconde")
+        parser.add_argument("--mix", default="apply=0.4,interview=0.3,mission=0.3",
+                            help="Poids des scénarios")
+        parser.add_argument("--entreprise-ratio", type=float, default=0.1)
+        parser.add_argument("--missions", type=int, default=3, help="Missions par entreprise")
+        parser.add_argument("--layer", choices=["memory", "redis"], default="memory",
+                            help="memory : layer, fan-out et journal en mémoire ; redis : réglages du projet")
+        parser.add_argument("--subprotocol", choices=sorted(loadtest.SUBPROTOCOLS), default="json")
+        parser.add_argument("--concurrency", type=int, default=200, help="Handshakes simultanés")
+        parser.add_argument("--dispatch-interval", type=float, default=0.5,
+                            help="Attente du dispatcher d'outbox quand elle est vide (comme dispatch_outbox)")
+        parser.add_argument("--drain", type=float, default=2.0,
+                            help="Attente (secondes) des dernières remises après la dernière opération")
+        parser.add_argument("--seed", type=int)
+        parser.add_argument("--keep", action="store_true", help="Conserver les données créées")
+        parser.add_argument("--json", action="store_true", help="Rapport JSON brut")
+
+    def _mix(self, value):
+        try:
+            mix = {name: float(weight) for name, weight in (part.split("=") for part in value.split(","))}
+        except ValueError:
+            raise CommandError("--mix attendu sous la forme apply=0.4,interview=0.3,mission=0.3")
+        unknown = set(mix) - set(loadtest.SCRIPTS)
+        if unknown or not any(mix.values()):
+            raise CommandError(f"Scénarios possibles : {', '.join(loadtest.SCRIPTS)}")
+        return mix
+
+    def handle(self, *args, **options):
+        if options["clients"] < 2 or options["rate"] <= 0:
+            raise CommandError("Au moins 2 clients et un débit positif.")
+        mix = self._mix(options["mix"])
+
+        with override_settings(**(IN_MEMORY if options["layer"] == "memory" else {})):
+            report = loadtest.run(
+                clients=options["clients"],
+                operations=options["operations"],
+                rate=options["rate"],
+                mix=mix,
+                entreprise_ratio=options["entreprise_ratio"],
+                missions_per_entreprise=max(1, options["missions"]),
+                subprotocol=options["subprotocol"],
+                concurrency=max(1, options["concurrency"]),
+                dispatch_interval=options["dispatch_interval"],
+                drain=options["drain"],
+                seed=options["seed"],
+                keep=options["keep"],
+            )
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        sockets = report["sockets"]
+        self.stdout.write(
+            f"🔌 {sockets} sockets connectées en {report['connect_seconds']:.1f} s "
+            f"({sockets / report['connect_seconds']:.0f}/s), "
+            f"{report['memory_per_socket'] / 1024:.1f} Kio par socket"
+        )
+        operations = ", ".join(f"{n} {name}" for name, n in report["operations"].items())
+        self.stdout.write(
+            f"📨 {operations} en {report['duration']:.1f} s → "
+            f"{report['frames']} trames remises ({report['frames_per_second']:.0f}/s)"
+        )
+
+        def ms(value):
+            return "-" if value is None else f"{value * 1000:.1f}"
+
+        self.stdout.write(f"{'scénario':>10} {'remises':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for name, stats in report["latency"].items():
+            self.stdout.write(
+                f"{name:>10} {stats['n']:>8} {ms(stats['p50']):>8} {ms(stats['p95']):>8} "
+                f"{ms(stats['p99']):>8} {ms(stats['max']):>8}"
+            )
+        if report["errors"] or report["closed"]:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ {report['errors']} erreur(s), {report['closed']} socket(s) fermée(s) par le serveur"
+            ))
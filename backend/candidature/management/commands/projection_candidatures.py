@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from candidature.projection import check, rebuild
+
+
+class Command(BaseCommand):
+    help = "Reconstruit ou vérifie la projection de lecture des candidatures (CandidatureLecture)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true", help="Reconstruit toute la projection")
+        parser.add_argument("--fix", action="store_true", help="Avec la vérification : corrige les écarts")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            total = rebuild(batch_size=options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"✅ {total} candidatures projetées."))
+            return
+
+        report = check(batch_size=options["batch_size"], fix=options["fix"])
+        for kind, ids in report.items():
+            if ids:
+                apercu = ", ".join(map(str, ids[:20])) + (" ..." if len(ids) > 20 else "")
+                self.stdout.write(self.style.WARNING(f"{kind} : {len(ids)} ({apercu})"))
+
+        if not any(report.values()):
+            self.stdout.write(self.style.SUCCESS("✅ Projection cohérente."))
+        elif options["fix"]:
+            self.stdout.write(self.style.SUCCESS("✅ Écarts corrigés."))
+        else:
+            raise CommandError("Projection incohérente (relancer avec --fix ou --rebuild).")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from candidature.matching import rescore_candidatures
+from candidature.models import Candidature
+
+
+class Command(BaseCommand):
+    help = "Recalcule le score IA des candidatures existantes, par lots vectorisés."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--mission", type=int, help="Limiter à une mission (id_mission)")
+        parser.add_argument("--status", help="Limiter à un statut (en_attente, recommandee, ...)")
+
+    def handle(self, *args, **options):
+        queryset = Candidature.objects.all()
+        if options["mission"]:
+            queryset = queryset.filter(mission_id=options["mission"])
+        if options["status"]:
+            queryset = queryset.filter(status=options["status"])
+
+        total = rescore_candidatures(queryset, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ {total} candidatures rescorées."))
@@ -0,0 +1,148 @@
+# candidature/matching.py
+"""
+Moteur de correspondance freelance ↔ mission (champ Candidature.score).
+
+Les textes sont analysés comme pour la recherche (mission/search.py), puis
+projetés par hachage de termes dans des vecteurs denses normalisés. Les
+scores sont des produits scalaires calculés par lots avec NumPy, sans
+boucle Python par paire.
+
+score = 100 × (POIDS_COMPETENCES × cos(compétences, compétences requises)
+             + POIDS_PROFIL × cos(profil complet, texte de la mission))
+"""
+import math
+import zlib
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+from django.conf import settings
+
+from mission.search import analyze
+from .models import Candidature
+from .projection import update_scores
+
+POIDS_COMPETENCES = 0.7
+POIDS_PROFIL = 0.3
+
+
+def _dim():
+    return getattr(settings, "MATCHING_DIM", 2048)
+
+
+@lru_cache(maxsize=100_000)
+def _hash_term(term, dim):
+    h = zlib.crc32(term.encode())
+    # bit de poids fort → signe, pour que les collisions se compensent
+    return h % dim, (1.0 if h & 0x80000000 else -1.0)
+
+
+def vectorize(texts):
+    """Liste de textes → matrice (n, dim) float32 aux lignes L2-normalisées."""
+    dim = _dim()
+    rows, cols, values = [], [], []
+    for row, text in enumerate(texts):
+        for term, tf in Counter(analyze(text)).items():
+            col, sign = _hash_term(term, dim)
+            rows.append(row)
+            cols.append(col)
+            values.append(sign * (1.0 + math.log(tf)))
+
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    if rows:
+        np.add.at(matrix, (np.array(rows), np.array(cols)), np.array(values, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _join(*parts):
+    return " ".join(p for p in parts if p)
+
+
+def freelance_matrices(freelances):
+    skills = vectorize([f.competence for f in freelances])
+    profile = vectorize([
+        _join(f.competence, f.experience, f.formation, f.description) for f in freelances
+    ])
+    return skills, profile
+
+
+def mission_matrices(missions):
+    skills = vectorize([m.competence_requis for m in missions])
+    text = vectorize([_join(m.titre, m.description, m.competence_requis) for m in missions])
+    return skills, text
+
+
+def _to_score(raw):
+    return np.round(100.0 * np.clip(raw.astype(np.float64), 0.0, 1.0), 2)
+
+
+def score_matrix(freelances, missions):
+    """Tous les couples : matrice (n_freelances, n_missions) de scores."""
+    f_skills, f_profile = freelance_matrices(freelances)
+    m_skills, m_text = mission_matrices(missions)
+    raw = POIDS_COMPETENCES * (f_skills @ m_skills.T) + POIDS_PROFIL * (f_profile @ m_text.T)
+    return _to_score(raw)
+
+
+def score_pairs(pairs):
+    """
+    Liste de (freelance, mission) → vecteur de scores, un par couple.
+    Chaque freelance / mission distinct n'est vectorisé qu'une fois.
+    """
+    if not pairs:
+        return np.zeros(0, dtype=np.float32)
+
+    freelance_index, mission_index = {}, {}
+    freelances, missions = [], []
+    f_rows, m_rows = [], []
+    for freelance, mission in pairs:
+        if freelance.pk not in freelance_index:
+            freelance_index[freelance.pk] = len(freelances)
+            freelances.append(freelance)
+        if mission.pk not in mission_index:
+            mission_index[mission.pk] = len(missions)
+            missions.append(mission)
+        f_rows.append(freelance_index[freelance.pk])
+        m_rows.append(mission_index[mission.pk])
+
+    f_skills, f_profile = freelance_matrices(freelances)
+    m_skills, m_text = mission_matrices(missions)
+    f_rows, m_rows = np.array(f_rows), np.array(m_rows)
+
+    raw = POIDS_COMPETENCES * np.einsum("ij,ij->i", f_skills[f_rows], m_skills[m_rows])
+    raw += POIDS_PROFIL * np.einsum("ij,ij->i", f_profile[f_rows], m_text[m_rows])
+    return _to_score(raw)
+
+
+def score_pair(freelance, mission):
+    return float(score_pairs([(freelance, mission)])[0])
+
+
+def rescore_candidatures(queryset, batch_size=2000):
+    """
+    Recalcule le score d'un ensemble de candidatures par tranches keyset
+    (id_candidature croissant) et bulk_update : mémoire bornée, adapté aux
+    millions de lignes. Retourne le nombre de candidatures traitées.
+    """
+    queryset = queryset.select_related("freelance", "mission").only(
+        "id_candidature", "score", "freelance", "mission",
+        "freelance__competence", "freelance__experience", "freelance__formation", "freelance__description",
+        "mission__titre", "mission__description", "mission__competence_requis",
+    ).order_by("id_candidature")
+
+    total = 0
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id_candidature__gt=last_id)[:batch_size])
+        if not batch:
+            return total
+        scores = score_pairs([(c.freelance, c.mission) for c in batch])
+        for candidature, score in zip(batch, scores):
+            candidature.score = float(score)
+        # bulk_update ne déclenche pas post_save : pas de notification parasite
+        Candidature.objects.bulk_update(batch, ["score"], batch_size=batch_size)
+        update_scores(batch)
+        total += len(batch)
+        last_id = batch[-1].id_candidature
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidature', '0005_alter_candidature_date_entretien'),
+        ('freelance', '0003_alter_freelance_photo'),
+        ('mission', '0003_mission_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidature',
+            index=models.Index(fields=['mission', 'date', 'id_candidature'], name='cand_mission_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidature',
+            index=models.Index(fields=['mission', 'date_entretien', 'id_candidature'], name='cand_mission_entretien_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidature',
+            index=models.Index(fields=['freelance', 'date_entretien', 'id_candidature'], name='cand_freelance_entretien_idx'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:26
+
+from django.db import migrations, models
+
+
+def project_existing_candidatures(apps, schema_editor):
+    """Remplit la projection avec les candidatures existantes."""
+    Candidature = apps.get_model("candidature", "Candidature")
+    CandidatureLecture = apps.get_model("candidature", "CandidatureLecture")
+
+    rows = []
+    for c in Candidature.objects.select_related("mission__entreprise", "freelance__user").iterator(chunk_size=1000):
+        mission, entreprise, freelance = c.mission, c.mission.entreprise, c.freelance
+        rows.append(CandidatureLecture(
+            id_candidature=c.id_candidature, date=c.date, status=c.status,
+            date_entretien=c.date_entretien, commentaire_entretien=c.commentaire_entretien,
+            timezone=c.timezone, score=c.score,
+            mission_id=mission.id_mission, mission_titre=mission.titre,
+            entreprise_id=entreprise.id_entreprise, entreprise_nom=entreprise.nom,
+            entreprise_photo=entreprise.profile_image.name or None,
+            freelance_id=freelance.id_freelance, freelance_nom=freelance.nom,
+            freelance_email=freelance.user.email, freelance_description=freelance.description,
+            freelance_competence=freelance.competence, freelance_experience=freelance.experience,
+            freelance_formation=freelance.formation, freelance_certificat=freelance.certificat,
+            freelance_tarif=freelance.tarif, freelance_photo=freelance.photo.name or "",
+        ))
+    CandidatureLecture.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidature', '0007_outbox_event'),
+        ('mission', '0005_mission_feed'),
+        ('entreprise', '0003_alter_entreprise_user'),
+        ('freelance', '0004_freelance_competence_index'),
+        ('authentification', '0004_user_is_verified'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidatureLecture',
+            fields=[
+                ('id_candidature', models.IntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateTimeField()),
+                ('status', models.CharField(choices=[('en_attente', 'En attente'), ('recommandee', 'Recommandée'), ('en_entretien', 'En entretien')], max_length=20)),
+                ('date_entretien', models.DateTimeField(blank=True, null=True)),
+                ('commentaire_entretien', models.TextField(blank=True, null=True)),
+                ('timezone', models.CharField(max_length=50)),
+                ('score', models.FloatField(default=0.0)),
+                ('mission_id', models.IntegerField()),
+                ('mission_titre', models.CharField(max_length=200)),
+                ('entreprise_id', models.IntegerField()),
+                ('entreprise_nom', models.CharField(max_length=255)),
+                ('entreprise_photo', models.CharField(blank=True, max_length=255, null=True)),
+                ('freelance_id', models.IntegerField()),
+                ('freelance_nom', models.CharField(max_length=150)),
+                ('freelance_email', models.EmailField(max_length=254)),
+                ('freelance_description', models.TextField(blank=True, null=True)),
+                ('freelance_competence', models.TextField()),
+                ('freelance_experience', models.TextField()),
+                ('freelance_formation', models.TextField()),
+                ('freelance_certificat', models.TextField(blank=True, null=True)),
+                ('freelance_tarif', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('freelance_photo', models.CharField(blank=True, default='', max_length=255)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['entreprise_id', 'date', 'id_candidature'], name='lecture_entreprise_date_idx'), models.Index(fields=['entreprise_id', 'date_entretien', 'id_candidature'], name='lecture_entr_entretien_idx'), models.Index(fields=['freelance_id', 'date_entretien', 'id_candidature'], name='lecture_free_entretien_idx'), models.Index(fields=['mission_id'], name='lecture_mission_idx')],
+            },
+        ),
+        migrations.RunPython(project_existing_candidatures, migrations.RunPython.noop),
+    ]
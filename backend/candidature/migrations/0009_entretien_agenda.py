@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:31
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_fin_entretien(apps, schema_editor):
+    """Entretiens déjà planifiés : durée par défaut (60 minutes)."""
+    Candidature = apps.get_model("candidature", "Candidature")
+    Candidature.objects.filter(date_entretien__isnull=False).update(
+        fin_entretien=F("date_entretien") + timedelta(minutes=60)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidature', '0008_candidature_lecture'),
+        ('freelance', '0004_freelance_competence_index'),
+        ('mission', '0005_mission_feed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidature',
+            name='duree_entretien',
+            field=models.PositiveIntegerField(default=60),
+        ),
+        migrations.AddField(
+            model_name='candidature',
+            name='fin_entretien',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='candidature',
+            index=models.Index(fields=['freelance', 'date_entretien', 'fin_entretien'], name='cand_freelance_agenda_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidature',
+            index=models.Index(fields=['mission', 'date_entretien', 'fin_entretien'], name='cand_mission_agenda_idx'),
+        ),
+        migrations.RunPython(fill_fin_entretien, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidature', '0009_entretien_agenda'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='candidaturelecture',
+            name='lecture_mission_idx',
+        ),
+        migrations.AddIndex(
+            model_name='candidaturelecture',
+            index=models.Index(fields=['mission_id', '-score', '-id_candidature'], name='lecture_shortlist_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidaturelecture',
+            index=models.Index(fields=['mission_id', 'status', '-score', '-id_candidature'], name='lecture_shortlist_status_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidature', '0010_shortlist_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidaturelecture',
+            name='entreprise_photo_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='candidaturelecture',
+            name='freelance_photo_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidature', '0012_outbox_claim'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxevent',
+            name='seq',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
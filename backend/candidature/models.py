@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django.db import models
 from django.utils import timezone
 
@@ -19,6 +21,8 @@ class Candidature(models.Model):
 
     # Infos entretien
     date_entretien = models.DateTimeField(null=True, blank=True)  # date/heure prévue
+    duree_entretien = models.PositiveIntegerField(default=60)  # minutes
+    fin_entretien = models.DateTimeField(null=True, blank=True, editable=False)  # calculée à la sauvegarde
     commentaire_entretien = models.TextField(null=True, blank=True)  # notes de l’entretien
     timezone = models.CharField(default="UTC",max_length=50) 
 
@@ -29,6 +33,103 @@ class Candidature(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["mission", "freelance"], name="unique_candidature")
         ]
+        # Clés de la pagination keyset (backend/pagination.py)
+        indexes = [
+            models.Index(fields=["mission", "date", "id_candidature"], name="cand_mission_date_idx"),
+            models.Index(fields=["mission", "date_entretien", "id_candidature"], name="cand_mission_entretien_idx"),
+            models.Index(fields=["freelance", "date_entretien", "id_candidature"], name="cand_freelance_entretien_idx"),
+            # Index d'intervalles des entretiens (candidature/planning.py)
+            models.Index(fields=["freelance", "date_entretien", "fin_entretien"], name="cand_freelance_agenda_idx"),
+            models.Index(fields=["mission", "date_entretien", "fin_entretien"], name="cand_mission_agenda_idx"),
+        ]
 
     def __str__(self):
         return f"Candidature {self.id_candidature} ({self.get_status_display()})"
+
+    def save(self, *args, **kwargs):
+        if self.date_entretien:
+            self.fin_entretien = self.date_entretien + timedelta(minutes=self.duree_entretien)
+        else:
+            self.fin_entretien = None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"date_entretien", "duree_entretien"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"fin_entretien"}
+        super().save(*args, **kwargs)
+
+
+class OutboxEvent(models.Model):
+    """
+    Outbox transactionnelle : les notifications de candidature sont écrites ici
+    dans la même transaction que la sauvegarde, puis envoyées au channel layer
+    par le dispatcher (manage.py dispatch_outbox).
+    """
+    id = models.BigAutoField(primary_key=True)
+    # pas de ForeignKey : l'événement doit survivre à la candidature
+    candidature_id = models.IntegerField(db_index=True)
+    group_name = models.CharField(max_length=100)
+    event_type = models.CharField(max_length=50)
+    payload = models.JSONField()
+
+    created = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    # Bail du dispatcher qui traite l'événement (plusieurs pods, un dispatcher chacun)
+    claimed_by = models.CharField(max_length=32, blank=True, default="")
+    claimed_until = models.DateTimeField(null=True, blank=True)
+    # Numéro de rejeu (backend/replay.py) attribué au premier essai, réutilisé aux reprises
+    seq = models.PositiveBigIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["sent_at", "next_attempt_at", "id"], name="outbox_pending_idx"),
+        ]
+
+    def __str__(self):
+        return f"Outbox {self.id} → {self.group_name} ({self.event_type})"
+
+
+class CandidatureLecture(models.Model):
+    """
+    Projection de lecture (CQRS) : une candidature déjà aplatie avec sa mission,
+    son entreprise et son freelance. Les listes de candidatures et de
+    notifications la lisent sans jointure. Tenue à jour par candidature/projection.py.
+    """
+    id_candidature = models.IntegerField(primary_key=True)
+    date = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=Candidature.STATUS_CHOICES)
+    date_entretien = models.DateTimeField(null=True, blank=True)
+    commentaire_entretien = models.TextField(null=True, blank=True)
+    timezone = models.CharField(max_length=50)
+    score = models.FloatField(default=0.0)
+
+    mission_id = models.IntegerField()
+    mission_titre = models.CharField(max_length=200)
+
+    entreprise_id = models.IntegerField()
+    entreprise_nom = models.CharField(max_length=255)
+    entreprise_photo = models.CharField(max_length=255, null=True, blank=True)
+    entreprise_photo_variants = models.JSONField(default=dict, blank=True)
+
+    freelance_id = models.IntegerField()
+    freelance_nom = models.CharField(max_length=150)
+    freelance_email = models.EmailField()
+    freelance_description = models.TextField(null=True, blank=True)
+    freelance_competence = models.TextField()
+    freelance_experience = models.TextField()
+    freelance_formation = models.TextField()
+    freelance_certificat = models.TextField(null=True, blank=True)
+    freelance_tarif = models.DecimalField(max_digits=10, decimal_places=2)
+    freelance_photo = models.CharField(max_length=255, blank=True, default="")
+    freelance_photo_variants = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["entreprise_id", "date", "id_candidature"], name="lecture_entreprise_date_idx"),
+            models.Index(fields=["entreprise_id", "date_entretien", "id_candidature"], name="lecture_entr_entretien_idx"),
+            models.Index(fields=["freelance_id", "date_entretien", "id_candidature"], name="lecture_free_entretien_idx"),
+            # Shortlist par mission : top-k par score = lecture d'une plage d'index
+            models.Index(fields=["mission_id", "-score", "-id_candidature"], name="lecture_shortlist_idx"),
+            models.Index(fields=["mission_id", "status", "-score", "-id_candidature"], name="lecture_shortlist_status_idx"),
+        ]
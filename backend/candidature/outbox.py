@@ -0,0 +1,131 @@
+# candidature/outbox.py
+"""
+Outbox transactionnelle des notifications de candidature.
+
+- enqueue() est appelé depuis les signaux : les lignes OutboxEvent sont
+  écrites dans la transaction de la sauvegarde (pas d'appel Redis dans la
+  requête, et rien n'est notifié si la transaction est annulée).
+- dispatch_batch() est exécuté par le processus dispatcher : il vide
+  l'outbox par lots vers le channel layer, avec reprise exponentielle en cas
+  d'échec, en respectant l'ordre des événements d'une même candidature.
+  Un dispatcher tourne dans chaque pod : chaque lot est d'abord réservé
+  (bail de OUTBOX_LEASE secondes), un événement n'est envoyé qu'une fois.
+- Le numéro de rejeu (backend/replay.py) est attribué au premier essai et
+  conservé sur la ligne : une reprise renvoie le même seq, sans nouvelle
+  entrée dans le journal de rejeu (le client l'écarte s'il l'a déjà reçu).
+"""
+import uuid
+from collections import defaultdict, deque
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from backend import replay
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+BACKOFF_BASE = 2      # secondes
+BACKOFF_MAX = 300     # secondes
+
+
+def enqueue(candidature_id, group_names, event_type, payload):
+    OutboxEvent.objects.bulk_create(
+        OutboxEvent(
+            candidature_id=candidature_id,
+            group_name=group_name,
+            event_type=event_type,
+            payload=payload,
+        )
+        for group_name in group_names
+    )
+
+
+def _backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_MAX, BACKOFF_BASE ** attempts))
+
+
+def _claim(batch_size, now):
+    """
+    Prend un bail sur un lot d'événements dus et libres : UPDATE conditionnel,
+    atomique ligne par ligne, donc deux dispatchers ne prennent jamais la même
+    ligne. Un bail expiré (dispatcher arrêté en cours de lot) est repris.
+    """
+    token = uuid.uuid4().hex
+    free = Q(claimed_until__isnull=True) | Q(claimed_until__lte=now)
+    ids = list(
+        OutboxEvent.objects.filter(free, sent_at__isnull=True, next_attempt_at__lte=now)
+        .order_by("id").values_list("id", flat=True)[:batch_size]
+    )
+    if not ids:
+        return token, []
+    lease = timedelta(seconds=getattr(settings, "OUTBOX_LEASE", 60))
+    OutboxEvent.objects.filter(free, id__in=ids, sent_at__isnull=True).update(
+        claimed_by=token, claimed_until=now + lease
+    )
+    return token, list(OutboxEvent.objects.filter(claimed_by=token, sent_at__isnull=True).order_by("id"))
+
+
+def dispatch_batch(batch_size=None, now=None):
+    """
+    Envoie un lot d'événements dus. Retourne (envoyés, en_échec).
+
+    Ordre par candidature : un événement ne part que si tous les événements
+    non envoyés qui le précèdent sont partis dans ce lot. Si l'un d'eux
+    échoue, attend sa reprise ou est tenu par un autre dispatcher, les
+    suivants de la même candidature attendent.
+    """
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 100)
+    now = now or timezone.now()
+
+    token, events = _claim(batch_size, now)
+    if not events:
+        return 0, 0
+
+    # Événements non envoyés des candidatures du lot, dans l'ordre
+    unsent = defaultdict(deque)
+    for candidature_id, event_id in (
+        OutboxEvent.objects.filter(sent_at__isnull=True, candidature_id__in={e.candidature_id for e in events})
+        .order_by("id").values_list("candidature_id", "id")
+    ):
+        unsent[candidature_id].append(event_id)
+
+    channel_layer = get_channel_layer()
+    blocked = set()
+    sent, failed = [], []
+    for event in events:
+        previous = unsent[event.candidature_id]
+        if event.candidature_id in blocked or not previous or previous[0] != event.id:
+            blocked.add(event.candidature_id)
+            continue
+        message = {"type": event.event_type, "message": event.payload}
+        try:
+            if event.seq is None:
+                # Numéro de séquence + journal de rejeu, une seule fois par événement
+                event.seq = replay.stamp(event.group_name, message)["seq"]
+            async_to_sync(channel_layer.group_send)(event.group_name, {**message, "seq": event.seq})
+        except Exception as exc:
+            event.attempts += 1
+            event.next_attempt_at = now + _backoff(event.attempts)
+            event.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+            failed.append(event)
+            blocked.add(event.candidature_id)
+        else:
+            event.sent_at = timezone.now()
+            sent.append(event)
+            previous.popleft()
+
+    if sent:
+        OutboxEvent.objects.bulk_update(sent, ["sent_at"])
+    if failed:
+        OutboxEvent.objects.bulk_update(failed, ["attempts", "next_attempt_at", "last_error", "seq"])
+    # Bail rendu pour ce qui n'est pas parti (échec, ordre) : repris au prochain passage
+    OutboxEvent.objects.filter(claimed_by=token, sent_at__isnull=True).update(claimed_by="", claimed_until=None)
+    return len(sent), len(failed)
+
+
+def purge_sent(older_than):
+    deleted, _ = OutboxEvent.objects.filter(sent_at__lt=timezone.now() - older_than).delete()
+    return deleted
@@ -0,0 +1,228 @@
+# candidature/planning.py
+"""
+Planification des entretiens : détection des chevauchements et disponibilités.
+
+Un entretien occupe l'intervalle semi-ouvert [date_entretien, fin_entretien),
+pour le freelance comme pour l'entreprise qui recrute.
+
+- En base : index (freelance | mission, date_entretien, fin_entretien). La durée
+  étant bornée (DUREE_MAX), un chevauchement avec [debut, fin) ne peut venir que
+  d'un entretien commençant dans [debut - DUREE_MAX, fin) : recherche par plage
+  d'index, jamais de parcours de toutes les candidatures.
+- En mémoire : pour la fenêtre chaude (hier → AGENDA_HORIZON_DAYS jours), l'agenda
+  de chaque freelance / entreprise est gardé sous forme d'arbre d'intervalles
+  (requête en O(log n + k)). Invalidé par les signaux de candidature, et
+  expiré après AGENDA_CACHE_TTL secondes pour les autres processus.
+
+La validation d'un créneau (conflicts) interroge toujours la base, dans la
+transaction de la sauvegarde : le cache ne sert qu'aux lectures d'agenda.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+from .models import Candidature
+
+FREELANCE = "freelance"
+ENTREPRISE = "entreprise"
+
+DUREE_MIN = 5                 # minutes
+DUREE_MAX = 8 * 60            # minutes
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def get_zone(name):
+    """ZoneInfo d'un nom IANA ("Europe/Paris"), ou None s'il est inconnu."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+class IntervalTree:
+    """
+    Arbre d'intervalles centré, statique (reconstruit à chaque invalidation).
+    Chaque nœud garde les intervalles contenant son centre, triés par début
+    et par fin ; les autres descendent à gauche (finis avant le centre) ou à
+    droite (commencés après).
+    """
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, center, by_start, by_end, left, right):
+        self.center = center
+        self.by_start = by_start
+        self.by_end = by_end
+        self.left = left
+        self.right = right
+
+    @classmethod
+    def build(cls, intervals):
+        """intervals : itérable de (debut, fin, valeur), avec debut < fin."""
+        intervals = list(intervals)
+        if not intervals:
+            return None
+        # Médiane des débuts : l'intervalle correspondant reste au nœud → l'arbre se réduit toujours
+        starts = sorted(debut for debut, _, _ in intervals)
+        center = starts[len(starts) // 2]
+
+        here, left, right = [], [], []
+        for interval in intervals:
+            debut, fin, _ = interval
+            if fin <= center:
+                left.append(interval)
+            elif debut > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        return cls(
+            center,
+            sorted(here, key=lambda i: i[0]),
+            sorted(here, key=lambda i: i[1], reverse=True),
+            cls.build(left),
+            cls.build(right),
+        )
+
+    def overlap(self, debut, fin):
+        """Intervalles chevauchant [debut, fin)."""
+        found = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if fin <= node.center:
+                # Tous les intervalles du nœud finissent après le centre (≥ fin)
+                for interval in node.by_start:
+                    if interval[0] >= fin:
+                        break
+                    found.append(interval)
+                stack.append(node.left)
+            elif debut > node.center:
+                # Tous commencent avant le centre (< debut)
+                for interval in node.by_end:
+                    if interval[1] <= debut:
+                        break
+                    found.append(interval)
+                stack.append(node.right)
+            else:
+                found.extend(node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        found.sort(key=lambda i: (i[0], i[1]))
+        return found
+
+
+def _owner_filter(kind, owner_id):
+    if kind == FREELANCE:
+        return Q(freelance_id=owner_id)
+    return Q(mission__entreprise_id=owner_id)
+
+
+def busy_from_db(kind, owner_id, debut, fin, exclude=None):
+    """Entretiens (debut, fin, id_candidature) chevauchant [debut, fin), par plage d'index."""
+    queryset = Candidature.objects.filter(
+        _owner_filter(kind, owner_id),
+        date_entretien__gte=debut - timedelta(minutes=DUREE_MAX),
+        date_entretien__lt=fin,
+        fin_entretien__gt=debut,
+    )
+    if exclude is not None:
+        queryset = queryset.exclude(pk=exclude)
+    return list(
+        queryset.order_by("date_entretien", "fin_entretien")
+        .values_list("date_entretien", "fin_entretien", "id_candidature")
+    )
+
+
+class AgendaCache:
+    """Arbres d'intervalles de la fenêtre chaude, par (type, id), en LRU borné."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, kind, owner_id, now=None):
+        """Retourne (fenetre_debut, fenetre_fin, arbre), construit au besoin."""
+        key = (kind, owner_id)
+        clock = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > clock:
+                self._entries.move_to_end(key)
+                return entry[1:]
+
+        now = now or timezone.now()
+        window_start = now - timedelta(days=1)
+        window_end = now + timedelta(days=_setting("AGENDA_HORIZON_DAYS", 30))
+        tree = IntervalTree.build(busy_from_db(kind, owner_id, window_start, window_end))
+        with self._lock:
+            self._entries[key] = (clock + _setting("AGENDA_CACHE_TTL", 30), window_start, window_end, tree)
+            self._entries.move_to_end(key)
+            while len(self._entries) > _setting("AGENDA_CACHE_SIZE", 2048):
+                self._entries.popitem(last=False)
+        return window_start, window_end, tree
+
+    def invalidate(self, kind, owner_id):
+        with self._lock:
+            self._entries.pop((kind, owner_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+agendas = AgendaCache()
+
+
+def busy(kind, owner_id, debut, fin):
+    """Créneaux occupés dans [debut, fin) : arbre en mémoire si la fenêtre chaude couvre la plage."""
+    window_start, window_end, tree = agendas.get(kind, owner_id)
+    if window_start <= debut and fin <= window_end:
+        return tree.overlap(debut, fin) if tree else []
+    return busy_from_db(kind, owner_id, debut, fin)
+
+
+def free_slots(occupied, debut, fin):
+    """Complément des créneaux occupés (triés par début) dans [debut, fin)."""
+    slots = []
+    cursor = debut
+    for start, end, _ in occupied:
+        if start > cursor:
+            slots.append((cursor, start))
+        cursor = max(cursor, end)
+    if cursor < fin:
+        slots.append((cursor, fin))
+    return slots
+
+
+def conflicts(candidature, debut, duree):
+    """
+    Entretiens du même freelance ou de la même entreprise qui chevauchent le
+    créneau proposé pour la candidature. Lecture en base (autoritative).
+
+    Appelée dans une transaction, elle verrouille d'abord le freelance et
+    l'entreprise : deux planifications concurrentes sur le même agenda sont
+    sérialisées et la seconde voit le créneau pris par la première.
+    """
+    entreprise_id = candidature.mission.entreprise_id
+    list(Freelance.objects.select_for_update().filter(pk=candidature.freelance_id).values_list("pk"))
+    list(Entreprise.objects.select_for_update().filter(pk=entreprise_id).values_list("pk"))
+
+    fin = debut + timedelta(minutes=duree)
+    found = {
+        interval[2]: interval
+        for kind, owner_id in ((FREELANCE, candidature.freelance_id), (ENTREPRISE, entreprise_id))
+        for interval in busy_from_db(kind, owner_id, debut, fin, exclude=candidature.pk)
+    }
+    return sorted(found.values())
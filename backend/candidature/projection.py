@@ -0,0 +1,191 @@
+# candidature/projection.py
+"""
+Projection de lecture des candidatures (CQRS).
+
+Le modèle d'écriture (Candidature → Mission → Entreprise, Freelance → User)
+reste la source de vérité ; CandidatureLecture en est une copie aplatie,
+lue par les endpoints de liste sans aucune jointure.
+
+Mise à jour :
+- signaux (candidature/signals.py) : sauvegarde ou suppression d'une
+  candidature, modification d'une mission, d'une entreprise, d'un freelance
+  ou de l'email d'un utilisateur. Les suppressions en cascade d'un parent
+  passent par post_delete de chaque candidature ;
+- appels explicites après les écritures qui court-circuitent les signaux
+  (bulk_create des recommandations et des lots WebSocket, bulk_update des scores) ;
+- rebuild() / check() : commande projection_candidatures.
+"""
+from django.db import connections, router
+
+from backend.images import current
+from freelance.models import Freelance
+from .models import Candidature, CandidatureLecture
+
+FREELANCE_FIELDS = [
+    "freelance_nom", "freelance_email", "freelance_description", "freelance_competence",
+    "freelance_experience", "freelance_formation", "freelance_certificat",
+    "freelance_tarif", "freelance_photo", "freelance_photo_variants",
+]
+PROJECTED_FIELDS = [
+    "date", "status", "date_entretien", "commentaire_entretien", "timezone", "score",
+    "mission_id", "mission_titre",
+    "entreprise_id", "entreprise_nom", "entreprise_photo", "entreprise_photo_variants",
+    "freelance_id",
+] + FREELANCE_FIELDS
+
+
+def _source(queryset):
+    return queryset.select_related("mission__entreprise", "freelance__user")
+
+
+def _entreprise_columns(entreprise):
+    return {
+        "entreprise_nom": entreprise.nom,
+        "entreprise_photo": entreprise.profile_image.name if entreprise.profile_image else None,
+        "entreprise_photo_variants": current(entreprise.profile_image, entreprise.profile_image_variants),
+    }
+
+
+def _freelance_columns(freelance):
+    return {
+        "freelance_nom": freelance.nom,
+        "freelance_email": freelance.user.email,
+        "freelance_description": freelance.description,
+        "freelance_competence": freelance.competence,
+        "freelance_experience": freelance.experience,
+        "freelance_formation": freelance.formation,
+        "freelance_certificat": freelance.certificat,
+        "freelance_tarif": freelance.tarif,
+        "freelance_photo": freelance.photo.name if freelance.photo else "",
+        "freelance_photo_variants": current(freelance.photo, freelance.photo_variants),
+    }
+
+
+def project(candidature):
+    """Ligne de projection d'une candidature (relations déjà chargées)."""
+    mission = candidature.mission
+    return CandidatureLecture(
+        id_candidature=candidature.id_candidature,
+        date=candidature.date,
+        status=candidature.status,
+        date_entretien=candidature.date_entretien,
+        commentaire_entretien=candidature.commentaire_entretien,
+        timezone=candidature.timezone,
+        score=candidature.score,
+        mission_id=mission.id_mission,
+        mission_titre=mission.titre,
+        entreprise_id=mission.entreprise_id,
+        freelance_id=candidature.freelance_id,
+        **_entreprise_columns(mission.entreprise),
+        **_freelance_columns(candidature.freelance),
+    )
+
+
+def _upsert(rows):
+    if rows:
+        # MySQL (ON DUPLICATE KEY UPDATE) n'accepte pas de cible : le conflit
+        # porte d'office sur la clé primaire id_candidature
+        features = connections[router.db_for_write(CandidatureLecture)].features
+        target = ["id_candidature"] if features.supports_update_conflicts_with_target else None
+        CandidatureLecture.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=target,
+            update_fields=PROJECTED_FIELDS,
+        )
+    return len(rows)
+
+
+def refresh(queryset):
+    """Recalcule les lignes d'un ensemble de candidatures : une lecture jointe + un upsert."""
+    return _upsert([project(c) for c in _source(queryset)])
+
+
+def refresh_ids(ids):
+    ids = list(ids)
+    return refresh(Candidature.objects.filter(id_candidature__in=ids)) if ids else 0
+
+
+def remove_ids(ids):
+    CandidatureLecture.objects.filter(id_candidature__in=list(ids)).delete()
+
+
+def update_scores(candidatures):
+    """Reporte les scores recalculés (bulk_update, sans signal)."""
+    CandidatureLecture.objects.bulk_update(
+        [CandidatureLecture(id_candidature=c.id_candidature, score=c.score) for c in candidatures],
+        ["score"],
+    )
+
+
+def update_entreprise(entreprise):
+    CandidatureLecture.objects.filter(entreprise_id=entreprise.id_entreprise).update(
+        **_entreprise_columns(entreprise)
+    )
+
+
+def update_freelance(freelance):
+    CandidatureLecture.objects.filter(freelance_id=freelance.id_freelance).update(
+        **_freelance_columns(freelance)
+    )
+
+
+def update_user_email(user):
+    CandidatureLecture.objects.filter(
+        freelance_id__in=Freelance.objects.filter(user_id=user.pk).values("id_freelance")
+    ).update(freelance_email=user.email)
+
+
+def _chunks(batch_size):
+    queryset = _source(Candidature.objects.order_by("id_candidature"))
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id_candidature__gt=last_id)[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id_candidature
+
+
+def _orphans():
+    return CandidatureLecture.objects.exclude(
+        id_candidature__in=Candidature.objects.values("id_candidature")
+    )
+
+
+def rebuild(batch_size=1000):
+    """Reconstruit toute la projection par tranches keyset. Retourne le nombre de lignes."""
+    total = 0
+    for batch in _chunks(batch_size):
+        total += _upsert([project(c) for c in batch])
+    _orphans().delete()
+    return total
+
+
+def check(batch_size=1000, fix=False):
+    """
+    Compare la projection au modèle d'écriture.
+    Retourne {"missing": [...], "stale": [...], "orphans": [...]} (ids de candidature) ;
+    avec fix=True, les écarts sont corrigés au passage.
+    """
+    report = {"missing": [], "stale": [], "orphans": []}
+    for batch in _chunks(batch_size):
+        stored = CandidatureLecture.objects.in_bulk([c.id_candidature for c in batch])
+        repair = []
+        for candidature in batch:
+            expected = project(candidature)
+            row = stored.get(candidature.id_candidature)
+            if row is None:
+                report["missing"].append(candidature.id_candidature)
+            elif any(getattr(row, f) != getattr(expected, f) for f in PROJECTED_FIELDS):
+                report["stale"].append(candidature.id_candidature)
+            else:
+                continue
+            repair.append(expected)
+        if fix:
+            _upsert(repair)
+
+    report["orphans"] = list(_orphans().values_list("id_candidature", flat=True))
+    if fix and report["orphans"]:
+        remove_ids(report["orphans"])
+    return report
@@ -0,0 +1,76 @@
+# candidature/recommendation.py
+"""
+Recommandation proactive de freelances pour une nouvelle mission.
+
+1. Récupération : l'index inversé FreelanceCompetence donne les profils qui
+   partagent au moins un terme avec les compétences requises, classés par
+   nombre de termes communs (jamais de parcours de tous les freelances).
+2. Classement : les candidats retenus sont scorés par lot (matching.py).
+3. Insertion : les k meilleurs deviennent des candidatures "recommandee"
+   via bulk_create(ignore_conflicts=True) sur la contrainte unique_candidature,
+   puis sont reportés dans la projection de lecture (projection.py).
+"""
+import numpy as np
+from django.conf import settings
+
+from freelance.models import Freelance
+from freelance.skills import competence_terms, overlapping_freelance_ids
+from .matching import score_matrix
+from .models import Candidature
+from . import projection
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def candidate_freelances(mission, pool_size=None):
+    """Freelances partageant des compétences avec la mission (via l'index)."""
+    pool_size = pool_size or _setting("RECOMMANDATION_POOL", 500)
+    ids = overlapping_freelance_ids(competence_terms(mission.competence_requis), limit=pool_size)
+    if not ids:
+        return []
+    return list(
+        Freelance.objects.filter(id_freelance__in=ids).only(
+            "id_freelance", "competence", "experience", "formation", "description"
+        )
+    )
+
+
+def top_freelances(mission, k=None):
+    """Liste de (freelance, score) des k meilleurs profils pour la mission."""
+    k = k or _setting("RECOMMANDATION_TOP_K", 10)
+    seuil = _setting("RECOMMANDATION_SCORE_MIN", 10.0)
+
+    freelances = candidate_freelances(mission)
+    if not freelances:
+        return []
+
+    scores = score_matrix(freelances, [mission])[:, 0]
+    if len(freelances) > k:
+        best = np.argpartition(-scores, k - 1)[:k]
+    else:
+        best = np.arange(len(freelances))
+    best = sorted(best, key=lambda i: (-scores[i], freelances[i].id_freelance))
+    return [(freelances[i], float(scores[i])) for i in best if scores[i] >= seuil]
+
+
+def recommend_freelances(mission, k=None):
+    """
+    Crée les candidatures "recommandee" de la mission. Les couples déjà
+    existants (candidature spontanée, recommandation précédente) sont ignorés.
+    Retourne la liste des candidatures proposées.
+    """
+    if mission.pk is None:  # supprimée avant le commit
+        return []
+    candidatures = [
+        Candidature(mission=mission, freelance=freelance, status="recommandee", score=score)
+        for freelance, score in top_freelances(mission, k)
+    ]
+    Candidature.objects.bulk_create(candidatures, ignore_conflicts=True)
+    # bulk_create n'émet pas post_save → projection mise à jour explicitement
+    if candidatures:
+        projection.refresh(Candidature.objects.filter(
+            mission=mission, freelance_id__in=[c.freelance_id for c in candidatures]
+        ))
+    return candidatures
@@ -1,24 +1,21 @@
 # recrutement/serializers.py
 from rest_framework import serializers
-from .models import Candidature
+from .models import Candidature, CandidatureLecture
+from backend.serializers import OptimizedQuerysetMixin
+from . import planning
 
-class CandidatureSerializer(serializers.ModelSerializer):
-    mission_titre = serializers.CharField(source="mission.titre", read_only=True)
-    freelance_nom = serializers.CharField(source="freelance.nom", read_only=True)
+class CandidatureSerializer(OptimizedQuerysetMixin, serializers.ModelSerializer):
+    """
+    Lu depuis la projection CandidatureLecture : toutes les colonnes sont
+    déjà aplaties, aucune jointure à la lecture.
+    """
     date = serializers.DateTimeField(format="%d/%m/%Y", read_only=True)
-    freelance_email = serializers.EmailField(source="freelance.user.email", read_only=True)
-    # Récupérer l'ID de l'entreprise liée à la mission
-    entreprise_id = serializers.IntegerField(source="mission.entreprise.id_entreprise", read_only=True)
-    freelance_description = serializers.CharField(source="freelance.description", read_only=True)
-    freelance_competence = serializers.CharField(source="freelance.competence", read_only=True)
-    freelance_experience = serializers.CharField(source="freelance.experience", read_only=True)
-    freelance_formation = serializers.CharField(source="freelance.formation", read_only=True)
-    freelance_certificat = serializers.CharField(source="freelance.certificat", read_only=True)
-    freelance_tarif = serializers.CharField(source="freelance.tarif", read_only=True)
-    freelance_photo = serializers.CharField(source="freelance.photo", read_only=True)
+    mission = serializers.IntegerField(source="mission_id", read_only=True)
+    freelance = serializers.IntegerField(source="freelance_id", read_only=True)
+    freelance_tarif = serializers.CharField(read_only=True)
 
     class Meta:
-        model = Candidature
+        model = CandidatureLecture
         fields = [
             "id_candidature",
             "date",
@@ -36,47 +33,61 @@ class CandidatureSerializer(serializers.ModelSerializer):
             "freelance_certificat",
             "freelance_tarif",
             "freelance_photo",
+            "freelance_photo_variants",
             "date_entretien",
             "commentaire_entretien",
             "score",
             "timezone"
         ]
-        # Ces champs sont fixes → jamais modifiables
-        read_only_fields = [
-            "id_candidature", 
-            "mission", 
-            "mission_titre", 
-            "freelance", 
-            "freelance_nom", 
-            "freelance_email",
-            "freelance_description",
-            "freelance_competence",
-            "freelance_experience",
-            "freelance_formation",
-            "freelance_certificat",
-            "freelance_tarif",
-            "freelance_photo",
-            "date"  # générée automatiquement
-        ]
+        # Projection de lecture → jamais modifiable par ce serializer
+        read_only_fields = fields
 
 
 class UpdateCandidatureSerializer(serializers.ModelSerializer):
+    duree_entretien = serializers.IntegerField(
+        min_value=planning.DUREE_MIN, max_value=planning.DUREE_MAX, required=False
+    )
+
     class Meta:
         model = Candidature
-        fields = ["id_candidature","status", "timezone" , "date_entretien", "commentaire_entretien", "score"]
-        read_only_fields=["id_candidature"]
+        fields = ["id_candidature","status", "timezone" , "date_entretien", "duree_entretien", "fin_entretien", "commentaire_entretien", "score"]
+        read_only_fields=["id_candidature", "fin_entretien"]
+
+    def validate_timezone(self, value):
+        if planning.get_zone(value) is None:
+            raise serializers.ValidationError("Fuseau horaire inconnu.")
+        return value
 
-class notification(serializers.ModelSerializer):
-    mission_titre = serializers.CharField(source="mission.titre", read_only=True)
-    freelance_nom = serializers.CharField(source="freelance.nom", read_only=True)
-    entreprise_nom = serializers.CharField(source="mission.entreprise.nom" , read_only=True)
-    entreprise_photo = serializers.SerializerMethodField()
+    def validate(self, attrs):
+        """Refuse un créneau qui chevauche un autre entretien du freelance ou de l'entreprise."""
+        instance = self.instance
+        if instance is None or not ({"date_entretien", "duree_entretien"} & attrs.keys()):
+            return attrs
+        debut = attrs.get("date_entretien", instance.date_entretien)
+        if debut is None:
+            return attrs
+        duree = attrs.get("duree_entretien", instance.duree_entretien)
+
+        occupes = planning.conflicts(instance, debut, duree)
+        if occupes:
+            raise serializers.ValidationError({
+                "date_entretien": ["Ce créneau chevauche un autre entretien."],
+                # créneaux seulement : pas de détail sur les autres candidatures
+                "conflits": [
+                    {"debut": start.isoformat(), "fin": end.isoformat()} for start, end, _ in occupes
+                ],
+            })
+        return attrs
+
+class notification(OptimizedQuerysetMixin, serializers.ModelSerializer):
+    """Notifications d'entretien, lues depuis la projection CandidatureLecture."""
 
     class Meta:
-        model = Candidature
+        model = CandidatureLecture
         fields = [
             "id_candidature",
             "entreprise_photo",
+            "entreprise_photo_variants",
             "timezone",
             "entreprise_nom",
             "mission_titre",
@@ -85,10 +96,5 @@ class notification(serializers.ModelSerializer):
             "date_entretien",
             "commentaire_entretien",
         ]
-
-    def get_entreprise_photo(self, obj):
-        image = obj.mission.entreprise.profile_image
-        if image:
-            # Retourne seulement le chemin relatif (ex: "profiles/faly.png")
-            return image.name
-        return None
\ No newline at end of file
+        only = tuple(fields)
+        read_only_fields = fields
@@ -1,29 +1,33 @@
 # recrutement/signals.py
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from mission.models import Mission
+from entreprise.models import Entreprise
+from freelance.models import Freelance
 from .models import Candidature
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from .recommendation import recommend_freelances
+from .outbox import enqueue
+from . import projection
+from .planning import agendas, FREELANCE, ENTREPRISE
+from backend.images import variants_built
 
 @receiver(post_save, sender=Candidature)
 def candidature_updated(sender, instance, created, **kwargs):
     """
-    Envoie une notification WebSocket uniquement lorsqu'une candidature est mise à jour,
-    pas lors de sa création.
+    Notifie le freelance et l'entreprise lorsqu'une candidature est mise à jour,
+    pas lors de sa création. Le message est écrit dans l'outbox, dans la même
+    transaction que la sauvegarde ; le dispatcher l'envoie ensuite au channel layer.
     """
     # Si la candidature vient d'être créée, on ne fait rien
     if created:
         return
 
-    # On peut aussi vérifier que certains champs spécifiques ont changé, si nécessaire
-    # Par exemple: status ou date_entretien
-    # Si tu utilises serializer.save(update_fields=[...]) dans ta vue,
-    # tu peux récupérer kwargs['update_fields'] et filtrer
-
-    channel_layer = get_channel_layer()
-    freelance_id = instance.freelance.id_freelance
-    entreprise_id = instance.mission.entreprise.id_entreprise  # ID de l'entreprise
-
+    # Relations chargées par la vue (select_related) → pas de requête ici
+    mission = instance.mission
+    entreprise = mission.entreprise
+    freelance = instance.freelance
 
     message = {
         "id_candidature": instance.id_candidature,
@@ -31,26 +35,102 @@ def candidature_updated(sender, instance, created, **kwargs):
         "date_entretien": str(instance.date_entretien) if instance.date_entretien else None,
         "commentaire_entretien": instance.commentaire_entretien,
         "timezone" : instance.timezone,
-        "mission_titre": instance.mission.titre,
-        "entreprise_nom": instance.mission.entreprise.nom,
-        "entreprise_photo": instance.mission.entreprise.profile_image.name if instance.mission.entreprise.profile_image else None,
-        "freelance_nom": instance.freelance.nom,
+        "mission_titre": mission.titre,
+        "entreprise_nom": entreprise.nom,
+        "entreprise_photo": entreprise.profile_image.name if entreprise.profile_image else None,
+        "freelance_nom": freelance.nom,
     }
 
-    async_to_sync(channel_layer.group_send)(
-        f"freelance_{freelance_id}",
-        {
-            "type": "new_entretien",
-            "message": message
-        }
+    # ✅ Envoi au freelance, et à l'entreprise pour visualisation
+    enqueue(
+        instance.id_candidature,
+        [f"freelance_{freelance.id_freelance}", f"entreprise_{entreprise.id_entreprise}"],
+        "new_entretien",
+        message,
     )
 
-     # ✅ Envoi à l'entreprise pour visualisation
-    async_to_sync(channel_layer.group_send)(
-        f"entreprise_{entreprise_id}",
-        {
-            "type": "new_entretien",
-            "message": message
-        }
-    )
 
+@receiver(post_save, sender=Mission)
+def recommend_for_new_mission(sender, instance, created, **kwargs):
+    """
+    Nouvelle mission → proposer les meilleurs freelances (statut "recommandee"),
+    une fois la mission réellement enregistrée.
+    """
+    if created:
+        transaction.on_commit(lambda: recommend_freelances(instance))
+
+
+# --- Projection de lecture (CandidatureLecture) ---
+# Les suppressions de mission, entreprise, freelance ou utilisateur arrivent
+# ici par cascade : post_delete est émis pour chaque candidature supprimée.
+
+@receiver(post_save, sender=Candidature)
+def project_candidature(sender, instance, **kwargs):
+    projection.refresh_ids([instance.id_candidature])
+
+
+@receiver(post_delete, sender=Candidature)
+def unproject_candidature(sender, instance, **kwargs):
+    projection.remove_ids([instance.id_candidature])
+
+
+@receiver(post_save, sender=Mission)
+def project_mission(sender, instance, created, **kwargs):
+    if not created:
+        projection.refresh(Candidature.objects.filter(mission=instance))
+
+
+@receiver(post_save, sender=Entreprise)
+def project_entreprise(sender, instance, created, **kwargs):
+    if not created:
+        projection.update_entreprise(instance)
+
+
+@receiver(post_save, sender=Freelance)
+def project_freelance(sender, instance, created, **kwargs):
+    if not created:
+        projection.update_freelance(instance)
+
+
+@receiver(variants_built, sender=Entreprise)
+def project_entreprise_variants(sender, instance, **kwargs):
+    # Variantes écrites par update() : pas de post_save
+    projection.update_entreprise(instance)
+
+
+@receiver(variants_built, sender=Freelance)
+def project_freelance_variants(sender, instance, **kwargs):
+    projection.update_freelance(instance)
+
+
+@receiver(post_save, sender=get_user_model())
+def project_user_email(sender, instance, created, update_fields=None, **kwargs):
+    # login() ne sauvegarde que last_login : rien à projeter
+    if created or (update_fields is not None and "email" not in update_fields):
+        return
+    projection.update_user_email(instance)
+
+
+# --- Agendas d'entretiens en mémoire (candidature/planning.py) ---
+
+def _invalidate_agendas(instance):
+    freelance_id, entreprise_id = instance.freelance_id, instance.mission.entreprise_id
+
+    def invalidate():
+        agendas.invalidate(FREELANCE, freelance_id)
+        agendas.invalidate(ENTREPRISE, entreprise_id)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Candidature)
+def invalidate_agendas_on_save(sender, instance, created, **kwargs):
+    if created and instance.date_entretien is None:
+        return
+    _invalidate_agendas(instance)
+
+
+@receiver(post_delete, sender=Candidature)
+def invalidate_agendas_on_delete(sender, instance, **kwargs):
+    if instance.date_entretien is not None:
+        _invalidate_agendas(instance)
@@ -9,6 +9,7 @@ from mission.models import Mission
 from entreprise.models import Entreprise
 from freelance.models import Freelance
 from datetime import datetime, timedelta
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -112,6 +113,64 @@ class CandidatureViewsTest(APITestCase):
         self.assertEqual(len(response.json()), 1)
         self.assertEqual(response.json()[0]["id_candidature"], self.candidature.id_candidature)
 
+    # -------------------------------
+    # Pagination keyset (?page_size= / ?cursor=)
+    # -------------------------------
+    def _autres_candidatures(self, total):
+        for i in range(total):
+            user = User.objects.create_user(
+                email=f"freelance{i}@gmail.com", password="pass123", role=User.ROLE_FREELANCE
+            )
+            freelance = Freelance.objects.create(user=user, nom=f"Freelance {i}", tarif="50.00")
+            Candidature.objects.create(
+                mission=self.mission,
+                freelance=freelance,
+                # une candidature sans entretien pour vérifier le placement des NULL
+                date_entretien=None if i == 0 else timezone.now() + timedelta(days=2 + i),
+            )
+
+    def test_candidatures_mission_pagination_keyset(self):
+        self._autres_candidatures(3)
+        self.client.login(email="entreprise@gmail.com", password="pass123")
+        url = reverse("mes_candidatures")
+
+        vus = []
+        response = self.client.get(url, {"page_size": 3})
+        self.assertEqual(len(response.json()["results"]), 3)
+        vus += [c["id_candidature"] for c in response.json()["results"]]
+
+        response = self.client.get(response.json()["next"])
+        self.assertIsNone(response.json()["next"])
+        vus += [c["id_candidature"] for c in response.json()["results"]]
+
+        attendus = list(
+            Candidature.objects.order_by("-date", "-id_candidature").values_list("id_candidature", flat=True)
+        )
+        self.assertEqual(vus, attendus)
+
+    def test_notifications_entreprise_pagination_nulls_en_dernier(self):
+        self._autres_candidatures(3)
+        self.client.login(email="entreprise@gmail.com", password="pass123")
+        url = reverse("notifications-entreprise")
+
+        vus = []
+        response = self.client.get(url, {"page_size": 1})
+        while True:
+            data = response.json()
+            vus += [c["id_candidature"] for c in data["results"]]
+            if not data["next"]:
+                break
+            response = self.client.get(data["next"])
+
+        self.assertEqual(len(vus), 4)
+        sans_entretien = Candidature.objects.get(date_entretien__isnull=True)
+        self.assertEqual(vus[-1], sans_entretien.id_candidature)
+
+    def test_curseur_invalide(self):
+        self.client.login(email="entreprise@gmail.com", password="pass123")
+        response = self.client.get(reverse("mes_candidatures"), {"cursor": "n'importe-quoi"})
+        self.assertEqual(response.status_code, 404)
+
 
 # 5️⃣ Résumé du fonctionnement réel
 
@@ -0,0 +1,88 @@
+# candidature/tests/test_consumers.py
+from asgiref.sync import async_to_sync
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+import pytest
+from candidature.models import Candidature
+from candidature.routing import websocket_urlpatterns
+from mission.models import Mission
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+
+User = get_user_model()
+
+
+async def _batch(entreprise_id, items):
+    communicator = WebsocketCommunicator(
+        URLRouter(websocket_urlpatterns), f"/ws/candidatures/{entreprise_id}/"
+    )
+    connected, _ = await communicator.connect()
+    assert connected
+    await communicator.send_json_to({"action": "batch", "candidatures": items})
+    response = await communicator.receive_json_from(timeout=5)
+
+    broadcast = []
+    while not await communicator.receive_nothing(timeout=0.2):
+        broadcast.append(await communicator.receive_json_from())
+    await communicator.disconnect()
+    return response, broadcast
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class CandidatureBatchTest(TestCase):
+
+    def setUp(self):
+        entreprises = []
+        for i in range(2):
+            user = User.objects.create(email=f"entreprise{i}@gmail.com", role=User.ROLE_ENTREPRISE)
+            entreprises.append(Entreprise.objects.create(user=user, nom=f"Entreprise {i}", secteur="IT"))
+        self.entreprise, autre = entreprises
+        self.mission = Mission.objects.create(
+            titre="Mission", description="Desc", competence_requis="Python",
+            budget=100, entreprise=self.entreprise,
+        )
+        self.mission_autre = Mission.objects.create(
+            titre="Autre", description="Desc", competence_requis="Python", budget=100, entreprise=autre,
+        )
+        self.freelances = [
+            Freelance.objects.create(
+                user=User.objects.create(email=f"f{i}@gmail.com", role=User.ROLE_FREELANCE),
+                nom=f"Freelance {i}", competence="Python", tarif="50.00",
+            )
+            for i in range(6)
+        ]
+        Candidature.objects.create(mission=self.mission, freelance=self.freelances[0])
+
+    def _items(self, freelances, mission=None):
+        mission = mission or self.mission
+        return [{"mission_id": mission.id_mission, "freelance_id": f.id_freelance} for f in freelances]
+
+    def test_lot_resultats_par_element(self):
+        items = self._items(self.freelances[:3]) + self._items(self.freelances[:1], self.mission_autre)
+        items.append({"mission_id": self.mission.id_mission, "freelance_id": 999999})
+
+        response, broadcast = async_to_sync(_batch)(self.entreprise.id_entreprise, items)
+
+        self.assertEqual(response["action"], "batch_result")
+        self.assertEqual(
+            [r["status"] for r in response["results"]],
+            ["existing", "created", "created", "error", "error"],
+        )
+        self.assertEqual(Candidature.objects.filter(mission=self.mission).count(), 3)
+        # diffusion au groupe de l'entreprise, au format des trames unitaires
+        self.assertEqual(len(broadcast), 3)
+        self.assertIn("freelance_email", broadcast[0])
+
+    def test_nombre_de_requetes_constant(self):
+        with CaptureQueriesContext(connection) as petit:
+            async_to_sync(_batch)(self.entreprise.id_entreprise, self._items(self.freelances[1:2]))
+        with CaptureQueriesContext(connection) as grand:
+            async_to_sync(_batch)(self.entreprise.id_entreprise, self._items(self.freelances[2:]))
+        self.assertEqual(len(petit.captured_queries), len(grand.captured_queries))
@@ -0,0 +1,51 @@
+# candidature/tests/test_loadtest.py
+from io import StringIO
+import json
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+import pytest
+from backend.loadtest import markers, percentile
+
+User = get_user_model()
+
+
+@pytest.mark.unit
+def test_percentile_rang_le_plus_proche():
+    valeurs = list(range(1, 101))
+    assert [percentile(valeurs, p) for p in (50, 95, 99)] == [50, 95, 99]
+    assert percentile([], 50) is None
+
+
+@pytest.mark.unit
+def test_marqueurs():
+    batch = {"action": "batch", "events": [
+        {"action": "created", "mission": {"id_mission": 1, "titre": "op1"}},
+        {"action": "deleted", "mission": {"id_mission": 2}},
+    ]}
+    assert list(markers(batch)) == ["op1", ("deleted", 2)]
+    assert list(markers({"commentaire_entretien": "op3", "mission_titre": "M", "freelance_nom": "F"})) == ["op3"]
+    assert list(markers({"mission_titre": "M", "freelance_nom": "F"})) == [("M", "F")]
+
+
+@pytest.mark.unit
+@override_settings(MISSION_BROADCAST_WINDOW=0.01)
+class LoadTestCommandTest(TransactionTestCase):
+
+    def test_run_complet(self):
+        out = StringIO()
+        call_command(
+            "loadtest_websockets", clients=8, entreprise_ratio=0.25, operations=30, rate=200,
+            dispatch_interval=0.01, drain=0.5, seed=1, json=True, stdout=out,
+        )
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(report["sockets"], 16)
+        self.assertEqual(report["errors"], 0)
+        self.assertEqual(sum(report["operations"].values()), 30)
+        self.assertGreater(report["memory_per_socket"], 0)
+        for scenario in ("apply", "interview", "mission", "all"):
+            self.assertGreater(report["latency"][scenario]["n"], 0, scenario)
+        self.assertLessEqual(report["latency"]["all"]["p50"], report["latency"]["all"]["p99"])
+        # données du run supprimées
+        self.assertFalse(User.objects.filter(email__startswith="loadtest-").exists())
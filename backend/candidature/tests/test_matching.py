@@ -0,0 +1,97 @@
+# candidature/tests/test_matching.py
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+import pytest
+from django.contrib.auth import get_user_model
+from candidature.matching import score_matrix, score_pair, score_pairs
+from candidature.models import Candidature
+from candidature.recommendation import recommend_freelances
+from mission.models import Mission
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+
+User = get_user_model()
+
+
+class MatchingDataMixin:
+
+    def setUp(self):
+        user_entreprise = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        entreprise = Entreprise.objects.create(user=user_entreprise, nom="Entreprise Test", secteur="IT")
+        self.mission = Mission.objects.create(
+            titre="Développeur backend Django",
+            description="API REST en Python pour une plateforme de recrutement",
+            competence_requis="Python, Django, REST",
+            budget=1000,
+            entreprise=entreprise,
+        )
+        self.pythoniste = self._freelance("py@gmail.com", "Python, Django", "3 ans de développement backend")
+        self.designer = self._freelance("ux@gmail.com", "Figma, Photoshop", "Maquettes et identité visuelle")
+
+    def _freelance(self, email, competence, experience):
+        user = User.objects.create_user(email=email, password="pass123", role=User.ROLE_FREELANCE)
+        return Freelance.objects.create(
+            user=user, nom=email, competence=competence, experience=experience,
+            formation="Master", tarif="50.00",
+        )
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class MatchingTest(MatchingDataMixin, TestCase):
+
+    def test_classement_coherent(self):
+        scores = score_matrix([self.pythoniste, self.designer], [self.mission])
+        self.assertEqual(scores.shape, (2, 1))
+        self.assertGreater(scores[0, 0], 50)
+        self.assertEqual(scores[1, 0], 0)
+
+    def test_score_pairs_egal_matrice(self):
+        pairs = [(self.pythoniste, self.mission), (self.designer, self.mission)]
+        self.assertEqual(list(score_pairs(pairs)), list(score_matrix([self.pythoniste, self.designer], [self.mission])[:, 0]))
+
+    def test_commande_rescore(self):
+        candidature = Candidature.objects.create(mission=self.mission, freelance=self.pythoniste)
+        self.assertEqual(candidature.score, 0.0)
+        call_command("rescore_candidatures", "--batch-size", "1", stdout=StringIO())
+        candidature.refresh_from_db()
+        self.assertEqual(candidature.score, score_pair(self.pythoniste, self.mission))
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    RECOMMANDATION_TOP_K=1,
+)
+class RecommendationTest(MatchingDataMixin, TestCase):
+
+    def test_index_competences(self):
+        self.assertEqual(
+            {t.terme for t in self.pythoniste.termes_competence.all()}, {"python", "django"}
+        )
+        self.pythoniste.competence = "Go"
+        self.pythoniste.save()
+        self.assertEqual([t.terme for t in self.pythoniste.termes_competence.all()], ["go"])
+
+    def test_nouvelle_mission_recommande_top_k(self):
+        autre = self._freelance("dj@gmail.com", "Django", "Backend")
+        with self.captureOnCommitCallbacks(execute=True):
+            mission = Mission.objects.create(
+                titre="API Django", description="Backend Python",
+                competence_requis="Python, Django", budget=500,
+                entreprise=self.mission.entreprise,
+            )
+        recommandees = Candidature.objects.filter(mission=mission)
+        self.assertEqual(recommandees.count(), 1)
+        self.assertEqual(recommandees.get().freelance, self.pythoniste)
+        self.assertEqual(recommandees.get().status, "recommandee")
+        self.assertGreater(recommandees.get().score, score_pair(autre, mission) - 1e-6)
+
+    def test_candidature_existante_conservee(self):
+        Candidature.objects.create(mission=self.mission, freelance=self.pythoniste, status="en_entretien")
+        recommend_freelances(self.mission)
+        self.assertEqual(Candidature.objects.get(mission=self.mission).status, "en_entretien")
@@ -0,0 +1,131 @@
+# candidature/tests/test_outbox.py
+from datetime import timedelta
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+import pytest
+from candidature.models import Candidature, OutboxEvent
+from backend import replay
+from candidature.outbox import BACKOFF_MAX, dispatch_batch
+from mission.models import Mission
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+
+User = get_user_model()
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class OutboxTest(APITestCase):
+
+    def setUp(self):
+        user_entreprise = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        self.entreprise = Entreprise.objects.create(user=user_entreprise, nom="Entreprise Test", secteur="IT")
+        user_freelance = User.objects.create(email="freelance@gmail.com", role=User.ROLE_FREELANCE)
+        self.freelance = Freelance.objects.create(user=user_freelance, nom="Freelance", tarif="50.00")
+        mission = Mission.objects.create(
+            titre="Mission", description="Desc", competence_requis="Python",
+            budget=100, entreprise=self.entreprise,
+        )
+        self.candidature = Candidature.objects.create(mission=mission, freelance=self.freelance)
+        self.client.force_authenticate(user=user_entreprise)
+        self.url = reverse("candidatureupdate", kwargs={"pk": self.candidature.id_candidature})
+
+    def _ecoute(self, group):
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(group, channel)
+        return layer, channel
+
+    def test_patch_ecrit_dans_l_outbox_sans_envoyer(self):
+        with patch("channels.layers.InMemoryChannelLayer.group_send") as group_send:
+            response = self.client.patch(self.url, {"status": "en_entretien"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        group_send.assert_not_called()
+        self.assertEqual(
+            sorted(OutboxEvent.objects.values_list("group_name", flat=True)),
+            [f"entreprise_{self.entreprise.id_entreprise}", f"freelance_{self.freelance.id_freelance}"],
+        )
+
+    def test_dispatch_envoie_au_groupe(self):
+        layer, channel = self._ecoute(f"freelance_{self.freelance.id_freelance}")
+        self.client.patch(self.url, {"status": "en_entretien"}, format="json")
+
+        self.assertEqual(dispatch_batch(), (2, 0))
+        message = async_to_sync(layer.receive)(channel)
+        self.assertEqual(message["type"], "new_entretien")
+        self.assertEqual(message["message"]["status"], "en_entretien")
+        self.assertFalse(OutboxEvent.objects.filter(sent_at__isnull=True).exists())
+
+    def test_echec_puis_reprise_dans_l_ordre(self):
+        self.client.patch(self.url, {"status": "en_entretien"}, format="json")
+        self.client.patch(self.url, {"commentaire_entretien": "Visio"}, format="json")
+
+        with patch("channels.layers.InMemoryChannelLayer.group_send", side_effect=ConnectionError("redis down")):
+            self.assertEqual(dispatch_batch(), (0, 1))
+        premier = OutboxEvent.objects.order_by("id").first()
+        self.assertEqual(premier.attempts, 1)
+        self.assertGreater(premier.next_attempt_at, timezone.now())
+
+        # Tant que le premier attend sa reprise, les suivants de la même candidature attendent
+        self.assertEqual(dispatch_batch(), (0, 0))
+
+        # Redis revenu : tout part, dans l'ordre
+        self.assertEqual(dispatch_batch(now=premier.next_attempt_at), (4, 0))
+
+    def test_deux_dispatchers_concurrents(self):
+        self.client.patch(self.url, {"status": "en_entretien"}, format="json")
+        self.client.patch(self.url, {"commentaire_entretien": "Visio"}, format="json")
+        ids = list(OutboxEvent.objects.order_by("id").values_list("id", flat=True))
+        envoyes, concurrent = [], []
+        stamp = replay.stamp
+
+        def envoi(group, event):
+            envoyes.append(event["message"]["commentaire_entretien"])
+            if not concurrent:
+                # Second dispatcher (autre pod) pendant l'envoi du premier lot
+                concurrent.append(dispatch_batch(batch_size=2))
+            return stamp(group, event)
+
+        with patch("candidature.outbox.replay.stamp", side_effect=envoi):
+            self.assertEqual(dispatch_batch(batch_size=2), (2, 0))
+            # lignes du premier lot réservées ; les suivantes de la même candidature attendent
+            self.assertEqual(concurrent, [(0, 0)])
+            self.assertEqual(dispatch_batch(batch_size=2), (2, 0))
+            self.assertEqual(dispatch_batch(batch_size=2), (0, 0))
+
+        self.assertEqual(envoyes, [None, None, "Visio", "Visio"])  # une fois chacun, dans l'ordre
+        self.assertEqual(
+            list(OutboxEvent.objects.order_by("sent_at", "id").values_list("id", flat=True)), ids)
+
+    @override_settings(WEBSOCKET_REPLAY=replay.MEMORY)
+    def test_reprise_garde_le_meme_seq(self):
+        replay.log().clear()
+        group = f"freelance_{self.freelance.id_freelance}"
+        layer, channel = self._ecoute(group)
+        self.client.patch(self.url, {"status": "en_entretien"}, format="json")
+
+        with patch("channels.layers.InMemoryChannelLayer.group_send", side_effect=ConnectionError("redis down")):
+            dispatch_batch()
+        event = OutboxEvent.objects.get(group_name=group)
+        self.assertIsNotNone(event.seq)
+
+        self.assertEqual(dispatch_batch(now=timezone.now() + timedelta(seconds=BACKOFF_MAX)), (2, 0))
+        self.assertEqual(async_to_sync(layer.receive)(channel)["seq"], event.seq)
+        # une seule entrée de rejeu malgré la reprise
+        self.assertEqual([e["seq"] for e in replay.since(group, 0)], [event.seq])
+
+    def test_bail_expire_repris(self):
+        self.client.patch(self.url, {"status": "en_entretien"}, format="json")
+        # dispatcher arrêté en cours de lot : bail jamais rendu
+        OutboxEvent.objects.update(claimed_by="mort", claimed_until=timezone.now() + timedelta(seconds=60))
+        self.assertEqual(dispatch_batch(), (0, 0))
+        self.assertEqual(dispatch_batch(now=timezone.now() + timedelta(seconds=61)), (2, 0))
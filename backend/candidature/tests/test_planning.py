@@ -0,0 +1,147 @@
+# candidature/tests/test_planning.py
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+import pytest
+from candidature.models import Candidature
+from candidature.planning import IntervalTree, agendas, free_slots
+from mission.models import Mission
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+
+User = get_user_model()
+
+
+@pytest.mark.unit
+class IntervalTreeTest(SimpleTestCase):
+
+    def test_meme_resultat_que_le_parcours_complet(self):
+        rng = random.Random(7)
+        intervals = []
+        for i in range(300):
+            debut = rng.randint(0, 10_000)
+            intervals.append((debut, debut + rng.randint(1, 120), i))
+        tree = IntervalTree.build(intervals)
+
+        for _ in range(200):
+            debut = rng.randint(-100, 10_100)
+            fin = debut + rng.randint(1, 300)
+            attendu = sorted((i for i in intervals if i[0] < fin and i[1] > debut), key=lambda i: (i[0], i[1]))
+            self.assertEqual(sorted(tree.overlap(debut, fin), key=lambda i: (i[0], i[1])), attendu)
+
+    def test_creneaux_libres(self):
+        occupes = [(2, 4, "a"), (3, 6, "b"), (8, 9, "c")]
+        self.assertEqual(free_slots(occupes, 0, 10), [(0, 2), (6, 8), (9, 10)])
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class EntretienPlanningTest(APITestCase):
+
+    def setUp(self):
+        agendas.clear()
+        self.user_entreprise = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        self.entreprise = Entreprise.objects.create(user=self.user_entreprise, nom="Entreprise Test", secteur="IT")
+        self.freelance = Freelance.objects.create(
+            user=User.objects.create(email="freelance@gmail.com", role=User.ROLE_FREELANCE),
+            nom="Freelance", tarif="50.00",
+        )
+        self.autre_freelance = Freelance.objects.create(
+            user=User.objects.create(email="autre@gmail.com", role=User.ROLE_FREELANCE),
+            nom="Autre", tarif="50.00",
+        )
+        mission = Mission.objects.create(
+            titre="Mission", description="Desc", competence_requis="Python",
+            budget=100, entreprise=self.entreprise,
+        )
+        self.candidature = Candidature.objects.create(mission=mission, freelance=self.freelance)
+        self.autre = Candidature.objects.create(mission=mission, freelance=self.autre_freelance)
+
+        self.debut = datetime(2030, 3, 4, 9, 0, tzinfo=dt_timezone.utc)
+        self.candidature.date_entretien = self.debut
+        self.candidature.duree_entretien = 60
+        self.candidature.save()
+        self.client.force_authenticate(user=self.user_entreprise)
+
+    def _patch(self, candidature, **data):
+        url = reverse("candidatureupdate", kwargs={"pk": candidature.id_candidature})
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.patch(url, data, format="json")
+
+    def test_fin_calculee(self):
+        self.assertEqual(self.candidature.fin_entretien, self.debut + timedelta(hours=1))
+
+    def test_chevauchement_entreprise_refuse(self):
+        response = self._patch(self.autre, date_entretien=(self.debut + timedelta(minutes=30)).isoformat())
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("conflits", response.data)
+
+        # créneau adjacent : accepté (intervalles semi-ouverts)
+        response = self._patch(self.autre, date_entretien=(self.debut + timedelta(hours=1)).isoformat())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["duree_entretien"], 60)
+
+    def test_allonger_son_propre_entretien(self):
+        response = self._patch(self.candidature, duree_entretien=90)
+        self.assertEqual(response.status_code, 200)
+        self.candidature.refresh_from_db()
+        self.assertEqual(self.candidature.fin_entretien, self.debut + timedelta(minutes=90))
+
+    def test_agenda_dans_le_fuseau_demande(self):
+        url = reverse("agenda-freelance", kwargs={"pk": self.freelance.id_freelance})
+        params = {"debut": "2030-03-04T08:00:00", "fin": "2030-03-04T18:00:00", "tz": "Europe/Paris"}
+
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["occupe"], [
+            {"debut": "2030-03-04T10:00:00+01:00", "fin": "2030-03-04T11:00:00+01:00"},
+        ])
+        self.assertEqual(response.data["libre"][0], {
+            "debut": "2030-03-04T08:00:00+01:00", "fin": "2030-03-04T10:00:00+01:00",
+        })
+
+        # la modification invalide l'agenda en mémoire
+        self._patch(self.candidature, date_entretien="2030-03-04T13:00:00Z")
+        response = self.client.get(url, params)
+        self.assertEqual(response.data["occupe"][0]["debut"], "2030-03-04T14:00:00+01:00")
+
+    def test_agenda_parametres_invalides(self):
+        url = reverse("agenda-entreprise", kwargs={"pk": self.entreprise.id_entreprise})
+        self.assertEqual(self.client.get(url, {"tz": "Mars/Olympus"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"debut": "demain"}).status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_agenda_reserve_aux_contreparties(self):
+        inconnu = Freelance.objects.create(
+            user=User.objects.create(email="inconnu@gmail.com", role=User.ROLE_FREELANCE),
+            nom="Inconnu", tarif="50.00",
+        )
+        autre_entreprise = Entreprise.objects.create(
+            user=User.objects.create(email="autre-entreprise@gmail.com", role=User.ROLE_ENTREPRISE),
+            nom="Autre", secteur="IT",
+        )
+        agenda_freelance = reverse("agenda-freelance", kwargs={"pk": self.freelance.id_freelance})
+        agenda_entreprise = reverse("agenda-entreprise", kwargs={"pk": self.entreprise.id_entreprise})
+
+        # entreprise : ses candidats, pas les autres freelances ni les autres entreprises
+        self.assertEqual(self.client.get(agenda_freelance).status_code, 200)
+        url = reverse("agenda-freelance", kwargs={"pk": inconnu.id_freelance})
+        self.assertEqual(self.client.get(url).status_code, 403)
+        url = reverse("agenda-entreprise", kwargs={"pk": autre_entreprise.id_entreprise})
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        # freelance : le sien et l'entreprise à laquelle il a candidaté
+        self.client.force_authenticate(user=self.freelance.user)
+        self.assertEqual(self.client.get(agenda_freelance).status_code, 200)
+        self.assertEqual(self.client.get(agenda_entreprise).status_code, 200)
+        url = reverse("agenda-freelance", kwargs={"pk": self.autre_freelance.id_freelance})
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_authenticate(user=inconnu.user)
+        self.assertEqual(self.client.get(agenda_entreprise).status_code, 403)
@@ -0,0 +1,132 @@
+# candidature/tests/test_projection.py
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models.constants import OnConflict
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+import pytest
+from candidature.models import Candidature, CandidatureLecture
+from candidature.projection import check
+from mission.models import Mission
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+
+User = get_user_model()
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class ProjectionTest(APITestCase):
+
+    def setUp(self):
+        self.user_entreprise = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        self.entreprise = Entreprise.objects.create(user=self.user_entreprise, nom="Entreprise Test", secteur="IT")
+        self.user_freelance = User.objects.create(email="freelance@gmail.com", role=User.ROLE_FREELANCE)
+        self.freelance = Freelance.objects.create(
+            user=self.user_freelance, nom="Freelance", competence="Python Django", tarif="50.00")
+        self.mission = Mission.objects.create(
+            titre="Mission", description="Desc", competence_requis="Python",
+            budget=100, entreprise=self.entreprise,
+        )
+        self.candidature = Candidature.objects.create(mission=self.mission, freelance=self.freelance)
+
+    def _ligne(self):
+        return CandidatureLecture.objects.get(pk=self.candidature.id_candidature)
+
+    def test_upsert_sans_cible_de_conflit(self):
+        """MySQL : ON DUPLICATE KEY UPDATE, pas de unique_fields (sinon NotSupportedError)."""
+        suffix = connection.ops.on_conflict_suffix_sql
+
+        def on_duplicate_key(fields, on_conflict, update_fields, unique_fields):
+            if on_conflict != OnConflict.UPDATE:
+                return suffix(fields, on_conflict, update_fields, unique_fields)
+            # SQLite n'a pas d'upsert sans cible : on rejoue celui de MySQL sur la clé primaire
+            self.assertEqual(list(unique_fields), [])
+            columns = ", ".join(f"{connection.ops.quote_name(f)} = EXCLUDED.{connection.ops.quote_name(f)}"
+                                for f in update_fields)
+            return f"ON CONFLICT(id_candidature) DO UPDATE SET {columns}"
+
+        with patch.object(connection.features, "supports_update_conflicts_with_target", False), \
+                patch.object(connection.ops, "on_conflict_suffix_sql", side_effect=on_duplicate_key):
+            self.candidature.status = "en_entretien"
+            self.candidature.save()
+            autre = Freelance.objects.create(
+                user=User.objects.create(email="autre@gmail.com", role=User.ROLE_FREELANCE),
+                nom="Autre", competence="Python", tarif="40.00")
+            nouvelle = Candidature.objects.create(mission=self.mission, freelance=autre)
+
+        self.assertEqual(self._ligne().status, "en_entretien")
+        self.assertEqual(CandidatureLecture.objects.get(pk=nouvelle.pk).freelance_nom, "Autre")
+
+    def test_ecritures_propagees(self):
+        self.assertEqual(self._ligne().mission_titre, "Mission")
+
+        self.freelance.nom = "Nouveau nom"
+        self.freelance.save()
+        self.user_freelance.email = "nouveau@gmail.com"
+        self.user_freelance.save()
+        self.entreprise.nom = "Renommée"
+        self.entreprise.save()
+        self.mission.titre = "Mission renommée"
+        self.mission.save()
+
+        ligne = self._ligne()
+        self.assertEqual(
+            (ligne.freelance_nom, ligne.freelance_email, ligne.entreprise_nom, ligne.mission_titre),
+            ("Nouveau nom", "nouveau@gmail.com", "Renommée", "Mission renommée"),
+        )
+        self.assertEqual(check(), {"missing": [], "stale": [], "orphans": []})
+
+        # suppression en cascade du parent
+        self.mission.delete()
+        self.assertFalse(CandidatureLecture.objects.exists())
+
+    def test_endpoint_lit_la_projection(self):
+        self.client.force_authenticate(user=self.user_entreprise)
+        response = self.client.get(reverse("mes_candidatures"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]["mission"], self.mission.id_mission)
+        self.assertEqual(response.data[0]["freelance_email"], "freelance@gmail.com")
+        self.assertEqual(response.data[0]["freelance_tarif"], "50.00")
+        self.assertEqual(response.data[0]["entreprise_id"], self.entreprise.id_entreprise)
+
+    def test_bulk_create_projete(self):
+        autre = Freelance.objects.create(
+            user=User.objects.create(email="autre@gmail.com", role=User.ROLE_FREELANCE),
+            nom="Autre", competence="Python", tarif="40.00",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            mission = Mission.objects.create(
+                titre="Dev Python", description="API", competence_requis="Python",
+                budget=100, entreprise=self.entreprise,
+            )
+        recommandees = Candidature.objects.filter(mission=mission, status="recommandee")
+        self.assertIn(autre.id_freelance, recommandees.values_list("freelance_id", flat=True))
+        self.assertEqual(
+            CandidatureLecture.objects.filter(mission_id=mission.id_mission).count(), recommandees.count()
+        )
+
+    def test_verification_et_correction(self):
+        CandidatureLecture.objects.update(mission_titre="Périmé")
+        CandidatureLecture.objects.create(
+            **{**{f.attname: getattr(self._ligne(), f.attname) for f in CandidatureLecture._meta.fields},
+               "id_candidature": 999999}
+        )
+
+        report = check()
+        self.assertEqual(report["stale"], [self.candidature.id_candidature])
+        self.assertEqual(report["orphans"], [999999])
+        with self.assertRaises(CommandError):
+            call_command("projection_candidatures", stdout=StringIO())
+
+        call_command("projection_candidatures", "--fix", stdout=StringIO())
+        self.assertEqual(check(), {"missing": [], "stale": [], "orphans": []})
+        self.assertEqual(self._ligne().mission_titre, "Mission")
@@ -0,0 +1,85 @@
+# candidature/tests/test_query_budget.py
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+import pytest
+from candidature.models import Candidature
+from mission.models import Mission
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+
+User = get_user_model()
+
+# Nombre maximal de requêtes SQL par endpoint, indépendamment du nombre de
+# lignes renvoyées, profil déjà en cache (authentification/profils.py).
+# Un dépassement signale un N+1 réintroduit.
+QUERY_BUDGETS = {
+    "mes_candidatures": 2,  # exists() + liste
+    "notifications": 1,
+    "notifications-entreprise": 1,
+    "missions": 1,
+}
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class QueryBudgetTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user_entreprise = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        cls.entreprise = Entreprise.objects.create(user=user_entreprise, nom="Entreprise Test", secteur="IT")
+        cls.user_freelance = User.objects.create_user(
+            email="freelance@gmail.com", password="pass123", role=User.ROLE_FREELANCE)
+        cls.freelance = Freelance.objects.create(
+            user=cls.user_freelance, nom="Freelance", competence="Python", tarif="50.00")
+        cls.autres = [
+            Freelance.objects.create(
+                user=User.objects.create(email=f"f{i}@gmail.com", role=User.ROLE_FREELANCE),
+                nom=f"Freelance {i}", competence="Python", tarif="50.00",
+            )
+            for i in range(4)
+        ]
+
+    def _missions(self, total):
+        for i in range(total):
+            mission = Mission.objects.create(
+                titre=f"Mission {i}", description="Desc", competence_requis="Python",
+                budget=100, entreprise=self.entreprise,
+            )
+            for freelance in [self.freelance] + self.autres:
+                Candidature.objects.get_or_create(mission=mission, freelance=freelance)
+
+    def _count(self, name, user, path=None):
+        self.client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(path or reverse(name))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def _assert_budget(self, name, user, path=None):
+        self._count(name, user, path)  # premier appel : profil mis en cache
+        self._missions(1)
+        petit = self._count(name, user, path)
+        self._missions(4)
+        grand = self._count(name, user, path)
+        self.assertEqual(petit, grand, f"{name} : le nombre de requêtes dépend du nombre de lignes")
+        self.assertLessEqual(grand, QUERY_BUDGETS[name])
+
+    def test_budget_candidatures_mission(self):
+        self._assert_budget("mes_candidatures", self.entreprise.user)
+
+    def test_budget_notifications_freelance(self):
+        self._assert_budget("notifications", self.user_freelance)
+
+    def test_budget_notifications_entreprise(self):
+        self._assert_budget("notifications-entreprise", self.entreprise.user)
+
+    def test_budget_missions(self):
+        self._assert_budget("missions", self.user_freelance, "/msn/missions/")
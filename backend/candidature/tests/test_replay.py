@@ -0,0 +1,103 @@
+# candidature/tests/test_replay.py
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.test import SimpleTestCase, TestCase, override_settings
+import pytest
+from backend import replay
+from candidature.routing import websocket_urlpatterns
+
+
+@pytest.mark.unit
+@override_settings(WEBSOCKET_REPLAY=replay.MEMORY, WEBSOCKET_REPLAY_SIZE=3)
+class MemoryLogTest(SimpleTestCase):
+
+    def test_journal_borne(self):
+        for i in range(5):
+            self.assertEqual(replay.stamp("freelance_1", {"type": "t", "i": i})["seq"], i + 1)
+
+        self.assertEqual([e["seq"] for e in replay.since("freelance_1", 2)], [3, 4, 5])
+        self.assertEqual(replay.since("freelance_1", 5), [])
+        self.assertIsNone(replay.since("freelance_1", 1))   # sorti du journal
+        self.assertIsNone(replay.since("freelance_1", 9))   # journal perdu
+        self.assertEqual(replay.since("freelance_2", 0), [])
+
+
+def _entretien(i):
+    return {"type": "new_entretien", "message": {"id_candidature": i, "status": "entretien"}}
+
+
+async def _reprise(last_seq, publies_avant, publies_apres, attendues):
+    layer = get_channel_layer()
+    for i in publies_avant:  # personne n'écoute : seul le journal les garde
+        await layer.group_send("freelance_1", await replay.astamp("freelance_1", _entretien(i)))
+
+    communicator = WebsocketCommunicator(
+        URLRouter(websocket_urlpatterns), f"/ws/entretien/freelance/1/?last_seq={last_seq}"
+    )
+    connected, _ = await communicator.connect()
+    assert connected
+    for i in publies_apres:
+        await layer.group_send("freelance_1", await replay.astamp("freelance_1", _entretien(i)))
+    frames = [await communicator.receive_json_from(timeout=5) for _ in range(attendues)]
+    assert await communicator.receive_nothing()
+    await communicator.disconnect()
+    return frames
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    WEBSOCKET_REPLAY=replay.MEMORY,
+    WEBSOCKET_REPLAY_SIZE=10,
+)
+class ResumableConsumerTest(TestCase):
+
+    def setUp(self):
+        replay.log().clear()
+
+    def test_rejoue_seulement_l_ecart(self):
+        frames = async_to_sync(_reprise)(1, [10, 11, 12], [13], 3)
+        self.assertEqual([(f["seq"], f["id_candidature"]) for f in frames], [(2, 11), (3, 12), (4, 13)])
+
+    def test_doublon_du_rejeu_ecarte(self):
+        async def scenario():
+            layer = get_channel_layer()
+            # journalisé avant la connexion, diffusé après : rejoué puis reçu en direct
+            retarde = await replay.astamp("freelance_1", _entretien(20))
+            communicator = WebsocketCommunicator(
+                URLRouter(websocket_urlpatterns), "/ws/entretien/freelance/1/?last_seq=0")
+            connected, _ = await communicator.connect()
+            assert connected
+            await layer.group_send("freelance_1", retarde)
+            frames = [await communicator.receive_json_from(timeout=5)]
+            assert await communicator.receive_nothing()
+            await communicator.disconnect()
+            return frames
+
+        frames = async_to_sync(scenario)()
+        self.assertEqual([(f["seq"], f["id_candidature"]) for f in frames], [(1, 20)])
+
+    def test_direct_dans_le_desordre(self):
+        async def scenario():
+            layer = get_channel_layer()
+            communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/ws/entretien/freelance/1/")
+            connected, _ = await communicator.connect()
+            assert connected
+            # deux processus : seq attribués dans un ordre, group_send dans l'autre
+            premier = await replay.astamp("freelance_1", _entretien(30))
+            second = await replay.astamp("freelance_1", _entretien(31))
+            await layer.group_send("freelance_1", second)
+            await layer.group_send("freelance_1", premier)
+            frames = [await communicator.receive_json_from(timeout=5) for _ in range(2)]
+            assert await communicator.receive_nothing()
+            await communicator.disconnect()
+            return frames
+
+        frames = async_to_sync(scenario)()
+        self.assertEqual([(f["seq"], f["id_candidature"]) for f in frames], [(2, 31), (1, 30)])
+
+    def test_ecart_trop_ancien_resync(self):
+        frames = async_to_sync(_reprise)(0, range(12), [], 1)
+        self.assertEqual(frames, [{"action": "resync"}])
@@ -0,0 +1,105 @@
+# candidature/tests/test_send_queue.py
+import asyncio
+import json
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.test import TestCase, override_settings
+import pytest
+from backend import replay
+from backend.websocket import CLOSE_RESYNC, SEND_QUEUE_DEPTH
+from candidature.routing import websocket_urlpatterns
+
+
+def _profondeur():
+    return SEND_QUEUE_DEPTH.labels("NotificationEntretienConsumer")._value.get()
+
+
+async def _client_lent(ids, attendues, query="?ack=1"):
+    """
+    Vrai chemin d'envoi (send → socket) : le client ne lit ni n'acquitte
+    rien pendant que les événements `ids` arrivent, puis lit chaque trame
+    et l'acquitte, ce qui libère la suivante.
+    """
+    communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/ws/entretien/freelance/1/{query}")
+    connected, _ = await communicator.connect()
+    assert connected
+    layer = get_channel_layer()
+    for i, id_candidature in enumerate(ids):
+        await layer.group_send("freelance_1", await replay.astamp("freelance_1", {
+            "type": "new_entretien",
+            "message": {"id_candidature": id_candidature, "status": f"v{i}"},
+        }))
+        await asyncio.sleep(0.01)
+    profondeur = _profondeur()
+
+    frames = []
+    for _ in range(attendues):
+        frame = await communicator.receive_output(timeout=5)
+        frames.append(frame)
+        if frame["type"] == "websocket.send":
+            await communicator.send_json_to({"action": "ack", "seq": json.loads(frame["text"]).get("seq")})
+    assert await communicator.receive_nothing()
+    await communicator.disconnect()
+    return profondeur, frames
+
+
+def _contenus(frames):
+    return [(json.loads(f["text"])["id_candidature"], json.loads(f["text"])["status"]) for f in frames]
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    WEBSOCKET_REPLAY=replay.MEMORY,
+    WEBSOCKET_SEND_WINDOW=1,
+    WEBSOCKET_SEND_QUEUE=2,
+)
+class BoundedSendQueueTest(TestCase):
+
+    def setUp(self):
+        replay.log().clear()
+
+    def test_coalesce_par_candidature(self):
+        # 1 part sans acquittement, 2 et 3 attendent, le nouvel état de 2 remplace l'ancien
+        profondeur, frames = async_to_sync(_client_lent)([1, 2, 3, 2], 3)
+        self.assertEqual(profondeur, 3)  # 1 non acquittée + 2 en file
+        self.assertEqual(_contenus(frames), [(1, "v0"), (2, "v3"), (3, "v2")])
+        self.assertEqual(_profondeur(), 0)
+
+    def test_coalesce_impossible_resync(self):
+        # file abandonnée : le client rechargera tout
+        _, frames = async_to_sync(_client_lent)([1, 2, 3, 4], 3)
+        self.assertEqual(_contenus(frames[:1]), [(1, "v0")])
+        self.assertEqual(json.loads(frames[1]["text"]), {"action": "resync"})
+        self.assertEqual(frames[2], {"type": "websocket.close", "code": CLOSE_RESYNC})
+        self.assertEqual(_profondeur(), 0)
+
+    @override_settings(WEBSOCKET_OVERFLOW={"NotificationEntretienConsumer": "drop_oldest"})
+    def test_drop_oldest(self):
+        _, frames = async_to_sync(_client_lent)([1, 2, 3, 4], 3)
+        self.assertEqual(_contenus(frames), [(1, "v0"), (3, "v2"), (4, "v3")])
+
+    def test_sans_ack_tout_part(self):
+        # client sans ?ack=1 : aucune fenêtre, rien n'est retenu côté serveur
+        profondeur, frames = async_to_sync(_client_lent)([1, 2, 3, 4], 4, query="")
+        self.assertEqual(profondeur, 0)
+        self.assertEqual(_contenus(frames), [(1, "v0"), (2, "v1"), (3, "v2"), (4, "v3")])
+
+
+@pytest.mark.unit
+def test_ack_dans_l_ordre_d_envoi():
+    from collections import deque
+    from backend.websocket import BoundedSendMixin
+
+    consumer = BoundedSendMixin()
+    consumer._in_flight = deque([4, 3, 7, 7, 7, 8])  # 3 publié avant 4, reçu après ; lot de 3 trames en 7
+    consumer._wakeup = asyncio.Event()
+    assert consumer.acknowledge({"action": "ack", "seq": 3})
+    assert list(consumer._in_flight) == [7, 7, 7, 8]
+    consumer.acknowledge({"action": "ack", "seq": 7})
+    assert list(consumer._in_flight) == [8]
+    consumer.acknowledge({"action": "ack", "seq": 99})  # inconnu : ignoré
+    assert list(consumer._in_flight) == [8]
+    assert not consumer.acknowledge({"action": "get_missions"})
@@ -0,0 +1,83 @@
+# candidature/tests/test_shortlist.py
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+import pytest
+from backend.pagination import ShortlistPagination
+from candidature.models import Candidature, CandidatureLecture
+from mission.models import Mission
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+
+User = get_user_model()
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class ShortlistTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_entreprise = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        entreprise = Entreprise.objects.create(user=cls.user_entreprise, nom="Entreprise Test", secteur="IT")
+        cls.mission = Mission.objects.create(
+            titre="Mission", description="Desc", competence_requis="Rust",
+            budget=100, entreprise=entreprise,
+        )
+        # scores avec égalités : l'ordre doit rester stable (id décroissant)
+        cls.scores = [40.0, 90.0, 65.0, 90.0, 10.0, 65.0, 90.0]
+        for i, score in enumerate(cls.scores):
+            freelance = Freelance.objects.create(
+                user=User.objects.create(email=f"f{i}@gmail.com", role=User.ROLE_FREELANCE),
+                nom=f"Freelance {i}", tarif="50.00",
+            )
+            Candidature.objects.create(
+                mission=cls.mission, freelance=freelance, score=score,
+                status="en_entretien" if i % 2 else "en_attente",
+            )
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user_entreprise)
+        self.url = reverse("shortlist-mission", kwargs={"pk": self.mission.id_mission})
+
+    def _attendu(self, statut=None):
+        rows = CandidatureLecture.objects.filter(mission_id=self.mission.id_mission)
+        if statut:
+            rows = rows.filter(status=statut)
+        return [c.id_candidature for c in sorted(rows, key=lambda c: (-c.score, -c.id_candidature))]
+
+    def test_top_k_puis_suivants(self):
+        response = self.client.get(self.url, {"k": 3})
+        self.assertEqual(response.status_code, 200)
+        premiers = [c["id_candidature"] for c in response.data["results"]]
+        self.assertEqual([c["score"] for c in response.data["results"]], [90.0, 90.0, 90.0])
+
+        suite = self.client.get(response.data["next"])
+        suivants = [c["id_candidature"] for c in suite.data["results"]]
+        self.assertEqual(premiers + suivants, self._attendu()[:6])
+
+    def test_filtre_statut(self):
+        response = self.client.get(self.url, {"k": 10, "status": "en_entretien"})
+        self.assertEqual([c["id_candidature"] for c in response.data["results"]], self._attendu("en_entretien"))
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(self.client.get(self.url, {"status": "inconnu"}).status_code, 400)
+
+    def test_mission_d_une_autre_entreprise(self):
+        autre = User.objects.create_user(email="autre@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        Entreprise.objects.create(user=autre, nom="Autre", secteur="IT")
+        self.client.force_authenticate(user=autre)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    @pytest.mark.skipif(connection.vendor != "sqlite", reason="plan SQLite")
+    def test_lecture_par_index(self):
+        queryset = ShortlistPagination().order_queryset(
+            CandidatureLecture.objects.filter(mission_id=self.mission.id_mission, status="en_attente")
+        )
+        plan = queryset[:20].explain()
+        self.assertIn("lecture_shortlist_status_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
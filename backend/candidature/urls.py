@@ -1,9 +1,12 @@
 from django.urls import path
-from .views import candidatures_mission , update_candidature , get_notifications_for_freelance, get_notifications_for_entreprise
+from .views import candidatures_mission , update_candidature , get_notifications_for_freelance, get_notifications_for_entreprise, agenda, shortlist_mission
 
 urlpatterns = [
     path("candidatures/", candidatures_mission, name="mes_candidatures"),
     path("candidatures/<int:pk>/", update_candidature, name="candidatureupdate"),
     path("note/" , get_notifications_for_freelance , name="notifications" ),
     path("notee/" , get_notifications_for_entreprise , name="notifications-entreprise" ),
+    path("missions/<int:pk>/shortlist/", shortlist_mission, name="shortlist-mission"),
+    path("agenda/freelance/<int:pk>/", agenda, {"kind": "freelance"}, name="agenda-freelance"),
+    path("agenda/entreprise/<int:pk>/", agenda, {"kind": "entreprise"}, name="agenda-entreprise"),
 ]
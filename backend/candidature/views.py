@@ -3,10 +3,32 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Candidature
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import Candidature, CandidatureLecture
 from .serializers import CandidatureSerializer , UpdateCandidatureSerializer , notification
 from entreprise.models import Entreprise
 from freelance.models import Freelance
+from authentification.profils import entreprise_of, freelance_of
+from mission.models import Mission
+from backend.pagination import CandidaturePagination, EntretienPagination, ShortlistPagination
+from . import planning
+
+AGENDA_DEFAULT_DAYS = 7
+AGENDA_MAX_DAYS = 31
+
+
+def _paginated(request, queryset, paginator, serializer_class):
+    """
+    Applique la pagination keyset si le client la demande (?cursor= / ?page_size=).
+    Retourne None pour conserver la réponse liste historique.
+    """
+    page = paginator.paginate_queryset(serializer_class.setup_queryset(queryset), request)
+    if page is None:
+        return None
+    return paginator.get_paginated_response(serializer_class(page, many=True).data)
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
@@ -14,13 +36,18 @@ def candidatures_mission(request):
     """
     Liste toutes les candidatures liées aux missions de l'entreprise connectée.
     """
-    user = request.user
-    entreprise = Entreprise.objects.filter(user=user).first()
+    entreprise = entreprise_of(request)
 
     if not entreprise:
         return Response({"detail": "Vous devez être connecté en tant qu’entreprise."}, status=403)
 
-    candidatures = Candidature.objects.filter(mission__entreprise=entreprise).order_by("-date")
+    candidatures = CandidatureLecture.objects.filter(
+        entreprise_id=entreprise.id_entreprise
+    ).order_by("-date", "-id_candidature")
+
+    response = _paginated(request, candidatures, CandidaturePagination(), CandidatureSerializer)
+    if response is not None:
+        return response
 
     if not candidatures.exists():
         return Response({"detail": "Aucune candidature trouvée."}, status=200)
@@ -36,23 +63,25 @@ def update_candidature(request, pk):
     """
     Permet à une entreprise de modifier le statut ou la date d’entretien d’une candidature.
     """
-    user = request.user
-    entreprise = Entreprise.objects.filter(user=user).first()
-    print(user)
-    print(entreprise)
+    entreprise = entreprise_of(request)
 
     if not entreprise:
         return Response({"detail": "Vous devez être connecté en tant qu’entreprise."}, status=403)
 
     try:
-        candidature = Candidature.objects.get(pk=pk, mission__entreprise=entreprise)
+        candidature = Candidature.objects.select_related("mission__entreprise", "freelance").get(
+            pk=pk, mission__entreprise=entreprise
+        )
     except Candidature.DoesNotExist:
         return Response({"detail": "Candidature introuvable ou non autorisée."}, status=404)
 
-    serializer = UpdateCandidatureSerializer(candidature, data=request.data, partial=True)
-    if serializer.is_valid():
-        serializer.save()
-        return Response(serializer.data, status=200)
+    # Validation (contrôle des chevauchements, sous verrou) et sauvegarde dans
+    # la même transaction, avec la notification (outbox)
+    with transaction.atomic():
+        serializer = UpdateCandidatureSerializer(candidature, data=request.data, partial=True)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=200)
     return Response(serializer.errors, status=400)
 
 @api_view(["GET"])
@@ -61,13 +90,19 @@ def get_notifications_for_freelance(request):
     """
     Récupère toutes les candidatures liées au freelance connecté.
     """
-    user = request.user
-    freelance = Freelance.objects.filter(user=user).first()
+    freelance = freelance_of(request)
 
     if not freelance:
         return Response({"detail": "Vous devez être connecté en tant que freelance."}, status=403)
 
-    candidatures = Candidature.objects.filter(freelance=freelance).order_by("-date_entretien")
+    candidatures = CandidatureLecture.objects.filter(
+        freelance_id=freelance.id_freelance
+    ).order_by("-date_entretien", "-id_candidature")
+
+    response = _paginated(request, candidatures, EntretienPagination(), notification)
+    if response is not None:
+        return response
+
     serializer = notification(candidatures, many=True)
 
     return Response(serializer.data, status=200)
@@ -78,8 +113,7 @@ def get_notifications_for_entreprise(request):
     """
     Récupère toutes les candidatures liées à l'entreprise connectée.
     """
-    user = request.user
-    entreprise = Entreprise.objects.filter(user=user).first()
+    entreprise = entreprise_of(request)
 
     if not entreprise:
         return Response(
@@ -87,9 +121,105 @@ def get_notifications_for_entreprise(request):
         )
 
     candidatures = (
-        Candidature.objects.filter(mission__entreprise=entreprise)
-        .order_by("-date_entretien")
+        CandidatureLecture.objects.filter(entreprise_id=entreprise.id_entreprise)
+        .order_by("-date_entretien", "-id_candidature")
     )
 
+    response = _paginated(request, candidatures, EntretienPagination(), notification)
+    if response is not None:
+        return response
+
     serializer = notification(candidatures, many=True)
-    return Response(serializer.data, status=200)
\ No newline at end of file
+    return Response(serializer.data, status=200)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def shortlist_mission(request, pk):
+    """
+    Meilleures candidatures d'une mission de l'entreprise connectée, par score
+    décroissant (égalités départagées par id). ?k= taille de la page (20 par
+    défaut), ?status= filtre optionnel, ?cursor= pour les k suivants.
+    """
+    entreprise = entreprise_of(request)
+    if not entreprise:
+        return Response({"detail": "Vous devez être connecté en tant qu’entreprise."}, status=403)
+
+    if not Mission.objects.filter(pk=pk, entreprise=entreprise).exists():
+        return Response({"detail": "Mission introuvable ou non autorisée."}, status=404)
+
+    candidatures = CandidatureLecture.objects.filter(mission_id=pk)
+    statut = request.query_params.get("status")
+    if statut:
+        if statut not in dict(Candidature.STATUS_CHOICES):
+            return Response({"detail": "Statut inconnu."}, status=400)
+        candidatures = candidatures.filter(status=statut)
+
+    return _paginated(request, candidatures, ShortlistPagination(), CandidatureSerializer)
+
+
+def _agenda_visible(request, kind, pk):
+    """
+    Un agenda n'est lisible que par son titulaire ou par une contrepartie :
+    l'entreprise à laquelle le freelance a candidaté, le freelance qui a
+    candidaté à une mission de l'entreprise.
+    """
+    entreprise = entreprise_of(request)
+    freelance = freelance_of(request)
+    if kind == planning.FREELANCE:
+        if freelance is not None:
+            return freelance.id_freelance == pk
+        return entreprise is not None and CandidatureLecture.objects.filter(
+            entreprise_id=entreprise.id_entreprise, freelance_id=pk
+        ).exists()
+    if entreprise is not None:
+        return entreprise.id_entreprise == pk
+    return freelance is not None and CandidatureLecture.objects.filter(
+        freelance_id=freelance.id_freelance, entreprise_id=pk
+    ).exists()
+
+
+def _parse_moment(value, zone):
+    moment = parse_datetime(value)
+    if moment is not None and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, zone)
+    return moment
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def agenda(request, kind, pk):
+    """
+    Disponibilités d'un freelance ou d'une entreprise : créneaux occupés et
+    libres entre ?debut= et ?fin= (ISO 8601, 7 jours par défaut), exprimés
+    dans le fuseau ?tz= (UTC par défaut). Les dates sans fuseau sont lues dans ?tz=.
+    Réservé au titulaire de l'agenda et à ses contreparties (_agenda_visible).
+    """
+    if not _agenda_visible(request, kind, pk):
+        return Response({"detail": "Agenda introuvable ou non autorisé."}, status=403)
+
+    tz = request.query_params.get("tz", "UTC")
+    zone = planning.get_zone(tz)
+    if zone is None:
+        return Response({"detail": "Fuseau horaire inconnu."}, status=400)
+
+    debut = _parse_moment(request.query_params["debut"], zone) if "debut" in request.query_params else timezone.now()
+    fin = _parse_moment(request.query_params["fin"], zone) if "fin" in request.query_params else None
+    if debut is None or ("fin" in request.query_params and fin is None):
+        return Response({"detail": "Dates invalides (format ISO 8601 attendu)."}, status=400)
+    fin = fin or debut + timedelta(days=AGENDA_DEFAULT_DAYS)
+    if fin <= debut or fin - debut > timedelta(days=AGENDA_MAX_DAYS):
+        return Response({"detail": f"Plage invalide (au plus {AGENDA_MAX_DAYS} jours)."}, status=400)
+
+    occupes = planning.busy(kind, pk, debut, fin)
+
+    def local(moment):
+        return moment.astimezone(zone).isoformat()
+
+    return Response({
+        "timezone": tz,
+        "debut": local(debut),
+        "fin": local(fin),
+        "occupe": [{"debut": local(start), "fin": local(end)} for start, end, _ in occupes],
+        "libre": [{"debut": local(start), "fin": local(end)} for start, end in planning.free_slots(occupes, debut, fin)],
+    }, status=200)
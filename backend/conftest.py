@@ -0,0 +1,24 @@
+# conftest.py
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def _cache_vide():
+    """
+    Le cache (profils, révocation des jetons) survit au rollback de la base
+    entre deux tests : les ids réutilisés ne doivent pas retrouver d'anciennes entrées.
+    """
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _journal_vide():
+    """Journal de rejeu en mémoire (backend/replay.py) : numéros repartis de zéro à chaque test."""
+    from backend import replay
+    journal = replay.log()
+    if isinstance(journal, replay.MemoryLog):
+        journal.clear()
+    yield
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import Courrier
+
+
+@admin.register(Courrier)
+class CourrierAdmin(admin.ModelAdmin):
+    list_display = ("id", "sujet", "created", "attempts", "sent_at", "abandoned", "next_attempt_at")
+    list_filter = ("abandoned", "sent_at")
+    search_fields = ("sujet", "destinataires")
+    ordering = ("-id",)
@@ -0,0 +1,151 @@
+# courrier/envoi.py
+"""
+File d'envoi des e-mails.
+
+- enqueue() : appelé par les vues à la place de send_mail. Une simple ligne
+  Courrier, écrite dans la transaction de la requête : la réponse n'attend
+  plus le serveur SMTP, et un incident SMTP ne devient plus une erreur 500.
+  enqueue_many() fait de même par lots pour les imports en masse.
+- send_batch() : exécuté par le worker (manage.py send_courriers) avec une
+  connexion SMTP ouverte une fois et réutilisée pour tout le lot (pas de
+  poignée de main TLS + AUTH par message). Reprise exponentielle sur erreur
+  temporaire, abandon sur refus définitif (codes 5xx) ou après
+  COURRIER_MAX_ATTEMPTS tentatives.
+  Un worker tourne dans chaque pod : chaque lot est d'abord réservé (bail de
+  COURRIER_LEASE secondes, comme l'outbox des candidatures), un courrier
+  n'est donc jamais envoyé par deux workers à la fois.
+"""
+import smtplib
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Courrier
+
+BACKOFF_BASE = 30     # secondes
+BACKOFF_MAX = 3600    # secondes
+
+
+def build(sujet, corps, destinataires, expediteur=None):
+    """Courrier non enregistré, pour enqueue_many()."""
+    return Courrier(
+        sujet=sujet,
+        corps=corps,
+        expediteur=expediteur or settings.DEFAULT_FROM_EMAIL,
+        destinataires=list(destinataires),
+    )
+
+
+def enqueue(sujet, corps, destinataires, expediteur=None):
+    courrier = build(sujet, corps, destinataires, expediteur)
+    courrier.save()
+    return courrier
+
+
+def enqueue_many(courriers, batch_size=500):
+    """Met en file plusieurs courriers en INSERT groupés (import en masse)."""
+    return Courrier.objects.bulk_create(courriers, batch_size=batch_size)
+
+
+def _backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1)))
+
+
+def _is_permanent(exc):
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+
+def _is_connection_error(exc):
+    # Les erreurs smtplib héritent d'OSError : seules la déconnexion et les
+    # erreurs réseau brutes invalident la connexion
+    return isinstance(exc, smtplib.SMTPServerDisconnected) or (
+        isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+    )
+
+
+def _claim(batch_size, now):
+    """
+    Prend un bail sur un lot de courriers dus et libres (UPDATE conditionnel,
+    voir candidature/outbox.py). Un bail expiré (worker arrêté en cours de
+    lot) est repris.
+    """
+    token = uuid.uuid4().hex
+    free = Q(claimed_until__isnull=True) | Q(claimed_until__lte=now)
+    pending = Q(sent_at__isnull=True, abandoned=False)
+    ids = list(
+        Courrier.objects.filter(free, pending, next_attempt_at__lte=now)
+        .order_by("id").values_list("id", flat=True)[:batch_size]
+    )
+    if not ids:
+        return token, []
+    lease = timedelta(seconds=getattr(settings, "COURRIER_LEASE", 600))
+    Courrier.objects.filter(free, pending, id__in=ids).update(claimed_by=token, claimed_until=now + lease)
+    return token, list(Courrier.objects.filter(pending, claimed_by=token).order_by("id"))
+
+
+def send_batch(connection, batch_size=None, now=None):
+    """
+    Envoie un lot de courriers dus par la connexion donnée (ouverte au besoin,
+    laissée ouverte pour le lot suivant). Retourne (envoyés, en_échec).
+
+    Si la connexion tombe en cours de lot, elle est fermée et le reste du lot
+    attend le passage suivant (sans compter de tentative pour ces messages).
+    """
+    batch_size = batch_size or getattr(settings, "COURRIER_BATCH_SIZE", 50)
+    max_attempts = getattr(settings, "COURRIER_MAX_ATTEMPTS", 8)
+    now = now or timezone.now()
+
+    token, courriers = _claim(batch_size, now)
+    if not courriers:
+        return 0, 0
+
+    try:
+        return _send(connection, courriers, max_attempts, now)
+    finally:
+        # Bail rendu pour ce qui n'est pas parti : repris au prochain passage
+        Courrier.objects.filter(claimed_by=token, sent_at__isnull=True).update(claimed_by="", claimed_until=None)
+
+
+def _send(connection, courriers, max_attempts, now):
+    # Erreur d'ouverture (serveur injoignable, authentification) : propagée,
+    # le worker la journalise et réessaie au passage suivant
+    connection.open()
+    sent, failed = [], []
+    for courrier in courriers:
+        message = EmailMessage(
+            courrier.sujet, courrier.corps, courrier.expediteur, courrier.destinataires,
+            connection=connection,
+        )
+        try:
+            connection.send_messages([message])
+        except Exception as exc:
+            courrier.attempts += 1
+            courrier.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+            if _is_permanent(exc) or courrier.attempts >= max_attempts:
+                courrier.abandoned = True
+            else:
+                courrier.next_attempt_at = now + _backoff(courrier.attempts)
+            failed.append(courrier)
+            if _is_connection_error(exc):
+                connection.close()
+                break
+        else:
+            courrier.sent_at = timezone.now()
+            sent.append(courrier)
+
+    if sent:
+        Courrier.objects.bulk_update(sent, ["sent_at"])
+    if failed:
+        Courrier.objects.bulk_update(failed, ["attempts", "next_attempt_at", "last_error", "abandoned"])
+    return len(sent), len(failed)
+
+
+def purge_sent(older_than):
+    deleted, _ = Courrier.objects.filter(sent_at__lt=timezone.now() - older_than).delete()
+    return deleted
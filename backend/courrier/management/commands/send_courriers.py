@@ -0,0 +1,51 @@
+import time
+from datetime import timedelta
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from courrier.envoi import purge_sent, send_batch
+
+
+class Command(BaseCommand):
+    help = "Envoie la file d'e-mails (Courrier) par une connexion SMTP réutilisée."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--interval", type=float, default=2.0,
+                            help="Attente (secondes) quand la file est vide")
+        parser.add_argument("--once", action="store_true", help="Un seul passage puis arrêt")
+        parser.add_argument("--purge-days", type=int, default=30,
+                            help="Supprime les courriers envoyés depuis plus de N jours")
+
+    def handle(self, *args, **options):
+        self.stdout.write("✉️ Worker courrier démarré.")
+        batch_size = options["batch_size"]
+        # Une seule connexion pour tout le processus : ouverte au premier
+        # courrier, fermée dès que la file est vide (les serveurs SMTP
+        # coupent les connexions inactives)
+        connection = get_connection(fail_silently=False)
+        last_purge = 0.0
+        try:
+            while True:
+                try:
+                    sent, failed = send_batch(connection, batch_size=batch_size)
+                except Exception as exc:
+                    self.stderr.write(f"🚫 Connexion SMTP impossible : {exc}")
+                    connection.close()
+                    sent = failed = 0
+                if sent or failed:
+                    self.stdout.write(f"✅ {sent} envoyés, 🚫 {failed} en échec")
+
+                if time.monotonic() - last_purge > 3600:
+                    purge_sent(timedelta(days=options["purge_days"]))
+                    last_purge = time.monotonic()
+
+                if options["once"]:
+                    return
+                # File vide (ou serveur injoignable) → connexion fermée, on attend un peu
+                if not (sent or failed):
+                    connection.close()
+                    time.sleep(options["interval"])
+        finally:
+            connection.close()
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:38
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Courrier',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('sujet', models.CharField(max_length=255)),
+                ('corps', models.TextField()),
+                ('expediteur', models.CharField(max_length=255)),
+                ('destinataires', models.JSONField()),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('abandoned', models.BooleanField(default=False)),
+                ('last_error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sent_at', 'abandoned', 'next_attempt_at'], name='courrier_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courrier', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courrier',
+            name='claimed_by',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='courrier',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
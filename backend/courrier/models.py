@@ -0,0 +1,34 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Courrier(models.Model):
+    """
+    File d'attente persistante des e-mails sortants. Les vues enregistrent le
+    message (dans leur transaction) ; le worker (manage.py send_courriers)
+    l'envoie ensuite par une connexion SMTP réutilisée.
+    """
+    id = models.BigAutoField(primary_key=True)
+    sujet = models.CharField(max_length=255)
+    corps = models.TextField()
+    expediteur = models.CharField(max_length=255)
+    destinataires = models.JSONField()
+
+    created = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # Échec définitif (adresse refusée, trop de tentatives) : plus de reprise
+    abandoned = models.BooleanField(default=False)
+    last_error = models.TextField(blank=True, default="")
+    # Bail du worker qui envoie le courrier (plusieurs pods, un worker chacun)
+    claimed_by = models.CharField(max_length=32, blank=True, default="")
+    claimed_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["sent_at", "abandoned", "next_attempt_at"], name="courrier_pending_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.sujet} → {', '.join(self.destinataires)}"
@@ -0,0 +1,95 @@
+# courrier/tests/test_envoi.py
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.core.mail import get_connection
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+import pytest
+from courrier.envoi import enqueue, send_batch
+from courrier.models import Courrier
+from courrier.testing import LocalSMTPServer
+
+
+@pytest.mark.unit
+class EnvoiCourrierTest(TestCase):
+
+    def test_lot_par_une_seule_connexion(self):
+        for i in range(5):
+            enqueue(f"Sujet {i}", "Bonjour", [f"user{i}@example.com"], expediteur="support@example.com")
+
+        with LocalSMTPServer() as smtp, override_settings(**smtp.settings()):
+            connection = get_connection()
+            self.assertEqual(send_batch(connection), (5, 0))
+            connection.close()
+
+        self.assertEqual(smtp.connections, 1)
+        self.assertEqual([m[1] for m in smtp.messages], [[f"user{i}@example.com"] for i in range(5)])
+        self.assertIn(b"Subject: Sujet 0", smtp.messages[0][2])
+        self.assertFalse(Courrier.objects.filter(sent_at__isnull=True).exists())
+
+    def test_refus_temporaire_puis_definitif(self):
+        temporaire = enqueue("Sujet", "Bonjour", ["plein@example.com"])
+        definitif = enqueue("Sujet", "Bonjour", ["inconnu@example.com"])
+        ok = enqueue("Sujet", "Bonjour", ["ok@example.com"])
+
+        refuse = {"plein@example.com": 452, "inconnu@example.com": 550}
+        with LocalSMTPServer(refuse=refuse) as smtp, override_settings(**smtp.settings()):
+            connection = get_connection()
+            self.assertEqual(send_batch(connection), (1, 2))
+            connection.close()
+
+        temporaire.refresh_from_db()
+        definitif.refresh_from_db()
+        ok.refresh_from_db()
+        self.assertIsNotNone(ok.sent_at)
+        self.assertEqual((temporaire.attempts, temporaire.abandoned), (1, False))
+        self.assertGreater(temporaire.next_attempt_at, temporaire.created)
+        self.assertEqual((definitif.attempts, definitif.abandoned), (1, True))
+
+        # plus rien de dû avant l'échéance de reprise
+        self.assertEqual(send_batch(get_connection()), (0, 0))
+
+    def test_deux_workers_concurrents(self):
+        for i in range(4):
+            enqueue(f"Sujet {i}", "Bonjour", [f"user{i}@example.com"])
+
+        with LocalSMTPServer() as smtp, override_settings(**smtp.settings()):
+            connection = get_connection()
+            send_messages = connection.send_messages
+            concurrent = []
+
+            def envoi(messages):
+                if not concurrent:
+                    # Second worker (autre pod) pendant l'envoi du premier lot
+                    autre = get_connection()
+                    concurrent.append(send_batch(autre, batch_size=2))
+                    autre.close()
+                return send_messages(messages)
+
+            with patch.object(connection, "send_messages", side_effect=envoi):
+                self.assertEqual(send_batch(connection, batch_size=2), (2, 0))
+            connection.close()
+
+        self.assertEqual(concurrent, [(2, 0)])  # il a pris les deux suivants
+        destinataires = sorted(m[1][0] for m in smtp.messages)
+        self.assertEqual(destinataires, [f"user{i}@example.com" for i in range(4)])  # une fois chacun
+        self.assertFalse(Courrier.objects.filter(sent_at__isnull=True).exists())
+
+    def test_bail_expire_repris(self):
+        enqueue("Sujet", "Bonjour", ["user@example.com"])
+        # worker arrêté en cours de lot : bail jamais rendu
+        Courrier.objects.update(claimed_by="mort", claimed_until=timezone.now() + timedelta(seconds=600))
+        with LocalSMTPServer() as smtp, override_settings(**smtp.settings()):
+            self.assertEqual(send_batch(get_connection()), (0, 0))
+            connection = get_connection()
+            self.assertEqual(send_batch(connection, now=timezone.now() + timedelta(seconds=601)), (1, 0))
+            connection.close()
+        self.assertEqual(len(smtp.messages), 1)
+
+    def test_commande_un_passage(self):
+        enqueue("Sujet", "Bonjour", ["user@example.com"])
+        with LocalSMTPServer() as smtp, override_settings(**smtp.settings()):
+            call_command("send_courriers", "--once", stdout=StringIO())
+        self.assertEqual(len(smtp.messages), 1)
@@ -1,5 +1,6 @@
 from django.utils.html import format_html
 from django.contrib import admin
+from backend.images import current
 from .models import Entreprise
 from django.utils.html import format_html  # si tu veux afficher les images
 
@@ -12,6 +13,9 @@ class EntrepriseAdmin(admin.ModelAdmin):
 
     def profile_thumbnail(self, obj):
         if obj.profile_image:
-            return format_html('<img src="{}" width="50" height="50" style="object-fit: cover; border-radius:50%;" />', obj.profile_image.url)
+            # Miniature 96 × 96 si elle est prête, sinon l'original
+            thumb = current(obj.profile_image, obj.profile_image_variants).get("thumb")
+            url = obj.profile_image.storage.url(thumb["jpg"]) if thumb else obj.profile_image.url
+            return format_html('<img src="{}" width="50" height="50" style="object-fit: cover; border-radius:50%;" />', url)
         return "-"
     profile_thumbnail.short_description = 'Image Profil'
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EntrepriseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'entreprise'
+
+    def ready(self):
+        import entreprise.signals
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entreprise', '0003_alter_entreprise_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entreprise',
+            name='profile_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
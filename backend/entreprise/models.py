@@ -15,6 +15,8 @@ class Entreprise(models.Model):
         null=True,
         blank=True
     )
+    # Variantes thumb/card/full en WebP et JPEG, produites en arrière-plan (backend/images.py)
+    profile_image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return self.nom
@@ -1,15 +1,21 @@
 # entreprise/serializers.py
 from rest_framework import serializers
+from backend.images import current
 from .models import Entreprise
 
 class EntrepriseSerializer(serializers.ModelSerializer):
     email = serializers.CharField(source="user.email", read_only=True)
+    # {"thumb"|"card"|"full": {"webp": chemin, "jpg": chemin}}, {} tant qu'elles ne sont pas prêtes
+    profile_image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Entreprise
-        fields = ['id_entreprise', 'nom', 'secteur', 'user', 'profile_image', 'email']
+        fields = ['id_entreprise', 'nom', 'secteur', 'user', 'profile_image', 'profile_image_variants', 'email']
         read_only_fields = ['id_entreprise', 'user', 'email']
 
+    def get_profile_image_variants(self, instance):
+        return current(instance.profile_image, instance.profile_image_variants)
+
     def to_representation(self, instance):
         rep = super().to_representation(instance)
         # 🔹 garder seulement le chemin relatif pour profile_image
@@ -0,0 +1,13 @@
+# entreprise/signals.py
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from backend.images import schedule
+from .models import Entreprise
+
+
+@receiver(post_save, sender=Entreprise)
+def build_profile_image_variants(sender, instance, update_fields=None, **kwargs):
+    # Variantes thumb/card/full produites après le commit, hors requête (backend/images.py)
+    if update_fields is not None and "profile_image" not in update_fields:
+        return
+    schedule(instance, "profile_image", "profile_image_variants")
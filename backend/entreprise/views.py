@@ -9,6 +9,7 @@ from rest_framework import status
 from django.http import JsonResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
+from authentification.profils import entreprise_of
 
 
 class EntrepriseViewSet(viewsets.ModelViewSet):
@@ -20,7 +21,7 @@ class EntrepriseViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get", "post"], url_path="me")
     def me(self, request):
-        entreprise = Entreprise.objects.filter(user=request.user).first()
+        entreprise = entreprise_of(request)
 
         # Récupération
         if request.method == "GET":
@@ -46,11 +47,10 @@ class EntrepriseViewSet(viewsets.ModelViewSet):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_my_entreprise(request):
-    try:
-        entreprise = Entreprise.objects.get(user=request.user)
+    entreprise = entreprise_of(request)
+    if entreprise is not None:
         return JsonResponse({"entreprise_id": entreprise.id_entreprise})
-    except Entreprise.DoesNotExist:
-        return JsonResponse(
-            {"error": "Aucune entreprise associée à cet utilisateur."},
-            status=404
-        )
\ No newline at end of file
+    return JsonResponse(
+        {"error": "Aucune entreprise associée à cet utilisateur."},
+        status=404
+    )
\ No newline at end of file
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FreelanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'freelance'
+
+    def ready(self):
+        import freelance.signals
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from backend.images import build, current
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+
+SOURCES = {
+    "freelance": (Freelance, "photo", "photo_variants"),
+    "entreprise": (Entreprise, "profile_image", "profile_image_variants"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Produit les variantes thumb/card/full (WebP + JPEG) des photos de freelance et des logos "
+        "d'entreprise qui n'en ont pas encore (fichiers existants, traitement interrompu)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=[*SOURCES, "all"], default="all")
+        parser.add_argument("--workers", type=int, default=4, help="Threads Pillow")
+        parser.add_argument("--force", action="store_true", help="Reconstruire aussi les variantes à jour")
+
+    def handle(self, *args, **options):
+        names = list(SOURCES) if options["model"] == "all" else [options["model"]]
+        for name in names:
+            model, field, variants_field = SOURCES[name]
+            rows = model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True}).only(
+                "pk", field, variants_field
+            )
+            todo = []
+            for instance in rows.iterator(chunk_size=500):
+                if options["force"] or not current(getattr(instance, field), getattr(instance, variants_field)):
+                    todo.append(instance.pk)
+            if options["force"] and todo:
+                model.objects.filter(pk__in=todo).update(**{variants_field: {}})
+
+            def job(pk):
+                try:
+                    return build(model, pk, field, variants_field) is not None
+                except Exception as exc:
+                    self.stderr.write(f"🚫 {name} {pk} : {exc!r}")
+                    return False
+                finally:
+                    connections.close_all()
+
+            with ThreadPoolExecutor(max_workers=max(1, options["workers"])) as pool:
+                done = sum(pool.map(job, todo))
+            self.stdout.write(self.style.SUCCESS(f"✅ {name} : {done}/{len(todo)} image(s) traitée(s)."))
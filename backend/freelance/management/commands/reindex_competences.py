@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from freelance.skills import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruit l'index inversé des compétences freelance."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        total = rebuild_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ {total} profils indexés."))
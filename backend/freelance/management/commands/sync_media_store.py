@@ -0,0 +1,36 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Copie vers le stockage objet (MEDIA_OBJECT_STORE) les médias locaux qui n'y sont pas encore : "
+        "rattrapage de la copie différée (worker arrêté, bucket indisponible, fichiers antérieurs)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--dry-run", action="store_true", help="Compter seulement")
+
+    def handle(self, *args, **options):
+        remote = getattr(default_storage, "remote", None)
+        if remote is None:
+            raise CommandError("Aucun stockage objet configuré (MEDIA_OBJECT_STORE).")
+
+        root = default_storage.location
+        names = [
+            os.path.relpath(os.path.join(directory, filename), root).replace("\\", "/")
+            for directory, _, filenames in os.walk(root)
+            for filename in filenames
+        ]
+        if options["dry_run"]:
+            missing = sum(not remote.exists(name) for name in names)
+            self.stdout.write(f"🔎 {missing}/{len(names)} fichier(s) absent(s) du stockage objet.")
+            return
+
+        with ThreadPoolExecutor(max_workers=max(1, options["workers"])) as pool:
+            copied = sum(pool.map(default_storage.push, names))
+        self.stdout.write(self.style.SUCCESS(f"✅ {copied} fichier(s) copié(s) sur {len(names)}."))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_existing_freelances(apps, schema_editor):
+    """Indexe les compétences des profils existants."""
+    from mission.search import analyze
+
+    Freelance = apps.get_model("freelance", "Freelance")
+    FreelanceCompetence = apps.get_model("freelance", "FreelanceCompetence")
+
+    for freelance in Freelance.objects.only("id_freelance", "competence").iterator(chunk_size=500):
+        FreelanceCompetence.objects.bulk_create(
+            FreelanceCompetence(freelance_id=freelance.pk, terme=terme)
+            for terme in set(analyze(freelance.competence))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelance', '0003_alter_freelance_photo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FreelanceCompetence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('terme', models.CharField(db_index=True, max_length=64)),
+                ('freelance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='termes_competence', to='freelance.freelance')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('freelance', 'terme'), name='unique_freelance_terme')],
+            },
+        ),
+        migrations.RunPython(index_existing_freelances, migrations.RunPython.noop),
+    ]
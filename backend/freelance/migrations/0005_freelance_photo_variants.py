@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelance', '0004_freelance_competence_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='freelance',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -18,9 +18,26 @@ class Freelance(models.Model):
 
     tarif = models.DecimalField(max_digits=10, decimal_places=2, null=False, blank=False)
     photo = models.ImageField(upload_to="freelance_photos/", null=True, blank=True)
+    # Variantes thumb/card/full en WebP et JPEG, produites en arrière-plan (backend/images.py)
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     date_creation = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"{self.nom} - {self.competence}"
     
+
+
+class FreelanceCompetence(models.Model):
+    """
+    Index inversé des compétences : un terme normalisé (voir mission/search.py)
+    → les freelances qui le déclarent. Sert à retrouver les profils
+    candidats d'une mission sans parcourir tous les freelances.
+    """
+    freelance = models.ForeignKey(Freelance, on_delete=models.CASCADE, related_name="termes_competence")
+    terme = models.CharField(max_length=64, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["freelance", "terme"], name="unique_freelance_terme")
+        ]
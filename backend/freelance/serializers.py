@@ -1,9 +1,12 @@
 from rest_framework import serializers
+from backend.images import current
 from .models import Freelance
 
 class FreelanceSerializer(serializers.ModelSerializer):
     freelance_email = serializers.EmailField(source="freelance.user.email", read_only=True)
     photo = serializers.ImageField(required=False, allow_null=True)
+    # {"thumb"|"card"|"full": {"webp": chemin, "jpg": chemin}}, {} tant qu'elles ne sont pas prêtes
+    photo_variants = serializers.SerializerMethodField()
     class Meta:
         model = Freelance
         fields = [
@@ -17,11 +20,15 @@ class FreelanceSerializer(serializers.ModelSerializer):
             "certificat",
             "tarif",
             "photo",
+            "photo_variants",
             "date_creation",
             "freelance_email",
         ]
         read_only_fields = ["id_freelance", "user", "date_creation","freelance_email"]
 
+    def get_photo_variants(self, instance):
+        return current(instance.photo, instance.photo_variants)
+
     def to_representation(self, instance):
         """Retourner le chemin relatif pour la photo"""
         rep = super().to_representation(instance)
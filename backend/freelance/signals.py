@@ -0,0 +1,29 @@
+# freelance/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .models import Freelance
+from .skills import index_competences
+from mission.feed import refresh_freelance
+from backend.images import schedule
+
+
+@receiver(post_save, sender=Freelance)
+def index_freelance_save(sender, instance, **kwargs):
+    # Index inversé des compétences, mis à jour profil par profil
+    # (la suppression est gérée par le CASCADE de FreelanceCompetence)
+    index_competences(instance)
+
+
+@receiver(post_save, sender=Freelance)
+def refresh_feed_freelance_save(sender, instance, **kwargs):
+    # Profil modifié → seul le fil de ce freelance est recalculé
+    transaction.on_commit(lambda: refresh_freelance(instance))
+
+
+@receiver(post_save, sender=Freelance)
+def build_photo_variants(sender, instance, update_fields=None, **kwargs):
+    # Variantes thumb/card/full produites après le commit, hors requête (backend/images.py)
+    if update_fields is not None and "photo" not in update_fields:
+        return
+    schedule(instance, "photo", "photo_variants")
@@ -0,0 +1,68 @@
+# freelance/skills.py
+"""
+Index inversé des compétences freelance (FreelanceCompetence).
+"""
+from django.db import transaction
+from django.db.models import Count
+
+from mission.search import analyze
+from .models import Freelance, FreelanceCompetence
+
+
+def competence_terms(text):
+    return set(analyze(text))
+
+
+def overlapping_freelance_ids(terms, limit=None):
+    """
+    Ids des freelances qui partagent au moins un terme avec `terms`, du plus
+    grand nombre de termes communs au plus petit (lecture de l'index seul).
+    """
+    if not terms:
+        return []
+    queryset = (
+        FreelanceCompetence.objects.filter(terme__in=terms)
+        .values("freelance_id")
+        .annotate(communs=Count("id"))
+        .order_by("-communs", "freelance_id")
+        .values_list("freelance_id", flat=True)
+    )
+    return list(queryset[:limit] if limit else queryset)
+
+
+def index_competences(freelance):
+    """(Ré)indexe les compétences d'un seul freelance."""
+    with transaction.atomic():
+        FreelanceCompetence.objects.filter(freelance=freelance).delete()
+        FreelanceCompetence.objects.bulk_create(
+            FreelanceCompetence(freelance=freelance, terme=terme)
+            for terme in competence_terms(freelance.competence)
+        )
+
+
+def index_competences_bulk(freelances):
+    """Indexe des freelances créés par bulk_create (aucun signal déclenché)."""
+    ids = [f.pk for f in freelances]
+    with transaction.atomic():
+        FreelanceCompetence.objects.filter(freelance_id__in=ids).delete()
+        FreelanceCompetence.objects.bulk_create(
+            FreelanceCompetence(freelance_id=f.pk, terme=terme)
+            for f in freelances
+            for terme in competence_terms(f.competence)
+        )
+
+
+def rebuild_index(batch_size=500):
+    FreelanceCompetence.objects.all().delete()
+    total = 0
+    batch = []
+    for freelance in Freelance.objects.only("id_freelance", "competence").iterator(chunk_size=batch_size):
+        batch.append(freelance)
+        if len(batch) >= batch_size:
+            index_competences_bulk(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        index_competences_bulk(batch)
+        total += len(batch)
+    return total
@@ -0,0 +1,97 @@
+# freelance/tests/test_images.py
+import shutil
+import tempfile
+from io import BytesIO
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+import pytest
+from backend.images import render, variants_dir
+from candidature.models import Candidature, CandidatureLecture
+from entreprise.models import Entreprise
+from freelance.models import Freelance
+from freelance.serializers import FreelanceSerializer
+from mission.models import Mission
+
+User = get_user_model()
+
+
+def _image(size, fmt="JPEG", mode="RGB", red=200):
+    out = BytesIO()
+    Image.new(mode, size, (red, 30, 30, 128) if mode == "RGBA" else (red, 30, 30)).save(out, fmt)
+    return out.getvalue()
+
+
+@pytest.mark.unit
+def test_render_tailles_et_formats():
+    rendered = render(_image((3000, 2000)))
+    assert set(rendered) == {"thumb", "card", "full"}
+    tailles = {name: Image.open(BytesIO(formats["webp"])).size for name, formats in rendered.items()}
+    assert tailles == {"thumb": (96, 96), "card": (320, 320), "full": (1280, 853)}
+    assert Image.open(BytesIO(rendered["thumb"]["jpg"])).format == "JPEG"
+
+
+@pytest.mark.unit
+def test_render_transparence_et_petite_image():
+    rendered = render(_image((200, 100), "PNG", "RGBA"))
+    assert Image.open(BytesIO(rendered["full"]["webp"])).size == (200, 100)  # jamais agrandie
+    assert Image.open(BytesIO(rendered["full"]["jpg"])).mode == "RGB"
+
+
+@pytest.mark.unit
+@override_settings(IMAGE_VARIANT_WORKERS=0)
+class PhotoVariantsTest(TestCase):
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=self.media)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        entreprise = Entreprise.objects.create(
+            user=User.objects.create(email="e@gmail.com", role=User.ROLE_ENTREPRISE), nom="E", secteur="IT")
+        self.freelance = Freelance.objects.create(
+            user=User.objects.create(email="f@gmail.com", role=User.ROLE_FREELANCE),
+            nom="F", competence="Python", experience="3 ans", formation="Master", tarif="50.00",
+        )
+        mission = Mission.objects.create(
+            titre="M", description="D", competence_requis="Python", budget=100, entreprise=entreprise)
+        Candidature.objects.create(mission=mission, freelance=self.freelance)
+
+    def _upload(self, name, red=200):
+        self.freelance.photo = SimpleUploadedFile(name, _image((1600, 1200), red=red), content_type="image/jpeg")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.freelance.save()
+        self.freelance.refresh_from_db()
+        return self.freelance.photo_variants
+
+    def test_variantes_apres_commit(self):
+        # avant le commit : l'original seul, pas de variante
+        self.freelance.photo = SimpleUploadedFile("a.jpg", _image((1600, 1200)), content_type="image/jpeg")
+        self.freelance.save()
+        self.assertEqual(FreelanceSerializer(self.freelance).data["photo_variants"], {})
+
+        variants = self._upload("a.jpg")
+        prefix = variants_dir(self.freelance.photo.name)
+        self.assertEqual(variants["thumb"], {"webp": f"{prefix}thumb.webp", "jpg": f"{prefix}thumb.jpg"})
+        self.assertEqual(FreelanceSerializer(self.freelance).data["photo_variants"], variants)
+        # projection des candidatures (liste recruteur) à jour sans post_save
+        self.assertEqual(CandidatureLecture.objects.get().freelance_photo_variants, variants)
+
+    def test_nouvelle_photo_remplace_les_variantes(self):
+        storage = self.freelance.photo.storage
+        anciennes = self._upload("a.jpg")
+        nouvelles = self._upload("b.jpg", red=20)
+
+        self.assertNotEqual(anciennes, nouvelles)
+        self.assertTrue(storage.exists(nouvelles["card"]["webp"]))
+        self.assertFalse(storage.exists(anciennes["card"]["webp"]))
+
+        self.freelance.photo = None
+        with self.captureOnCommitCallbacks(execute=True):
+            self.freelance.save()
+        self.freelance.refresh_from_db()
+        self.assertEqual(self.freelance.photo_variants, {})
+        self.assertFalse(storage.exists(nouvelles["card"]["webp"]))
@@ -0,0 +1,133 @@
+# freelance/tests/test_media_storage.py
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+import pytest
+from backend import images
+from backend.storage import content_address
+from freelance.models import Freelance
+from freelance.tests.test_images import _image
+
+User = get_user_model()
+
+
+class MediaTestCase(TestCase):
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.store = tempfile.mkdtemp()
+        for path in (self.media, self.store):
+            self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=self.media, MEDIA_OBJECT_STORE_ROOT=self.store)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def _freelance(self, i, photo=None):
+        return Freelance.objects.create(
+            user=User.objects.create(email=f"f{i}@gmail.com", role=User.ROLE_FREELANCE),
+            nom=f"F{i}", competence="Python", experience="3 ans", formation="Master", tarif="50.00",
+            photo=photo,
+        )
+
+
+@pytest.mark.unit
+@override_settings(IMAGE_VARIANT_WORKERS=0)
+class ContentAddressedStorageTest(MediaTestCase):
+
+    def _upload(self, i, data, name="photo.JPG"):
+        with self.captureOnCommitCallbacks(execute=True):
+            freelance = self._freelance(i, SimpleUploadedFile(name, data, content_type="image/jpeg"))
+        freelance.refresh_from_db()
+        return freelance
+
+    def test_doublons_partages(self):
+        data = _image((800, 600))
+        premier = self._upload(1, data)
+        with patch("backend.images.render", wraps=images.render) as render:
+            second = self._upload(2, data, name="autre.jpg")
+            render.assert_not_called()  # variantes déjà produites pour la même image
+
+        self.assertEqual(premier.photo.name, second.photo.name)
+        self.assertRegex(premier.photo.name, r"^freelance_photos/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$")
+        self.assertEqual(premier.photo_variants, second.photo_variants)
+        self.assertEqual(len(os.listdir(os.path.dirname(premier.photo.path))), 2)  # original + variants/
+
+        # Le premier change de photo : les variantes restent, le second les utilise encore
+        premier.photo = SimpleUploadedFile("b.jpg", _image((800, 600), red=20), content_type="image/jpeg")
+        with self.captureOnCommitCallbacks(execute=True):
+            premier.save()
+        self.assertTrue(default_storage.exists(second.photo_variants["thumb"]["webp"]))
+
+    def test_nom_force_ne_remplace_pas(self):
+        original = self._upload(1, _image((300, 300)), name="photo.png")
+        address = content_address(original.photo.name)
+        with original.photo.open("rb") as handle:
+            octets = handle.read()
+
+        # envoi nommé d'après l'empreinte d'un autre fichier, contenu différent
+        force = self._upload(2, _image((300, 300), red=10), name=f"{address}.png")
+        self.assertNotEqual(force.photo.name, original.photo.name)
+        self.assertNotEqual(content_address(force.photo.name), address)
+        with default_storage.open(original.photo.name) as handle:
+            self.assertEqual(handle.read(), octets)
+
+        # même chose directement sur le stockage, avec le chemin complet
+        self.assertNotEqual(default_storage.save(original.photo.name, ContentFile(b"autre")), original.photo.name)
+        with default_storage.open(original.photo.name) as handle:
+            self.assertEqual(handle.read(), octets)
+
+    def test_ancien_nom_passe_sous_son_empreinte(self):
+        legacy = "freelance_photos/ancienne.jpg"
+        os.makedirs(os.path.join(self.media, "freelance_photos"))
+        with open(os.path.join(self.media, legacy), "wb") as handle:
+            handle.write(_image((400, 300)))
+        freelance = self._freelance(1)
+        Freelance.objects.filter(pk=freelance.pk).update(photo=legacy)
+
+        variants = images.build(Freelance, freelance.pk, "photo", "photo_variants")
+        freelance.refresh_from_db()
+        self.assertIsNotNone(content_address(freelance.photo.name))
+        self.assertTrue(variants["card"]["jpg"].startswith(images.variants_dir(freelance.photo.name)))
+
+    @override_settings(MEDIA_OBJECT_STORE="filesystem", MEDIA_STORE_WORKERS=0)
+    def test_copie_differee_et_relecture(self):
+        name = default_storage.save("freelance_photos/cv.pdf", ContentFile(b"%PDF-1.4 contenu"))
+        self.assertTrue(os.path.exists(os.path.join(self.store, name)))
+
+        os.remove(default_storage.path(name))  # disque local perdu
+        self.assertTrue(default_storage.exists(name))
+        with default_storage.open(name) as handle:
+            self.assertEqual(handle.read(), b"%PDF-1.4 contenu")
+
+
+@pytest.mark.unit
+class ServeMediaTest(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.name = default_storage.save("freelance_photos/p.jpg", ContentFile(_image((10, 10))))
+
+    @override_settings(MEDIA_ACCEL_REDIRECT="/_media/")
+    def test_x_accel_redirect(self):
+        response = self.client.get(f"/media/{self.name}")
+        self.assertEqual(response["X-Accel-Redirect"], f"/_media/{self.name}")
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(response.content, b"")
+
+    @override_settings(MEDIA_ACCEL_REDIRECT="")
+    def test_sans_nginx(self):
+        response = self.client.get(f"/media/{self.name}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), _image((10, 10)))
+        etag = response["ETag"]
+
+        self.assertEqual(self.client.get(f"/media/{self.name}", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get("/media/freelance_photos/absente.jpg").status_code, 404)
+        self.assertEqual(self.client.get("/media/../settings.py").status_code, 404)
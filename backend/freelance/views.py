@@ -4,6 +4,7 @@ from rest_framework.exceptions import PermissionDenied
 from .models import Freelance
 from rest_framework.parsers import MultiPartParser, FormParser
 from .serializers import FreelanceSerializer
+from authentification.profils import freelance_of
 
 class FreelanceViewSet(viewsets.ModelViewSet):
     serializer_class = FreelanceSerializer
@@ -16,20 +17,20 @@ class FreelanceViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         # Empêcher qu'un utilisateur crée plusieurs freelances
-        if hasattr(self.request.user, "freelance"):
+        if freelance_of(self.request) is not None:
             raise PermissionDenied("Vous avez déjà un profil freelance.")
         serializer.save(user=self.request.user)
 
     def perform_update(self, serializer):
         # Vérification que l'utilisateur modifie son propre profil
         freelance = self.get_object()
-        if freelance.user != self.request.user:
+        if freelance.user_id != self.request.user.pk:
             raise PermissionDenied("Vous n’êtes pas autorisé à modifier ce profil.")
         serializer.save()
 
     def perform_destroy(self, instance):
         # Vérification que l'utilisateur supprime son propre profil
-        if instance.user != self.request.user:
+        if instance.user_id != self.request.user.pk:
             raise PermissionDenied("Vous n’êtes pas autorisé à supprimer ce profil.")
         instance.delete()
 
@@ -1,49 +1,103 @@
 # consumers.py
-import json
 from channels.generic.websocket import AsyncWebsocketConsumer
-from asgiref.sync import sync_to_async
+from backend.websocket import BoundedSendMixin, CompactProtocolMixin, DISCONNECT
+from backend import fanout
+from backend.replay import with_seq
+from .sync import changes_since, chunk_size, current_version, iter_missions
+
+class MissionConsumer(BoundedSendMixin, CompactProtocolMixin, AsyncWebsocketConsumer):
+    # Les trames de lot ne se fusionnent pas : file pleine → resync, le client
+    # redemande {"action": "get_missions", "since": <version>}
+    overflow = DISCONNECT
 
-class MissionConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.group_name = "missions"
-        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        # Un abonnement par worker plutôt qu'un membre Redis par socket (backend/fanout.py)
+        await fanout.group_add(self.group_name, self)
         await self.accept()
         print("✅ Connexion WebSocket pour les missions établie.")
 
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        await fanout.group_discard(self.group_name, self)
         print("❌ Connexion WebSocket fermée.")
 
-    async def receive(self, text_data):
+    async def receive(self, text_data=None, bytes_data=None):
         """
         Permet de répondre aux messages manuels envoyés par le client (ex: refresh des missions).
+        {"action": "get_missions"}              → snapshot complet par tranches
+        {"action": "get_missions", "since": v}  → seulement les changements depuis la version v
+        {"action": "ack", "seq": n}             → acquittement des trames de lot (?ack=1)
         """
-        data = json.loads(text_data)
+        data = self.decode_message(text_data, bytes_data)
+        if self.acknowledge(data):
+            return
         action = data.get("action")
 
         if action == "get_missions":
-            from mission.models import Mission   # éviter import global
-            missions = await sync_to_async(list)(Mission.objects.all().values())
-            await self.send(text_data=json.dumps({
-                "action": "list",
-                "missions": missions
-            }))
+            since = data.get("since")
+            if isinstance(since, int) and since >= 0:
+                delta = await changes_since(since)
+                if delta is not None:
+                    await self.send_delta(*delta)
+                    return
+            await self.send_snapshot()
+
+    async def send_snapshot(self):
+        # La version est lue AVANT le parcours : ce qui change pendant le
+        # snapshot sera renvoyé (de façon idempotente) par le prochain delta.
+        version = await current_version()
+        count = 0
+        async for chunk in iter_missions():
+            count += len(chunk)
+            await self.send_message({"action": "list", "missions": chunk})
+        await self.send_message({
+            "action": "list_end",
+            "version": version,
+            "count": count,
+        })
+
+    async def send_delta(self, version, upserts, deleted):
+        size = chunk_size()
+        for start in range(0, len(deleted), size):
+            await self.send_message({
+                "action": "delta",
+                "missions": [],
+                "deleted": deleted[start:start + size],
+            })
+        count = 0
+        if upserts:
+            async for chunk in iter_missions(ids=upserts):
+                count += len(chunk)
+                await self.send_message({"action": "delta", "missions": chunk, "deleted": []})
+        await self.send_message({
+            "action": "delta_end",
+            "version": version,
+            "count": count,
+            "deleted_count": len(deleted),
+        })
 
     # 🔹 Handlers pour écouter les events du group_send
+    async def mission_batch(self, event):
+        # Une trame par fenêtre de diffusion (voir mission/publisher.py)
+        await self.queue_message(with_seq({
+            "action": "batch",
+            "events": event["events"]
+        }, event))
+
     async def mission_created(self, event):
-        await self.send(text_data=json.dumps({
+        await self.queue_message({
             "action": "created",
             "mission": event["mission"]
-        }))
+        })
 
     async def mission_updated(self, event):
-        await self.send(text_data=json.dumps({
+        await self.queue_message({
             "action": "updated",
             "mission": event["mission"]
-        }))
+        })
 
     async def mission_deleted(self, event):
-        await self.send(text_data=json.dumps({
+        await self.queue_message({
             "action": "deleted",
             "mission": event["mission"]
-        }))
+        })
@@ -0,0 +1,105 @@
+# mission/feed.py
+"""
+Fil personnalisé "missions pour vous" (MissionFeedEntry), tenu à jour de
+façon incrémentale :
+
+- nouvelle mission / mission modifiée → seuls les freelances dont les
+  compétences recoupent la mission (index FreelanceCompetence) sont scorés ;
+- profil freelance modifié → seul le fil de ce freelance est recalculé,
+  sur les missions retrouvées par l'index de recherche (MissionTerm).
+"""
+from django.conf import settings
+from django.db import transaction
+
+from candidature.matching import score_matrix
+from freelance.models import Freelance
+from freelance.skills import competence_terms, overlapping_freelance_ids
+from .models import Mission, MissionFeedEntry, MissionTerm
+
+BATCH_SIZE = 1000
+
+FREELANCE_FIELDS = ("id_freelance", "competence", "experience", "formation", "description")
+MISSION_FIELDS = ("id_mission", "titre", "description", "competence_requis")
+
+
+def _score_min():
+    return getattr(settings, "MISSION_FEED_SCORE_MIN", 5.0)
+
+
+def _batches(ids):
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
+
+
+def refresh_mission(mission):
+    """Recalcule les entrées de fil d'une mission."""
+    if mission.pk is None:  # supprimée avant le commit
+        return
+    ids = overlapping_freelance_ids(competence_terms(mission.competence_requis))
+    seuil = _score_min()
+
+    with transaction.atomic():
+        MissionFeedEntry.objects.filter(mission=mission).delete()
+        for batch in _batches(ids):
+            freelances = list(Freelance.objects.filter(id_freelance__in=batch).only(*FREELANCE_FIELDS))
+            scores = score_matrix(freelances, [mission])[:, 0]
+            MissionFeedEntry.objects.bulk_create(
+                MissionFeedEntry(freelance=freelance, mission=mission, score=float(score))
+                for freelance, score in zip(freelances, scores)
+                if score >= seuil
+            )
+
+
+def refresh_freelance(freelance):
+    """Recalcule tout le fil d'un seul freelance."""
+    if freelance.pk is None:  # supprimé avant le commit
+        return
+    terms = competence_terms(freelance.competence)
+    ids = sorted(set(MissionTerm.objects.filter(term__in=terms).values_list("mission_id", flat=True)))
+    seuil = _score_min()
+
+    with transaction.atomic():
+        MissionFeedEntry.objects.filter(freelance=freelance).delete()
+        for batch in _batches(ids):
+            missions = list(Mission.objects.filter(id_mission__in=batch).only(*MISSION_FIELDS))
+            scores = score_matrix([freelance], missions)[0]
+            MissionFeedEntry.objects.bulk_create(
+                MissionFeedEntry(freelance=freelance, mission=mission, score=float(score))
+                for mission, score in zip(missions, scores)
+                if score >= seuil
+            )
+
+
+def refresh_freelances(freelances):
+    """
+    Fil de plusieurs freelances d'un coup (import en masse, sans signal) :
+    une lecture de MissionTerm pour tout le lot et une seule matrice de scores,
+    restreinte ensuite aux missions qui recoupent les compétences de chacun.
+    """
+    freelances = [f for f in freelances if f.pk is not None]
+    if not freelances:
+        return
+    terms = {f.pk: competence_terms(f.competence) for f in freelances}
+    missions_par_terme = {}
+    for term, mission_id in MissionTerm.objects.filter(
+        term__in=set().union(*terms.values())
+    ).values_list("term", "mission_id"):
+        missions_par_terme.setdefault(term, set()).add(mission_id)
+    candidates = {
+        pk: set().union(*(missions_par_terme.get(t, ()) for t in f_terms))
+        for pk, f_terms in terms.items()
+    }
+    ids = sorted(set().union(*candidates.values()))
+    seuil = _score_min()
+
+    with transaction.atomic():
+        MissionFeedEntry.objects.filter(freelance__in=freelances).delete()
+        for batch in _batches(ids):
+            missions = list(Mission.objects.filter(id_mission__in=batch).only(*MISSION_FIELDS))
+            scores = score_matrix(freelances, missions)
+            MissionFeedEntry.objects.bulk_create(
+                MissionFeedEntry(freelance=freelance, mission=mission, score=float(scores[i, j]))
+                for i, freelance in enumerate(freelances)
+                for j, mission in enumerate(missions)
+                if mission.pk in candidates[freelance.pk] and scores[i, j] >= seuil
+            )
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.utils import timezone
+
+from mission.models import MissionChange
+
+
+class Command(BaseCommand):
+    help = (
+        "Purge le journal de versions des missions. Les clients dont la version "
+        "est plus ancienne recevront un snapshot complet. La dernière entrée est "
+        "toujours conservée comme repère de purge."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7)
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - timedelta(days=options["days"])
+        # La dernière entrée reste : elle marque jusqu'où le journal a été purgé
+        latest = MissionChange.objects.aggregate(latest=Max("id"))["latest"]
+        deleted, _ = MissionChange.objects.filter(date__lt=limite).exclude(id=latest).delete()
+        self.stdout.write(self.style.SUCCESS(f"🧹 {deleted} entrées supprimées."))
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:06
+
+import django.db.models.deletion
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def index_existing_missions(apps, schema_editor):
+    """Indexe les missions déjà présentes avant l'arrivée de la recherche."""
+    from mission.search import FIELD_WEIGHTS, analyze
+
+    Mission = apps.get_model("mission", "Mission")
+    MissionTerm = apps.get_model("mission", "MissionTerm")
+    MissionDocument = apps.get_model("mission", "MissionDocument")
+
+    for mission in Mission.objects.iterator(chunk_size=500):
+        counts = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in analyze(getattr(mission, field)):
+                counts[term] += weight
+        MissionTerm.objects.bulk_create(
+            MissionTerm(mission_id=mission.pk, term=term, tf=tf) for term, tf in counts.items()
+        )
+        MissionDocument.objects.create(mission_id=mission.pk, length=sum(counts.values()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mission', '0002_alter_mission_entreprise'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MissionDocument',
+            fields=[
+                ('mission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='document', serialize=False, to='mission.mission')),
+                ('length', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MissionTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(db_index=True, max_length=64)),
+                ('tf', models.PositiveIntegerField(default=1)),
+                ('mission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='termes', to='mission.mission')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('mission', 'term'), name='unique_mission_term')],
+            },
+        ),
+        migrations.RunPython(index_existing_missions, migrations.RunPython.noop),
+    ]
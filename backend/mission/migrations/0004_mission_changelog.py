@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mission', '0003_mission_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MissionChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('mission_id', models.IntegerField(db_index=True)),
+                ('action', models.CharField(choices=[('upsert', 'Création / mise à jour'), ('delete', 'Suppression')], max_length=10)),
+                ('date', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelance', '0004_freelance_competence_index'),
+        ('mission', '0004_mission_changelog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MissionFeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('freelance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fil_missions', to='freelance.freelance')),
+                ('mission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fil_freelances', to='mission.mission')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['freelance', '-score', '-mission'], name='feed_freelance_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('freelance', 'mission'), name='unique_feed_entry')],
+            },
+        ),
+    ]
@@ -11,3 +11,61 @@ class Mission(models.Model):
 
     def __str__(self):
         return self.titre
+
+
+class MissionTerm(models.Model):
+    """Posting de l'index inversé : un terme normalisé présent dans une mission."""
+    mission = models.ForeignKey(Mission, on_delete=models.CASCADE, related_name="termes")
+    term = models.CharField(max_length=64, db_index=True)
+    tf = models.PositiveIntegerField(default=1)  # fréquence pondérée du terme
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["mission", "term"], name="unique_mission_term")
+        ]
+
+
+class MissionDocument(models.Model):
+    """Longueur (en termes pondérés) d'une mission indexée, pour BM25."""
+    mission = models.OneToOneField(
+        Mission, on_delete=models.CASCADE, primary_key=True, related_name="document"
+    )
+    length = models.PositiveIntegerField(default=0)
+
+
+class MissionChange(models.Model):
+    """
+    Journal des modifications de missions. Son id sert de jeton de version
+    pour la synchronisation différentielle du WebSocket (get_missions + since).
+    """
+    ACTION_UPSERT = "upsert"
+    ACTION_DELETE = "delete"
+    ACTION_CHOICES = [
+        (ACTION_UPSERT, "Création / mise à jour"),
+        (ACTION_DELETE, "Suppression"),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    # pas de ForeignKey : l'entrée doit survivre à la suppression de la mission
+    mission_id = models.IntegerField(db_index=True)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    date = models.DateTimeField(auto_now_add=True, db_index=True)
+
+
+class MissionFeedEntry(models.Model):
+    """
+    Fil "missions pour vous" précalculé : une ligne par couple
+    (freelance, mission) pertinent. La lecture du fil est un simple parcours
+    de l'index (freelance, -score, -mission).
+    """
+    freelance = models.ForeignKey("freelance.Freelance", on_delete=models.CASCADE, related_name="fil_missions")
+    mission = models.ForeignKey(Mission, on_delete=models.CASCADE, related_name="fil_freelances")
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["freelance", "mission"], name="unique_feed_entry")
+        ]
+        indexes = [
+            models.Index(fields=["freelance", "-score", "-mission"], name="feed_freelance_score_idx"),
+        ]
@@ -0,0 +1,97 @@
+# mission/publisher.py
+"""
+Diffusion des événements de missions vers le groupe "missions".
+
+- Les événements ne partent qu'après le COMMIT (transaction.on_commit) :
+  une transaction annulée ne notifie personne.
+- Pendant une courte fenêtre (MISSION_BROADCAST_WINDOW, en secondes), les
+  événements d'une même mission sont fusionnés, puis une seule trame
+  "mission_batch" est envoyée pour toute la fenêtre.
+- L'envoi au channel layer se fait dans un thread minuteur : la requête HTTP
+  n'attend plus Redis.
+- Groupe large (un membre par freelance connecté) : diffusé selon
+  WEBSOCKET_FANOUT, un seul abonnement par worker (backend/fanout.py).
+"""
+import atexit
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+
+from backend import fanout, replay
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+
+def _coalesce(previous, current):
+    """
+    Fusionne deux événements successifs d'une même mission.
+    Retourne None si les deux s'annulent (créée puis supprimée dans la fenêtre).
+    """
+    if previous is None:
+        return current
+    if previous["action"] == CREATED:
+        if current["action"] == DELETED:
+            return None
+        return {"action": CREATED, "mission": current["mission"]}
+    return current
+
+
+class MissionPublisher:
+    def __init__(self, group_name="missions"):
+        self.group_name = group_name
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self._timer = None
+
+    @property
+    def window(self):
+        return getattr(settings, "MISSION_BROADCAST_WINDOW", 0.2)
+
+    def publish(self, action, mission_id, payload):
+        """À appeler depuis les signaux : l'événement attend le commit."""
+        transaction.on_commit(lambda: self._enqueue(action, mission_id, payload))
+
+    def _enqueue(self, action, mission_id, payload):
+        with self._lock:
+            event = _coalesce(self._pending.pop(mission_id, None), {"action": action, "mission": payload})
+            if event is not None:
+                self._pending[mission_id] = event
+
+            if self.window <= 0:
+                flush_now = True
+            else:
+                flush_now = False
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+        if flush_now:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            events = list(self._pending.values())
+            self._pending.clear()
+            self._timer = None
+
+        if not events:
+            return
+        # Channel layer, ou un abonnement par worker (backend/fanout.py) ;
+        # numéro de séquence + journal de rejeu (backend/replay.py)
+        fanout.group_send(
+            self.group_name,
+            replay.stamp(self.group_name, {
+                "type": "mission_batch",  # doit matcher le handler du consumer
+                "events": events,
+            }),
+        )
+
+
+publisher = MissionPublisher()
+# Ne pas perdre la dernière fenêtre à l'arrêt du worker
+atexit.register(publisher.flush)
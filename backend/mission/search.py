@@ -0,0 +1,166 @@
+# mission/search.py
+"""
+Moteur de recherche plein texte des missions.
+
+Index inversé stocké en base (MissionTerm / MissionDocument), mis à jour
+mission par mission depuis signals.py, et classement BM25 au moment de la
+requête.
+"""
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count
+
+from .models import Mission, MissionDocument, MissionTerm
+
+# Paramètres BM25 classiques
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Le titre et les compétences comptent davantage que la description
+FIELD_WEIGHTS = {
+    "titre": 2,
+    "competence_requis": 2,
+    "description": 1,
+}
+
+MAX_TERM_LENGTH = MissionTerm._meta.get_field("term").max_length
+
+STOPWORDS = frozenset("""
+a au aux avec ce ces dans de des du elle en et eux il je la le les leur lui ma
+mais me meme mes moi mon ne nos notre nous on ou par pas pour qu que qui sa se
+ses son sur ta te tes toi ton tu un une vos votre vous c d j l m n s t y est
+sont etre avoir ete the and for of to in on with
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[+#]+)?")
+
+# Suffixes retirés par le stemmer léger (du plus long au plus court)
+_SUFFIXES = (
+    "issements", "issement", "atrices", "ateurs", "ations", "atrice", "ateur",
+    "ation", "ements", "ement", "ments", "ment", "ances", "ences", "ance", "ence",
+    "euses", "euse", "eurs", "eur", "ites", "ite", "iques", "ique", "ismes",
+    "isme", "istes", "iste", "ables", "able", "ives", "ive", "ifs", "if",
+    "elles", "elle", "aux", "ees", "ee", "es", "er", "ez",
+)
+
+
+def normalize(text):
+    """Minuscules, sans accents (é → e, ç → c)."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return text.lower()
+
+
+def stem(word):
+    """
+    Stemmer français léger : on retire le pluriel puis un suffixe
+    dérivationnel courant, en gardant au moins 3 caractères de racine.
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith(("s", "x")) and not word.endswith(("ss", "aux")):
+        word = word[:-1]
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            break
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def analyze(text):
+    """Texte brut → liste de termes indexables."""
+    terms = []
+    for token in _TOKEN_RE.findall(normalize(text)):
+        if token in STOPWORDS:
+            continue
+        terms.append(stem(token)[:MAX_TERM_LENGTH])
+    return terms
+
+
+def _mission_terms(mission):
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in analyze(getattr(mission, field)):
+            counts[term] += weight
+    return counts
+
+
+def index_mission(mission):
+    """
+    (Ré)indexe une seule mission : remplace ses postings et sa longueur.
+    Appelé depuis le post_save de Mission.
+    """
+    counts = _mission_terms(mission)
+    with transaction.atomic():
+        MissionTerm.objects.filter(mission=mission).delete()
+        MissionTerm.objects.bulk_create(
+            MissionTerm(mission=mission, term=term, tf=tf)
+            for term, tf in counts.items()
+        )
+        MissionDocument.objects.update_or_create(
+            mission=mission, defaults={"length": sum(counts.values())}
+        )
+
+
+def rebuild_index(batch_size=500):
+    """Reconstruit tout l'index (initialisation ou reprise après incident)."""
+    MissionTerm.objects.all().delete()
+    MissionDocument.objects.all().delete()
+    total = 0
+    for mission in Mission.objects.only(*FIELD_WEIGHTS).iterator(chunk_size=batch_size):
+        index_mission(mission)
+        total += 1
+    return total
+
+
+def search_missions(query, limit=None, missions=None):
+    """
+    Retourne les id_mission correspondant à `query`, triés par score BM25
+    décroissant (puis id_mission décroissant pour un ordre stable).
+    missions : queryset restreignant les candidats (ex. missions d'une
+    entreprise), appliqué avant le classement et la limite ; les statistiques
+    BM25 (idf, longueur moyenne) restent celles de tout l'index.
+    """
+    limit = limit or getattr(settings, "MISSION_SEARCH_LIMIT", 100)
+    terms = set(analyze(query))
+    if not terms:
+        return []
+
+    stats = MissionDocument.objects.aggregate(avgdl=Avg("length"), total=Count("mission"))
+    total_docs = stats["total"]
+    if not total_docs:
+        return []
+    avgdl = stats["avgdl"] or 1.0
+
+    # df sur tout l'index, scores seulement pour les missions du périmètre
+    df = dict(
+        MissionTerm.objects.filter(term__in=terms).values("term").annotate(df=Count("mission")).values_list("term", "df")
+    )
+    matches = MissionTerm.objects.filter(term__in=terms)
+    if missions is not None:
+        matches = matches.filter(mission_id__in=missions.values("id_mission"))
+    postings = defaultdict(list)
+    for mission_id, term, tf in matches.values_list("mission_id", "term", "tf"):
+        postings[term].append((mission_id, tf))
+
+    candidates = {mission_id for plist in postings.values() for mission_id, _ in plist}
+    lengths = dict(
+        MissionDocument.objects.filter(mission_id__in=candidates).values_list("mission_id", "length")
+    )
+
+    scores = defaultdict(float)
+    for term, plist in postings.items():
+        idf = math.log(1 + (total_docs - df[term] + 0.5) / (df[term] + 0.5))
+        for mission_id, tf in plist:
+            norm = 1 - BM25_B + BM25_B * lengths.get(mission_id, avgdl) / avgdl
+            scores[mission_id] += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+    return [mission_id for mission_id, _ in ranked[:limit]]
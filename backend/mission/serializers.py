@@ -1,10 +1,13 @@
 from rest_framework import serializers
-from .models import Mission
+from .models import Mission, MissionFeedEntry
+from backend.images import current
+from backend.serializers import OptimizedQuerysetMixin
 
-class MissionSerializer(serializers.ModelSerializer):
+class MissionSerializer(OptimizedQuerysetMixin, serializers.ModelSerializer):
     entreprise_nom = serializers.CharField(source="entreprise.nom", read_only=True)
     entreprise_secteur = serializers.CharField(source="entreprise.secteur", read_only=True)
     entreprise_photo = serializers.SerializerMethodField()  # chemin relatif seulement
+    entreprise_photo_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Mission
@@ -18,11 +21,42 @@ class MissionSerializer(serializers.ModelSerializer):
             "entreprise_nom",
             "entreprise_secteur",
             "entreprise_photo",
+            "entreprise_photo_variants",
         ]
         read_only_fields = ['id_mission', 'entreprise']
+        select_related = ("entreprise",)
 
     def get_entreprise_photo(self, obj):
         if obj.entreprise.profile_image:
             # renvoie uniquement le chemin relatif
             return obj.entreprise.profile_image.name  
         return None
+
+    def get_entreprise_photo_variants(self, obj):
+        return current(obj.entreprise.profile_image, obj.entreprise.profile_image_variants)
+
+
+class MissionFeedSerializer(OptimizedQuerysetMixin, serializers.ModelSerializer):
+    mission = MissionSerializer(read_only=True)
+
+    class Meta:
+        model = MissionFeedEntry
+        fields = ["score", "mission"]
+        select_related = ("mission__entreprise",)
+
+
+def mission_payload(instance):
+    """
+    Sérialiser les champs nécessaires pour le WebSocket.
+    """
+    entreprise = instance.entreprise
+    return {
+        "id_mission": instance.id_mission,
+        "titre": instance.titre,
+        "description": instance.description,
+        "competence_requis": instance.competence_requis,
+        "budget": float(instance.budget),
+        "entreprise_nom": entreprise.nom if entreprise else None,
+        "entreprise_secteur": entreprise.secteur if entreprise else None ,
+        "entreprise_photo": entreprise.profile_image.url if entreprise and entreprise.profile_image else None, 
+        }
@@ -1,46 +1,39 @@
 # signals.py
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
-from .models import Mission
+from .models import Mission, MissionChange
+from .search import index_mission
+from .serializers import mission_payload
+from .publisher import CREATED, DELETED, UPDATED, publisher
+from .feed import refresh_mission
 
-def _serialize_mission(instance):
-    """
-    Sérialiser les champs nécessaires pour le WebSocket.
-    """
-    entreprise = instance.entreprise
-    return {
-        "id_mission": instance.id_mission,
-        "titre": instance.titre,
-        "description": instance.description,
-        "competence_requis": instance.competence_requis,
-        "budget": float(instance.budget),
-        "entreprise_nom": entreprise.nom if entreprise else None,
-        "entreprise_secteur": entreprise.secteur if entreprise else None ,
-        "entreprise_photo": entreprise.profile_image.url if entreprise and entreprise.profile_image else None, 
-        }
+@receiver(post_save, sender=Mission)
+def index_mission_save(sender, instance, **kwargs):
+    # Mise à jour incrémentale de l'index de recherche (la suppression
+    # est gérée par le CASCADE de MissionTerm / MissionDocument)
+    index_mission(instance)
 
 @receiver(post_save, sender=Mission)
-def notify_mission_save(sender, instance, created, **kwargs):
-    channel_layer = get_channel_layer()
-    action_type = "mission_created" if created else "mission_updated"
+def refresh_feed_mission_save(sender, instance, **kwargs):
+    # Fil "missions pour vous" : seuls les freelances concernés sont rescorés
+    transaction.on_commit(lambda: refresh_mission(instance))
+
+@receiver(post_save, sender=Mission)
+def log_mission_save(sender, instance, **kwargs):
+    # Journal de versions pour la synchro différentielle (mission/sync.py)
+    MissionChange.objects.create(mission_id=instance.id_mission, action=MissionChange.ACTION_UPSERT)
 
-    async_to_sync(channel_layer.group_send)(
-        "missions",
-        {
-            "type": action_type,  # doit matcher les handlers du consumer
-            "mission": _serialize_mission(instance),
-        },
-    )
+@receiver(post_delete, sender=Mission)
+def log_mission_delete(sender, instance, **kwargs):
+    MissionChange.objects.create(mission_id=instance.id_mission, action=MissionChange.ACTION_DELETE)
+
+@receiver(post_save, sender=Mission)
+def notify_mission_save(sender, instance, created, **kwargs):
+    # Diffusion différée au commit et regroupée par fenêtre (mission/publisher.py)
+    action = CREATED if created else UPDATED
+    publisher.publish(action, instance.id_mission, mission_payload(instance))
 
 @receiver(post_delete, sender=Mission)
 def notify_mission_delete(sender, instance, **kwargs):
-    channel_layer = get_channel_layer()
-    async_to_sync(channel_layer.group_send)(
-        "missions",
-        {
-            "type": "mission_deleted",
-            "mission": {"id_mission": instance.id_mission},  # envoie juste l’ID
-        },
-    )
+    publisher.publish(DELETED, instance.id_mission, {"id_mission": instance.id_mission})  # envoie juste l’ID
@@ -0,0 +1,113 @@
+# mission/sync.py
+"""
+Snapshot en flux et synchronisation différentielle des missions pour
+MissionConsumer ("get_missions").
+
+- Le snapshot est lu par tranches keyset (id_mission > dernier id), jamais
+  chargé en entier en mémoire : chaque tranche devient une trame WebSocket.
+- Le jeton de version est l'id du dernier MissionChange. Un client qui
+  renvoie `since` ne reçoit que les missions modifiées / supprimées depuis.
+- Les ids auto-incrémentés sont attribués à l'insertion, pas au commit : la
+  version ne dépasse jamais un trou récent du journal (voir _scan), et les
+  missions déjà vues au-delà sont renvoyées, de façon idempotente.
+- La purge (prune_mission_changes) garde la dernière entrée comme repère :
+  toute version antérieure à la plus ancienne entrée restante est périmée.
+"""
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import Mission, MissionChange
+from .serializers import mission_payload
+
+
+def chunk_size():
+    return getattr(settings, "MISSION_SNAPSHOT_CHUNK", 200)
+
+
+def _horizon():
+    return timezone.now() - timedelta(seconds=getattr(settings, "MISSION_SYNC_GRACE", 30))
+
+
+def _scan(after):
+    """
+    Parcourt le journal au-delà de `after`. Retourne (version, dernière
+    action par mission). La version s'arrête avant le premier trou récent :
+    un id manquant peut appartenir à une transaction pas encore validée, on
+    relira donc ses voisins au prochain delta plutôt que de la sauter. Un
+    trou plus ancien que MISSION_SYNC_GRACE est une transaction annulée.
+    """
+    horizon = _horizon()
+    version = after
+    held = False
+    last_action = {}
+    for change_id, mission_id, action, date in (
+        MissionChange.objects.filter(id__gt=after)
+        .order_by("id")
+        .values_list("id", "mission_id", "action", "date")
+        .iterator()
+    ):
+        if change_id != version + 1 and date >= horizon:
+            held = True
+        last_action[mission_id] = action
+        if not held:
+            version = change_id
+    return version, last_action
+
+
+@sync_to_async
+def current_version():
+    # Seule la fin récente du journal peut encore contenir des trous
+    horizon = _horizon()
+    before = MissionChange.objects.filter(date__lt=horizon).aggregate(version=Max("id"))["version"]
+    if before is None:
+        first = MissionChange.objects.aggregate(first=Min("id"))["first"]
+        if first is None:
+            return 0
+        before = first - 1
+    return _scan(before)[0]
+
+
+@sync_to_async
+def _fetch_chunk(after_id, size, ids=None):
+    queryset = Mission.objects.select_related("entreprise").filter(id_mission__gt=after_id)
+    if ids is not None:
+        queryset = queryset.filter(id_mission__in=ids)
+    return [mission_payload(m) for m in queryset.order_by("id_mission")[:size]]
+
+
+async def iter_missions(ids=None, size=None):
+    """Itérateur serveur : produit les missions par tranches bornées."""
+    size = size or chunk_size()
+    after_id = 0
+    while True:
+        chunk = await _fetch_chunk(after_id, size, ids)
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) < size:
+            return
+        after_id = chunk[-1]["id_mission"]
+
+
+@sync_to_async
+def changes_since(since):
+    """
+    Retourne (version, ids_modifies, ids_supprimes) depuis la version
+    `since`, ou None si le journal a été purgé au-delà (le client doit
+    repartir d'un snapshot complet).
+    """
+    # La purge conserve toujours la dernière entrée : un journal vide n'a
+    # jamais rien contenu, une entrée plus ancienne manquante a été purgée
+    oldest = MissionChange.objects.aggregate(oldest=Min("id"))["oldest"]
+    if (oldest is None and since > 0) or (oldest is not None and oldest > since + 1):
+        return None
+
+    # Seule la dernière action de chaque mission compte
+    version, last_action = _scan(since)
+    upserts = sorted(i for i, a in last_action.items() if a == MissionChange.ACTION_UPSERT)
+    deleted = sorted(i for i, a in last_action.items() if a == MissionChange.ACTION_DELETE)
+    return version, upserts, deleted
@@ -0,0 +1,182 @@
+# mission/tests/test_consumers.py
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.test import TestCase, override_settings
+import pytest
+from django.contrib.auth import get_user_model
+from mission.consumers import MissionConsumer
+from io import StringIO
+from django.core.management import call_command
+from mission.models import Mission, Entreprise, MissionChange
+from mission.sync import changes_since, current_version
+from mission.publisher import publisher
+
+User = get_user_model()
+
+
+async def _get_missions(message):
+    communicator = WebsocketCommunicator(MissionConsumer.as_asgi(), "/ws/missions/")
+    connected, _ = await communicator.connect()
+    assert connected
+    await communicator.send_json_to(message)
+
+    frames = []
+    while True:
+        frame = await communicator.receive_json_from(timeout=5)
+        frames.append(frame)
+        if frame["action"] in ("list_end", "delta_end"):
+            break
+    await communicator.disconnect()
+    return frames
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    MISSION_SNAPSHOT_CHUNK=2,
+)
+class MissionConsumerSyncTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        self.entreprise = Entreprise.objects.create(user=user, nom="Entreprise Test", secteur="IT")
+        self.missions = [self._mission(i) for i in range(5)]
+
+    def _mission(self, i):
+        return Mission.objects.create(
+            titre=f"Mission {i}", description="Desc", competence_requis="Python",
+            budget=100 + i, entreprise=self.entreprise,
+        )
+
+    def test_snapshot_par_tranches(self):
+        frames = async_to_sync(_get_missions)({"action": "get_missions"})
+        chunks = [f for f in frames if f["action"] == "list"]
+        self.assertEqual([len(f["missions"]) for f in chunks], [2, 2, 1])
+        self.assertEqual(frames[-1]["count"], 5)
+        ids = [m["id_mission"] for f in chunks for m in f["missions"]]
+        self.assertEqual(ids, sorted(m.id_mission for m in self.missions))
+
+    def test_delta_depuis_version(self):
+        version = async_to_sync(_get_missions)({"action": "get_missions"})[-1]["version"]
+
+        modifiee = self.missions[0]
+        modifiee.titre = "Mission modifiée"
+        modifiee.save()
+        supprimee_id = self.missions[1].id_mission
+        self.missions[1].delete()
+        nouvelle = self._mission(99)
+
+        frames = async_to_sync(_get_missions)({"action": "get_missions", "since": version})
+        self.assertEqual(frames[-1]["action"], "delta_end")
+        envoyees = [m["id_mission"] for f in frames[:-1] for m in f["missions"]]
+        supprimees = [i for f in frames[:-1] for i in f["deleted"]]
+        self.assertEqual(envoyees, [modifiee.id_mission, nouvelle.id_mission])
+        self.assertEqual(supprimees, [supprimee_id])
+        self.assertGreater(frames[-1]["version"], version)
+
+        # Rien de nouveau depuis la dernière version
+        frames = async_to_sync(_get_missions)({"action": "get_missions", "since": frames[-1]["version"]})
+        self.assertEqual(frames, [{"action": "delta_end", "version": frames[0]["version"], "count": 0, "deleted_count": 0}])
+
+    def test_journal_purge_version_perimee_snapshot(self):
+        version = async_to_sync(_get_missions)({"action": "get_missions"})[-1]["version"]
+        self._mission(98)
+        self._mission(99)
+
+        call_command("prune_mission_changes", days=0, stdout=StringIO())
+        self.assertEqual(MissionChange.objects.count(), 1)  # repère de purge
+        frames = async_to_sync(_get_missions)({"action": "get_missions", "since": version})
+        self.assertEqual(frames[-1]["action"], "list_end")
+        self.assertEqual(frames[-1]["count"], 7)
+
+        # Journal vidé à la main : aucune version passée n'est plus valable
+        MissionChange.objects.all().delete()
+        frames = async_to_sync(_get_missions)({"action": "get_missions", "since": version})
+        self.assertEqual(frames[-1]["action"], "list_end")
+
+    def test_trou_recent_non_franchi(self):
+        version = async_to_sync(current_version)()
+        a, b, c = self._mission(97), self._mission(98), self._mission(99)
+        # l'entrée de b n'est pas encore validée quand le client synchronise
+        entrees_b = list(MissionChange.objects.filter(mission_id=b.id_mission))
+        MissionChange.objects.filter(mission_id=b.id_mission).delete()
+        avant_trou = MissionChange.objects.get(mission_id=a.id_mission).id
+
+        nouvelle, upserts, _ = async_to_sync(changes_since)(version)
+        self.assertEqual(upserts, [a.id_mission, c.id_mission])
+        self.assertEqual(nouvelle, avant_trou)  # arrêt avant le trou
+        self.assertEqual(async_to_sync(current_version)(), avant_trou)
+
+        MissionChange.objects.bulk_create(entrees_b)
+        nouvelle, upserts, _ = async_to_sync(changes_since)(nouvelle)
+        self.assertEqual(upserts, [b.id_mission, c.id_mission])
+        self.assertEqual(nouvelle, MissionChange.objects.get(mission_id=c.id_mission).id)
+
+    @override_settings(MISSION_SYNC_GRACE=0)
+    def test_trou_ancien_franchi(self):
+        version = async_to_sync(current_version)()
+        self._mission(98)
+        c = self._mission(99)
+        MissionChange.objects.exclude(mission_id=c.id_mission).filter(id__gt=version).delete()  # transaction annulée
+        nouvelle, upserts, _ = async_to_sync(changes_since)(version)
+        self.assertEqual((nouvelle, upserts), (MissionChange.objects.get(mission_id=c.id_mission).id, [c.id_mission]))
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    MISSION_BROADCAST_WINDOW=60,
+)
+class MissionPublisherTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        self.entreprise = Entreprise.objects.create(user=user, nom="Entreprise Test", secteur="IT")
+
+    def tearDown(self):
+        if publisher._timer is not None:
+            publisher._timer.cancel()
+        publisher._pending.clear()
+        publisher._timer = None
+
+    def _modifications(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            mission = Mission.objects.create(
+                titre="Brouillon", description="Desc", competence_requis="Python",
+                budget=100, entreprise=self.entreprise,
+            )
+            mission.titre = "Mission finale"
+            mission.save()
+            ephemere = Mission.objects.create(
+                titre="Éphémère", description="Desc", competence_requis="Python",
+                budget=100, entreprise=self.entreprise,
+            )
+            ephemere.delete()
+        return mission
+
+    def test_rien_avant_commit(self):
+        Mission.objects.create(
+            titre="Jamais commitée", description="Desc", competence_requis="Python",
+            budget=100, entreprise=self.entreprise,
+        )
+        self.assertEqual(len(publisher._pending), 0)
+
+    def test_evenements_fusionnes_en_une_trame(self):
+        async def scenario():
+            communicator = WebsocketCommunicator(MissionConsumer.as_asgi(), "/ws/missions/")
+            await communicator.connect()
+            mission = await sync_to_async(self._modifications)()
+            await sync_to_async(publisher.flush)()
+            frame = await communicator.receive_json_from(timeout=5)
+            self.assertTrue(await communicator.receive_nothing())
+            await communicator.disconnect()
+            return mission, frame
+
+        mission, frame = async_to_sync(scenario)()
+        self.assertEqual(frame["action"], "batch")
+        self.assertEqual(len(frame["events"]), 1)
+        self.assertEqual(frame["events"][0]["action"], "created")
+        self.assertEqual(frame["events"][0]["mission"]["id_mission"], mission.id_mission)
+        self.assertEqual(frame["events"][0]["mission"]["titre"], "Mission finale")
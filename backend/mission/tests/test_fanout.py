@@ -0,0 +1,163 @@
+# mission/tests/test_fanout.py
+import asyncio
+import threading
+from unittest.mock import patch
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.test import TestCase, override_settings
+import pytest
+from backend import fanout
+from mission.consumers import MissionConsumer
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    WEBSOCKET_FANOUT=fanout.LOCAL,
+)
+class LocalFanoutTest(TestCase):
+
+    def test_un_abonnement_pour_toutes_les_sockets(self):
+        async def scenario():
+            communicators = [WebsocketCommunicator(MissionConsumer.as_asgi(), "/ws/missions/") for _ in range(3)]
+            for communicator in communicators:
+                await communicator.connect()
+            self.assertEqual(len(fanout.hub().groups["missions"]), 3)
+
+            with patch("channels.layers.InMemoryChannelLayer.group_send") as layer_send:
+                for i in range(2):
+                    await sync_to_async(fanout.group_send)(
+                        "missions", {"type": "mission_batch", "events": [{"action": "created", "mission": i}]})
+                layer_send.assert_not_called()
+
+            frames = [
+                [await c.receive_json_from(timeout=5) for _ in range(2)] for c in communicators
+            ]
+            await communicators[0].disconnect()
+            await asyncio.sleep(0)
+            self.assertEqual(len(fanout.hub().groups["missions"]), 2)
+            for communicator in communicators[1:]:
+                await communicator.disconnect()
+            return frames
+
+        frames = async_to_sync(scenario)()
+        for recues in frames:
+            self.assertEqual([f["events"][0]["mission"] for f in recues], [0, 1])
+
+
+class FakeBroker:
+    """Pub/sub Redis minimal : publish (client synchrone) → abonnés (clients asyncio)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = {}  # canal → [FakePubSub]
+        self.connections = 0
+
+    def publish(self, channel, data):
+        channel = channel.encode()
+        with self.lock:
+            pubsubs = list(self.subscribers.get(channel, ()))
+        for pubsub in pubsubs:
+            pubsub.push({"type": "message", "channel": channel, "data": data})
+        return len(pubsubs)
+
+    def cut(self):
+        """Coupure réseau : chaque listen() en cours lève ConnectionError."""
+        with self.lock:
+            pubsubs = {p for ps in self.subscribers.values() for p in ps}
+        for pubsub in pubsubs:
+            pubsub.push(ConnectionError("connexion perdue"))
+
+    def async_client(self, **kwargs):
+        self.connections += 1
+        broker = self
+
+        class Client:
+            def pubsub(self):
+                return FakePubSub(broker)
+        return Client()
+
+
+class FakePubSub:
+    def __init__(self, broker):
+        self.broker = broker
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+
+    def push(self, item):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, item)
+
+    async def subscribe(self, channel):
+        channel = channel.encode()
+        with self.broker.lock:
+            self.broker.subscribers.setdefault(channel, []).append(self)
+        self.queue.put_nowait({"type": "subscribe", "channel": channel, "data": 1})
+
+    async def listen(self):
+        # comme redis-py : abonnements conservés d'une connexion à l'autre
+        while True:
+            item = await self.queue.get()
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    async def mission_batch(self, event):
+        self.events.append(event["events"][0]["mission"])
+
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    WEBSOCKET_FANOUT=fanout.REDIS,
+)
+class RedisFanoutTest(TestCase):
+
+    def test_un_abonnement_par_worker(self):
+        broker = FakeBroker()
+
+        async def publish(*missions):
+            for i in missions:
+                await sync_to_async(fanout.group_send)(
+                    "missions", {"type": "mission_batch", "events": [{"action": "created", "mission": i}]})
+
+        async def scenario():
+            # worker courant : deux sockets MissionConsumer ; second worker : un membre
+            communicators = [WebsocketCommunicator(MissionConsumer.as_asgi(), "/ws/missions/") for _ in range(2)]
+            for communicator in communicators:
+                await communicator.connect()
+            autre_worker, membre = fanout.Hub(asyncio.get_running_loop()), Recorder()
+            await autre_worker.join("missions", membre)
+            self.assertEqual(len(broker.subscribers[b"fanout:missions"]), 2)  # un par worker, pas par socket
+
+            await publish(0, 1, 2)
+            frames = [[await c.receive_json_from(timeout=5) for _ in range(3)] for c in communicators]
+
+            # coupure : le lecteur journalise, attend, puis relit le même abonnement
+            broker.cut()
+            await asyncio.sleep(0.1)
+            await publish(3)
+            for i, communicator in enumerate(communicators):
+                frames[i].append(await communicator.receive_json_from(timeout=5))
+            await asyncio.sleep(0.1)
+
+            for communicator in communicators:
+                await communicator.disconnect()
+            for task in (autre_worker._pump, autre_worker._reader):
+                task.cancel()
+            return frames, membre.events
+
+        with patch("redis.asyncio.Redis", side_effect=broker.async_client), \
+                patch.object(fanout, "_redis", broker), \
+                self.assertLogs("backend.fanout", "WARNING") as logs:
+            frames, autre = async_to_sync(scenario)()
+
+        for recues in frames:
+            self.assertEqual([f["events"][0]["mission"] for f in recues], [0, 1, 2, 3])
+        self.assertEqual(autre, [0, 1, 2, 3])
+        self.assertEqual(broker.connections, 2)
+        self.assertTrue(any("Abonnement Redis interrompu" in line for line in logs.output))
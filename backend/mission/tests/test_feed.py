@@ -0,0 +1,66 @@
+# mission/tests/test_feed.py
+from django.test import override_settings
+from rest_framework.test import APITestCase
+import pytest
+from django.contrib.auth import get_user_model
+from mission.models import Mission, MissionFeedEntry, Entreprise
+from freelance.models import Freelance
+
+User = get_user_model()
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+    }
+)
+class MissionFeedTest(APITestCase):
+
+    def setUp(self):
+        user_entreprise = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        self.user_freelance = User.objects.create_user(
+            email="freelance@gmail.com", password="pass123", role=User.ROLE_FREELANCE)
+        self.entreprise = Entreprise.objects.create(user=user_entreprise, nom="Entreprise Test", secteur="IT")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.freelance = Freelance.objects.create(
+                user=self.user_freelance, nom="Jean", competence="Python, Django",
+                experience="Backend", formation="Master", tarif="50.00",
+            )
+            self.django = self._mission("API Django", "Python, Django")
+            self.python = self._mission("Scripts de données", "Python, Pandas")
+            self.react = self._mission("Front React", "React, CSS")
+        self.client.force_authenticate(user=self.user_freelance)
+
+    def _mission(self, titre, competences):
+        return Mission.objects.create(
+            titre=titre, description="Mission", competence_requis=competences,
+            budget=500, entreprise=self.entreprise,
+        )
+
+    def test_fil_classe_et_pagine(self):
+        response = self.client.get("/msn/missions/pour-moi/", {"page_size": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["mission"]["id_mission"], self.django.id_mission)
+
+        response = self.client.get(response.json()["next"])
+        self.assertEqual(response.json()["results"][0]["mission"]["id_mission"], self.python.id_mission)
+        self.assertIsNone(response.json()["next"])
+
+    def test_nouvelle_mission_ajoutee_au_fil(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            mission = self._mission("Django REST", "Django")
+        self.assertTrue(MissionFeedEntry.objects.filter(freelance=self.freelance, mission=mission).exists())
+
+    def test_profil_modifie_recalcule_le_fil(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.freelance.competence = "React, CSS"
+            self.freelance.save()
+        ids = [e["mission"]["id_mission"] for e in self.client.get("/msn/missions/pour-moi/").json()["results"]]
+        self.assertEqual(ids[0], self.react.id_mission)
+        self.assertNotIn(self.python.id_mission, ids)
+
+    def test_reserve_aux_freelances(self):
+        self.client.force_authenticate(user=self.entreprise.user)
+        self.assertEqual(self.client.get("/msn/missions/pour-moi/").status_code, 403)
@@ -0,0 +1,84 @@
+# mission/tests/test_search.py
+from django.test import override_settings
+from rest_framework.test import APITestCase
+import pytest
+from django.contrib.auth import get_user_model
+from mission.models import Mission, MissionTerm, Entreprise
+from mission.search import analyze
+
+User = get_user_model()
+
+@pytest.mark.unit
+@override_settings(
+    CHANNEL_LAYERS={
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+    }
+)
+class MissionSearchTest(APITestCase):
+
+    def setUp(self):
+        user_entreprise = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        self.freelance = User.objects.create_user(
+            email="freelance@gmail.com", password="pass123", role=User.ROLE_FREELANCE)
+        self.user_entreprise = user_entreprise
+        entreprise = Entreprise.objects.create(user=user_entreprise, nom="Entreprise Test", secteur="IT")
+
+        self.backend = Mission.objects.create(
+            titre="Développeur Django",
+            description="Développement d'une API REST pour une plateforme de recrutement",
+            competence_requis="Python, Django",
+            budget=1000,
+            entreprise=entreprise,
+        )
+        self.frontend = Mission.objects.create(
+            titre="Intégrateur React",
+            description="Intégration des maquettes, un peu de développement Python apprécié",
+            competence_requis="React, CSS",
+            budget=800,
+            entreprise=entreprise,
+        )
+        self.client.force_authenticate(user=self.freelance)
+
+    def test_analyze_accents_et_pluriels(self):
+        self.assertEqual(analyze("Développeurs"), analyze("developpeur"))
+        self.assertEqual(analyze("les intégrations"), analyze("Intégration"))
+
+    def test_recherche_classee_bm25(self):
+        response = self.client.get("/msn/missions/", {"q": "python django"})
+        self.assertEqual(response.status_code, 200)
+        ids = [m["id_mission"] for m in response.json()]
+        self.assertEqual(ids, [self.backend.id_mission, self.frontend.id_mission])
+
+    def test_recherche_sans_resultat(self):
+        response = self.client.get("/msn/missions/", {"q": "kubernetes"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+    def test_index_incremental(self):
+        self.backend.titre = "Développeur Kubernetes"
+        self.backend.save()
+        response = self.client.get("/msn/missions/", {"q": "kubernetes"})
+        self.assertEqual([m["id_mission"] for m in response.json()], [self.backend.id_mission])
+
+        mission_id = self.backend.id_mission
+        self.backend.delete()
+        self.assertFalse(MissionTerm.objects.filter(mission_id=mission_id).exists())
+        response = self.client.get("/msn/missions/", {"q": "kubernetes"})
+        self.assertEqual(response.json(), [])
+
+    @override_settings(MISSION_SEARCH_LIMIT=2)
+    def test_recherche_dans_le_perimetre_de_l_entreprise(self):
+        # Une autre entreprise a de meilleurs résultats, assez pour remplir la limite globale
+        autre = Entreprise.objects.create(
+            user=User.objects.create_user(email="autre@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE),
+            nom="Autre", secteur="IT")
+        for i in range(3):
+            Mission.objects.create(
+                titre=f"Django Python {i}", description="Django Python", competence_requis="Python, Django",
+                budget=500, entreprise=autre)
+
+        self.client.force_authenticate(user=self.user_entreprise)
+        response = self.client.get("/msn/missions/", {"q": "python django"})
+        self.assertEqual(
+            [m["id_mission"] for m in response.json()], [self.backend.id_mission, self.frontend.id_mission])
@@ -0,0 +1,93 @@
+# mission/tests/test_websocket_protocol.py
+import json
+import zlib
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+import pytest
+from backend.websocket import DEFLATE, FIELDS, MSGPACK, MSGPACK_DEFLATE, InvalidFrame, decode, encode
+from mission.consumers import MissionConsumer
+from mission.models import Entreprise, Mission
+
+User = get_user_model()
+
+
+async def _snapshot(subprotocols):
+    communicator = WebsocketCommunicator(MissionConsumer.as_asgi(), "/ws/missions/", subprotocols=subprotocols)
+    connected, subprotocol = await communicator.connect()
+    assert connected
+    frames = []
+    if subprotocol:
+        frames.append(await communicator.receive_from(timeout=5))  # hello
+        await communicator.send_to(bytes_data=encode({"action": "get_missions"}, subprotocol))
+    else:
+        await communicator.send_json_to({"action": "get_missions"})
+    while True:
+        frame = await communicator.output_queue.get()
+        frames.append(frame.get("bytes") or frame.get("text"))
+        content = decode(frames[-1]) if isinstance(frames[-1], bytes) else json.loads(frames[-1])
+        if content["action"] == "list_end":
+            break
+    await communicator.disconnect()
+    return subprotocol, frames
+
+
+@pytest.mark.unit
+@override_settings(CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}})
+class CompactProtocolTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(
+            email="entreprise@gmail.com", password="pass123", role=User.ROLE_ENTREPRISE)
+        entreprise = Entreprise.objects.create(user=user, nom="Entreprise Test", secteur="IT")
+        for i in range(20):
+            Mission.objects.create(
+                titre=f"Mission {i}", description="Développement d'une API de recrutement " * 3,
+                competence_requis="Python, Django", budget=100 + i, entreprise=entreprise,
+            )
+
+    def test_aller_retour(self):
+        message = {"action": "batch", "events": [{"mission": {"id_mission": 1, "inconnu": "x"}}]}
+        for subprotocol in (MSGPACK, MSGPACK_DEFLATE):
+            self.assertEqual(decode(encode(message, subprotocol)), message)
+
+    def test_negociation_et_taille(self):
+        _, texte = async_to_sync(_snapshot)([])
+        subprotocol, binaire = async_to_sync(_snapshot)(["inconnu", MSGPACK_DEFLATE])
+
+        self.assertEqual(subprotocol, MSGPACK_DEFLATE)
+        self.assertEqual(json.loads(binaire[0]), {"action": "hello", "fields": list(FIELDS)})
+        self.assertEqual([json.loads(t) for t in texte], [decode(b) for b in binaire[1:]])
+        self.assertLess(sum(map(len, binaire[1:])), sum(len(t.encode()) for t in texte) / 2)
+
+    @override_settings(WEBSOCKET_MAX_MESSAGE=64 * 1024)
+    def test_bombe_de_decompression(self):
+        compressor = zlib.compressobj(wbits=-15)
+        bombe = bytes((DEFLATE,)) + compressor.compress(b"\0" * (64 * 1024 * 1024)) + compressor.flush()
+        self.assertLess(len(bombe), 128 * 1024)
+        with self.assertRaisesRegex(InvalidFrame, "trop long"):
+            decode(bombe)
+
+        async def scenario():
+            communicator = WebsocketCommunicator(
+                MissionConsumer.as_asgi(), "/ws/missions/", subprotocols=[MSGPACK_DEFLATE])
+            connected, subprotocol = await communicator.connect()
+            assert connected
+            await communicator.receive_from(timeout=5)  # hello
+            reponses = []
+            for frame in (bombe, b"\x01pas du deflate", b"\x07", b"\x00\xc1"):
+                await communicator.send_to(bytes_data=frame)
+                reponses.append(decode(await communicator.receive_from(timeout=5)))
+            await communicator.send_to(text_data="[1, 2]")
+            reponses.append(decode(await communicator.receive_from(timeout=5)))
+            # la connexion reste utilisable
+            await communicator.send_to(bytes_data=encode({"action": "get_missions", "since": 10 ** 9}, subprotocol))
+            suite = decode(await communicator.receive_from(timeout=5))
+            await communicator.disconnect()
+            return reponses, suite
+
+        reponses, suite = async_to_sync(scenario)()
+        self.assertEqual([set(r) for r in reponses], [{"error"}] * 5)
+        self.assertIn("trop long", reponses[0]["error"])
+        self.assertIn(suite["action"], ("list", "list_end", "delta", "delta_end"))
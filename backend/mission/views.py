@@ -2,9 +2,12 @@ from rest_framework.decorators import action
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
-from .models import Mission
-from entreprise.models import Entreprise
-from .serializers import MissionSerializer
+from django.db.models import Case, When
+from .models import Mission, MissionFeedEntry
+from .search import search_missions
+from backend.pagination import MissionFeedPagination, MissionPagination
+from authentification.profils import entreprise_of, freelance_of
+from .serializers import MissionFeedSerializer, MissionSerializer
 from rest_framework import viewsets, permissions
 
 
@@ -12,21 +15,34 @@ class MissionViewSet(viewsets.ModelViewSet):
     queryset = Mission.objects.all()
     serializer_class = MissionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = MissionPagination
 
     def get_queryset(self):
-        user = self.request.user
-        entreprise = Entreprise.objects.filter(user=user).first()
+        entreprise = entreprise_of(self.request)
         if entreprise:
-            return Mission.objects.filter(entreprise=entreprise)
+            queryset = Mission.objects.filter(entreprise=entreprise)
         else:
-            print("freelance")
         # Freelance → voir toutes les missions
-            return Mission.objects.all()
+            queryset = Mission.objects.all()
+
+        # 🔍 Recherche plein texte : ?q=... → missions classées par BM25
+        query = self.request.query_params.get("q")
+        if query and self.action == "list":
+            # Classement et limite dans le périmètre de l'appelant (ses missions pour une entreprise)
+            ids = search_missions(query, missions=queryset if entreprise else None)
+            ranking = Case(*[When(id_mission=pk, then=pos) for pos, pk in enumerate(ids)])
+            queryset = queryset.filter(id_mission__in=ids).order_by(ranking) if ids else queryset.none()
+        return MissionSerializer.setup_queryset(queryset)
+
+    def paginate_queryset(self, queryset):
+        # Les résultats de recherche sont déjà bornés et classés par pertinence
+        if self.request.query_params.get("q"):
+            return None
+        return super().paginate_queryset(queryset)
 
     @action(detail=False, methods=["get", "post"], url_path="me")
     def me(self, request):
-        user = request.user
-        entreprise = Entreprise.objects.filter(user=user).first()
+        entreprise = entreprise_of(request)
 
         if not entreprise:
             raise PermissionDenied("Seules les entreprises peuvent gérer leurs missions.")
@@ -38,7 +54,10 @@ class MissionViewSet(viewsets.ModelViewSet):
         # GET → récupérer missions de l'entreprise
         if request.method == "GET":
             # print("USER" , request.user)
-            missions = Mission.objects.filter(entreprise=entreprise)
+            missions = MissionSerializer.setup_queryset(Mission.objects.filter(entreprise=entreprise))
+            page = self.paginate_queryset(missions)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data)
             serializer = self.get_serializer(missions, many=True)
             return Response(serializer.data)
 
@@ -52,16 +71,28 @@ class MissionViewSet(viewsets.ModelViewSet):
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    # 🔹 Fil personnalisé du freelance : lecture indexée du classement précalculé
+    @action(detail=False, methods=["get"], url_path="pour-moi")
+    def pour_moi(self, request):
+        freelance = freelance_of(request)
+        if not freelance:
+            raise PermissionDenied("Seuls les freelances ont un fil de missions.")
+
+        entries = MissionFeedSerializer.setup_queryset(MissionFeedEntry.objects.filter(freelance=freelance))
+        paginator = MissionFeedPagination()
+        page = paginator.paginate_queryset(entries, request, view=self)
+        return paginator.get_paginated_response(MissionFeedSerializer(page, many=True).data)
+
      # 🔹 Méthode PUT / PATCH pour mettre à jour une mission
     def update(self, request, *args, **kwargs):
         mission = self.get_object()
-        if mission.entreprise.user != request.user:
+        if mission.entreprise_id != getattr(entreprise_of(request), "pk", None):
             raise PermissionDenied("Vous ne pouvez modifier que vos missions.")
         return super().update(request, *args, **kwargs)
 
     # 🔹 Méthode DELETE pour supprimer une mission
     def destroy(self, request, *args, **kwargs):
         mission = self.get_object()
-        if mission.entreprise.user != request.user:
+        if mission.entreprise_id != getattr(entreprise_of(request), "pk", None):
             raise PermissionDenied("Vous ne pouvez supprimer que vos missions.")
         return super().destroy(request, *args, **kwargs)
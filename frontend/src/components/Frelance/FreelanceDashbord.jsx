@@ -176,12 +176,7 @@ export default function FreelanceDashboard() {
 
     socket.onopen = () => console.log("✅ WS Missions connecté");
 
-    socket.onmessage = async (event) => {
-      const message = JSON.parse(event.data);
-      const mission = message.mission;
-      const action = message.action;
-      console.log("📩 Message WS Missions :", message);
-
+    const handleMissionEvent = async (action, mission) => {
       switch (action) {
         case "created": {
           // Option 1 : Ajouter directement, mais forcer fetch pour ID correct
@@ -227,6 +222,20 @@ export default function FreelanceDashboard() {
       }
     };
 
+    socket.onmessage = async (event) => {
+      const message = JSON.parse(event.data);
+      console.log("📩 Message WS Missions :", message);
+
+      // 🔹 Le backend regroupe les événements par fenêtre de diffusion
+      if (message.action === "batch") {
+        for (const evt of message.events) {
+          await handleMissionEvent(evt.action, evt.mission);
+        }
+        return;
+      }
+      await handleMissionEvent(message.action, message.mission);
+    };
+
     socket.onclose = () => console.log("❌ WS Missions fermé");
     return () => socket.close();
   }, []);
@@ -11,9 +11,19 @@ export default function ProtectedRoute({ children }) {
     // Vérification côté backend si l'user est connecté
     const checkAuth = async () => {
       try {
-        const res = await fetch(`${API_URL}/auth/check/`, {
+        let res = await fetch(`${API_URL}/auth/check/`, {
           credentials: "include",
         });
+        if (res.status === 401) {
+          // Jeton d'accès expiré → on le renouvelle avec le cookie refresh
+          const refresh = await fetch(`${API_URL}/auth/token/refresh/`, {
+            method: "POST",
+            credentials: "include",
+          });
+          if (refresh.ok) {
+            res = await fetch(`${API_URL}/auth/check/`, { credentials: "include" });
+          }
+        }
         setIsAuthenticated(res.ok); // si backend renvoie 200 => connecté
       } catch {
         setIsAuthenticated(false);